@@ -0,0 +1,64 @@
+"""
+Warm restart with a large decoy store: time to load the SQLite index
+into the registry/token index and reconcile it with the file system
+Run from the project root: python benchmarks/bench_decoy_store.py [decoys]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from domain.application.decoy_fingerprint import fingerprint_content
+from domain.application.decoy_service import DecoyService
+from domain.entities.decoy import Decoy
+from domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+from domain.infrastructure.sqlite_decoy_store import SqliteDecoyStore
+
+
+def populate(root, store, count, directories=50):
+    """Write `count` small decoy files and store them"""
+    decoys = []
+    now = datetime.now()
+    for i in range(count):
+        directory = os.path.join(root, f"dir{i % directories}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"decoy{i}.txt")
+        content = f"api_key: {i:08d}{os.urandom(16).hex()}\n"
+        with open(path, "w") as f:
+            f.write(content)
+        decoys.append(Decoy("credential", path, content, now, fingerprint_content(content)))
+    store.save(decoys)
+
+
+def restart(db_path, generator):
+    start = time.perf_counter()
+    service = DecoyService(generator, decoy_store=SqliteDecoyStore(db_path))
+    result = service.restore()
+    elapsed = time.perf_counter() - start
+    service.store.close()
+    return elapsed, result
+
+
+def main(count=20000):
+    generator = FileDecoyGenerator()
+    with tempfile.TemporaryDirectory() as root:
+        db_path = os.path.join(root, "decoys.db")
+        store = SqliteDecoyStore(db_path)
+        populate(os.path.join(root, "decoys"), store, count)
+        store.close()
+
+        elapsed, result = restart(db_path, generator)
+        print(f"Warm restart, {result['restored']} decoys, nothing changed: "
+              f"{elapsed * 1000:.1f} ms ({result['directories_checked']} directories reconciled)")
+
+        os.remove(os.path.join(root, "decoys", "dir0", "decoy0.txt"))
+        elapsed, result = restart(db_path, generator)
+        print(f"Warm restart after one deletion: {elapsed * 1000:.1f} ms "
+              f"({result['directories_checked']} directory reconciled, {len(result['missing'])} missing)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,100 @@
+"""
+Memory retained per event in a ThreatDetector's analysis window:
+the old per-event dict (plus (time, weight) tuples in the rule windows)
+against EventRecord and the two-deque SlidingWindowCounter
+Run from the project root: python benchmarks/bench_event_memory.py
+"""
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from monitor.events import EventRecord
+from monitor.threat_detector import ThreatDetector
+
+
+def event_stream(events=50_000, files=500, seed=3):
+    """
+    Events over a few hundred files; every path is a new string object,
+    as it is when it comes from watchdog
+    """
+    rng = random.Random(seed)
+    start = time.time() - 100
+    types = ["created", "modified", "modified", "deleted"]
+    for i in range(events):
+        directory = "secrets" if i % 7 == 0 else "project"
+        yield (
+            rng.choice(types),
+            "/data/" + directory + f"/file_{rng.randrange(files)}.txt",
+            start + i * 0.001,
+        )
+
+
+def retained(build):
+    """Bytes still allocated after build() returns its result"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def legacy_window(events):
+    """Storage layout before EventRecord: a dict per event, tuples per window hit"""
+    history, rapid, deletions, sensitive = deque(), deque(), deque(), deque()
+    for event_type, path, timestamp in events:
+        history.append({'type': event_type, 'path': path, 'time': timestamp, 'count': 1})
+        rapid.append((timestamp, 1))
+        if event_type == "deleted":
+            deletions.append((timestamp, 1))
+        if "secret" in path:
+            sensitive.append((timestamp, 25))
+    return history, rapid, deletions, sensitive
+
+
+def record_window(events):
+    return deque(EventRecord(event_type, path, timestamp) for event_type, path, timestamp in events)
+
+
+def legacy_records(events):
+    return deque(
+        {'type': event_type, 'path': path, 'time': timestamp, 'count': 1}
+        for event_type, path, timestamp in events
+    )
+
+
+def detector_window(events):
+    detector = ThreatDetector(config_data={})
+    for event_type, path, timestamp in events:
+        detector.add_event(event_type, path, timestamp=timestamp)
+    return detector
+
+
+def main():
+    events = 50_000
+    print(f"{events} events over 500 files, all inside the 300 s window\n")
+
+    rows = [
+        ("records: dict per event", legacy_records),
+        ("records: EventRecord", record_window),
+        ("window: dicts + tuple entries (before)", legacy_window),
+    ]
+    for label, build in rows:
+        size, _ = retained(lambda: build(event_stream(events)))
+        print(f"{label:<42} {size / events:7.1f} bytes/event")
+
+    size, detector = retained(lambda: detector_window(event_stream(events)))
+    assert len(detector.events) == events
+    print(f"{'window: ThreatDetector (after)':<42} {size / events:7.1f} bytes/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cold-start time of the agent: time until it is ready and until it has
+handled its first file event
+Spawns src/agent/main.py on a temporary directory and keeps touching a
+file there until the agent logs its first handled event. Debouncing is
+turned off; with it on, events additionally wait out the debounce window.
+Run from the project root: python benchmarks/bench_startup.py [runs]
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+AGENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'agent', 'main.py'))
+CONFIG = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config', 'config.yaml'))
+
+READY = re.compile(r"Agent ready in (\d+) ms")
+FIRST_EVENT = re.compile(r"First event handled (\d+) ms after startup")
+
+
+def run_once(workdir):
+    watch_dir = os.path.join(workdir, "watch")
+    os.makedirs(watch_dir, exist_ok=True)
+    log_file = os.path.join(workdir, "logs", "events.log")
+
+    with open(CONFIG) as f:
+        config = yaml.safe_load(f)
+    config["logging"]["queue_mode"] = False  # log lines appear immediately
+    config["pipeline"]["debounce_seconds"] = 0  # otherwise events wait out the debounce window
+    config_path = os.path.join(workdir, "config.yaml")
+    with open(config_path, "w") as f:
+        yaml.safe_dump(config, f)
+
+    launched = time.monotonic()
+    agent = subprocess.Popen(
+        [sys.executable, AGENT, "--config", config_path, "--watch", watch_dir],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        ready = first_event = None
+        deadline = launched + 30
+        i = 0
+        while first_event is None and time.monotonic() < deadline:
+            with open(os.path.join(watch_dir, f"probe{i % 4}.txt"), "w") as f:
+                f.write("probe")
+            i += 1
+            time.sleep(0.005)
+            if os.path.exists(log_file):
+                with open(log_file) as f:
+                    log = f.read()
+                ready = ready or READY.search(log)
+                first_event = FIRST_EVENT.search(log)
+        wall = (time.monotonic() - launched) * 1000
+    finally:
+        agent.terminate()
+        agent.wait()
+
+    if first_event is None:
+        raise RuntimeError("agent never reported its first event")
+    return int(ready.group(1)), int(first_event.group(1)), wall
+
+
+def main(runs=5):
+    for run in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            ready, first_event, wall = run_once(workdir)
+        print(f"run {run + 1}: ready {ready} ms, first event handled {first_event} ms "
+              f"(process launch to detection: {wall:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
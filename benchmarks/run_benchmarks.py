@@ -0,0 +1,313 @@
+"""
+End-to-end throughput/latency suite for the agent's hot paths
+Each case runs in a fresh process (so peak RSS belongs to that case alone)
+and reports events/sec, p50/p99 per-event latency and peak RSS as JSON.
+
+Cases:
+    detector      ThreatDetector.add_event
+    detector_batch ThreatDetector.add_events, 256 events per call
+    monitor       FileMonitor._handle_file_event (detector + decoys + logging)
+    is_decoy      DecoyService.is_decoy_file against deployed decoys
+    generator     FileDecoyGenerator.build_decoy
+
+Events come from the seeded workloads in src/monitor/simulation.py, on a
+simulated clock, so two runs replay exactly the same events.
+
+Run from the project root:
+    python benchmarks/run_benchmarks.py                        # 1k, 10k, 100k events
+    python benchmarks/run_benchmarks.py --sizes 1000,1000000 --cases detector,monitor
+    python benchmarks/run_benchmarks.py --output new.json --compare old.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+CASES = ("detector", "detector_batch", "monitor", "is_decoy", "generator")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Events per add_events call in the detector_batch case (the worker's batch_size)
+BATCH_SIZE = 256
+
+# Share of is_decoy lookups that hit a decoy
+DECOY_HIT_RATE = 0.05
+
+
+def workload(events, name, seed):
+    """`events` FileEvents from a simulation workload, scaled up as needed"""
+    from monitor.simulation import generate_workload
+
+    scale = max(1, -(-events // len(generate_workload(name, seed))))
+    return generate_workload(name, seed, scale)[:events]
+
+
+def timed(calls):
+    """
+    Run every call, timing each one
+
+    Returns:
+        (total seconds, per-call nanoseconds)
+    """
+    clock = time.perf_counter_ns
+    latencies = []
+    record = latencies.append
+    start = clock()
+    for call in calls:
+        before = clock()
+        call()
+        record(clock() - before)
+    return (clock() - start) / 1e9, latencies
+
+
+def case_detector(events, workload_name, seed, workdir):
+    from monitor.clock import SimulatedClock
+    from monitor.threat_detector import ThreatDetector
+
+    stream = workload(events, workload_name, seed)
+    clock = SimulatedClock(stream[0].timestamp)
+    detector = ThreatDetector(config_data={}, clock=clock)
+    add_event = detector.add_event
+    return timed(
+        lambda event=event: add_event(event.event_type, event.file_path, event.count, event.timestamp)
+        for event in stream
+    )
+
+
+def case_detector_batch(events, workload_name, seed, workdir):
+    from monitor.threat_detector import ThreatDetector
+
+    stream = workload(events, workload_name, seed)
+    detector = ThreatDetector(config_data={})
+    batches = [
+        [(event.event_type, event.file_path, event.count, event.timestamp)
+         for event in stream[i:i + BATCH_SIZE]]
+        for i in range(0, len(stream), BATCH_SIZE)
+    ]
+    seconds, latencies = timed(lambda batch=batch: detector.add_events(batch) for batch in batches)
+    # Per-event latency: each batch's time spread over its events
+    return seconds, [
+        latency // len(batch) for batch, latency in zip(batches, latencies) for _ in batch
+    ]
+
+
+def case_monitor(events, workload_name, seed, workdir):
+    from monitor.clock import SimulatedClock
+    from monitor.decoy_manager import DecoyManager
+    from monitor.file_monitor import EVENT_LABELS, FileMonitor, configure_logging
+    from monitor.logger import EventLogger
+
+    # Logging as configured in production: queued, batched writes
+    configure_logging({"logging": {"queue_mode": True, "file": os.path.join(workdir, "events.log")}})
+
+    stream = workload(events, workload_name, seed)
+    clock = SimulatedClock(stream[0].timestamp)
+    monitor = FileMonitor(
+        decoy_manager=DecoyManager(decoy_base_path=os.path.join(workdir, "decoys"), clock=clock),
+        clock=clock,
+    )
+    handle = monitor._handle_file_event
+
+    def calls():
+        for event in stream:
+            clock.set(event.timestamp)
+            yield lambda event=event: handle(
+                event.event_type, event.file_path, EVENT_LABELS[event.event_type], event.count
+            )
+
+    try:
+        return timed(calls())
+    finally:
+        monitor.decoy_manager.close()
+        EventLogger.shutdown()
+
+
+def case_is_decoy(events, workload_name, seed, workdir):
+    import random
+
+    from domain.application.decoy_service import DECOY_PLANS, DecoyService
+    from domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+    from domain.infrastructure.parallel_decoy_writer import ParallelDecoyWriter
+
+    writer = ParallelDecoyWriter()
+    service = DecoyService(FileDecoyGenerator(), writer)
+    plan = DECOY_PLANS["Critical"]
+    specs = [
+        (decoy_type, os.path.join(workdir, f"share{i}", file_name))
+        for i in range(40) for decoy_type, file_name in plan
+    ]
+    service.deploy_decoys(specs)
+    writer.close()
+
+    rng = random.Random(seed)
+    decoy_paths = [path for _, path in specs]
+    paths = [
+        rng.choice(decoy_paths) if rng.random() < DECOY_HIT_RATE
+        else os.path.join(workdir, f"share{rng.randrange(40)}", f"file_{rng.randrange(5000)}.txt")
+        for _ in range(events)
+    ]
+    is_decoy_file = service.is_decoy_file
+    return timed(lambda path=path: is_decoy_file(path) for path in paths)
+
+
+def case_generator(events, workload_name, seed, workdir):
+    from domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+
+    generator = FileDecoyGenerator()
+    generator.reseed(seed)
+    types = generator.templates.types()
+    build_decoy = generator.build_decoy
+    return timed(
+        lambda i=i: build_decoy(types[i % len(types)], f"/decoys/decoy_{i}")
+        for i in range(events)
+    )
+
+
+CASE_FUNCTIONS = {
+    "detector": case_detector,
+    "detector_batch": case_detector_batch,
+    "monitor": case_monitor,
+    "is_decoy": case_is_decoy,
+    "generator": case_generator,
+}
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list"""
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case, events, workload_name, seed):
+    """Run one case in this process and return its result dict"""
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # components that log/write relative to cwd stay in here
+        seconds, latencies = CASE_FUNCTIONS[case](events, workload_name, seed, workdir)
+    latencies.sort()
+    return {
+        'case': case,
+        'events': events,
+        'workload': workload_name,
+        'seconds': round(seconds, 6),
+        'events_per_second': round(events / seconds, 1) if seconds > 0 else None,
+        'p50_us': round(percentile(latencies, 50) / 1000, 3),
+        'p99_us': round(percentile(latencies, 99) / 1000, 3),
+        'max_us': round(latencies[-1] / 1000, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1) if resource is not None else None,
+    }
+
+
+def run_isolated(case, events, workload_name, seed):
+    """Run one case in a child process"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", case, str(events),
+         "--workload", workload_name, "--seed", str(seed)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(SRC),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Print throughput and p99 changes against an earlier JSON report"""
+    with open(baseline_path) as f:
+        baseline = {(r['case'], r['events']): r for r in json.load(f)['results']}
+    print(f"\nCompared with {baseline_path}:", file=sys.stderr)
+    for result in results:
+        old = baseline.get((result['case'], result['events']))
+        if old is None or not old['events_per_second'] or not result['events_per_second']:
+            continue
+        speed = result['events_per_second'] / old['events_per_second'] - 1
+        p99 = result['p99_us'] / old['p99_us'] - 1 if old['p99_us'] else 0.0
+        print(f"  {result['case']:<10} {result['events']:>9}  throughput {speed:+7.1%}  p99 {p99:+7.1%}",
+              file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot-path benchmark suite")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated cases")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated event counts (1000 up to 1000000)")
+    parser.add_argument("--workload", default="ransomware_burst",
+                        help="Simulation workload driving the detector/monitor cases")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", metavar="JSON", help="Earlier report to compare against")
+    parser.add_argument("--child", nargs=2, metavar=("CASE", "EVENTS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_case(args.child[0], int(args.child[1]), args.workload, args.seed)))
+        return 0
+
+    cases = [case for case in args.cases.split(",") if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    results = []
+    for case in cases:
+        for events in (int(size) for size in args.sizes.split(",")):
+            result = run_isolated(case, events, args.workload, args.seed)
+            results.append(result)
+            print(
+                f"{case:<10} {events:>9} events  {result['events_per_second'] or 0:>12,.0f} events/sec  "
+                f"p50 {result['p50_us']:8.2f} us  p99 {result['p99_us']:8.2f} us  "
+                f"peak RSS {result['peak_rss_mb']} MB",
+                file=sys.stderr,
+            )
+
+    report = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec="seconds"),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'workload': args.workload,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
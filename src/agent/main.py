@@ -1,8 +1,105 @@
-def main():
+import time
+
+# Startup is measured from here, before the heavier imports
+STARTED_AT = time.monotonic()
+
+import argparse
+import os
+import sys
+
+# Monitor/domain modules import each other as top-level packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.profiler import ProfilerControl, SamplingProfiler
+from monitor.config_loader import get_config
+from monitor.file_monitor import configure_logging
+from monitor.logger import EventLogger
+from monitor.metrics import start_metrics
+from monitor.watch_manager import WatchManager
+
+
+def parse_args(argv=None):
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Adaptive File System Honeypot Agent")
+    parser.add_argument("--config", default="config/config.yaml", help="Path to config.yaml")
+    parser.add_argument(
+        "--watch", action="append", metavar="DIR",
+        help="Directory to monitor (repeatable; overrides monitoring.watch_directories)",
+    )
+    parser.add_argument("--workers", type=int, help="Number of analysis worker threads")
+    parser.add_argument(
+        "--profile", nargs="?", type=float, const=0, metavar="SECONDS",
+        help="Sample observer/worker stacks from startup, for SECONDS or until exit; "
+             "SIGUSR2 toggles profiling at any time",
+    )
+    parser.add_argument(
+        "--profile-interval", type=float, default=0.005, metavar="SECONDS",
+        help="Time between profiler samples (default: 0.005)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function - agent starts here"""
+    args = parse_args(argv)
     print("🛡️  Honeypot Agent Starting...")
-    print("✅ Project setup complete!")
-    print("📁 Monitoring file system...")
-    
+
+    # Parsed once; workers reload it when the file changes
+    config = get_config(args.config, EventLogger())
+    config_data = config.data
+    configure_logging(config_data)
+
+    monitoring_config = config_data.get("monitoring", {})
+    watch_roots = args.watch or monitoring_config.get("watch_directories", [])
+    manager = WatchManager(
+        watch_roots, config_data, workers=args.workers, started_at=STARTED_AT, config=config
+    )
+    if not manager.watch_roots:
+        print("❌ No existing directories to monitor - check monitoring.watch_directories")
+        return 1
+
+    # Sampling profiler: --profile, or SIGUSR2 while running
+    profiling = ProfilerControl(
+        SamplingProfiler(interval=args.profile_interval),
+        output_dir=os.path.dirname(config_data.get("logging", {}).get("file", "logs/events.log")) or ".",
+        logger=manager.logger,
+    )
+    profiling.install_signal()
+    if args.profile is not None:
+        profiling.start(duration=args.profile or None)
+
+    manager.start()
+    ready_ms = (time.monotonic() - STARTED_AT) * 1000
+    manager.logger.log_info(f"Agent ready in {ready_ms:.0f} ms")
+    print(f"📁 Monitoring {len(manager.watch_roots)} director(ies) "
+          f"with {len(manager.workers)} worker(s) (ready in {ready_ms:.0f} ms). Press Ctrl+C to stop..")
+
+    metrics = start_metrics(config_data)
+
+    # Decoy templates/Faker load in the background once startup is done
+    manager.monitor.decoy_manager.warm_up(
+        delay=config_data.get("decoy", {}).get("warm_up_delay_seconds", 1.0)
+    )
+
+    stats_interval = monitoring_config.get("stats_interval_seconds", 60)
+    try:
+        while True:
+            time.sleep(stats_interval)
+            for root, stats in manager.get_root_stats().items():
+                manager.logger.log_info(
+                    f"Root {root}: {stats['events']} events, "
+                    f"{stats['events_per_second']:.1f} events/sec"
+                )
+    except KeyboardInterrupt:
+        print("Monitoring Stopped")
+
+    profiling.stop()
+    manager.stop()
+    if metrics is not None:
+        metrics.close()
+    EventLogger.shutdown()
+    return 0
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,291 @@
+# src/agent/profiler.py
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+# Threads sampled by default: watchdog observers and analysis workers, the
+# content pool's refill thread (decoy rendering) and the decoy writers
+DEFAULT_THREAD_PREFIXES = ("honeypot-", "decoy-content-refill", "decoy-writer")
+
+# Files whose functions get their own section in the report
+FOCUS_FILES = (
+    "threat_detector.py", "file_monitor.py", "file_decoy_generator.py",
+    "decoy_template_engine.py",
+)
+
+# Innermost frames of a thread that is waiting for work, not working
+IDLE_FRAMES = frozenset((
+    "threading.py:Condition.wait",
+    "threading.py:Event.wait",
+    "threading.py:Thread.join",
+    "queue.py:Queue.get",
+))
+
+
+def _frame_label(code):
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for the running agent
+    A background thread snapshots the stacks of the observer and worker
+    threads every `interval` seconds (sys._current_frames) and counts
+    each distinct stack. No tracing hooks are installed, so the agent
+    runs at full speed between samples and profiling can be switched on
+    and off at any time.
+    """
+
+    def __init__(self, interval=0.005, thread_prefixes=DEFAULT_THREAD_PREFIXES, max_depth=64):
+        """
+        Args:
+            interval: Seconds between samples
+            thread_prefixes: Sample threads whose name starts with one of
+                             these (None samples every thread but our own)
+            max_depth: Innermost frames kept per stack
+        """
+        self.interval = interval
+        self.thread_prefixes = tuple(thread_prefixes) if thread_prefixes else None
+        self.max_depth = max_depth
+
+        self.stacks = Counter()   # "thread;outer;...;inner" -> samples
+        self.samples = 0
+        self.started_at = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """True while sampling"""
+        return self._thread is not None
+
+    def start(self):
+        """Start sampling in a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="agent-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling (collected samples are kept)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed += time.monotonic() - self.started_at
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                name = names.get(thread_id)
+                if thread_id == own_id or name is None:
+                    continue
+                if self.thread_prefixes and not name.startswith(self.thread_prefixes):
+                    continue
+                self._record(name, frame)
+
+    def _record(self, thread_name, frame):
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread_name.rstrip("0123456789-_"))  # workers share one root
+        labels.reverse()
+        self.stacks[";".join(labels)] += 1
+        self.samples += 1
+
+    def collapsed(self):
+        """
+        Samples in collapsed-stack format (flamegraph.pl, speedscope, ...)
+
+        Returns:
+            str: One "frame;frame;... count" line per distinct stack
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def self_time(self):
+        """
+        Samples per function in which it was the innermost frame
+
+        Returns:
+            Counter: "file.py:function" -> samples
+        """
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves
+
+    def inclusive_time(self, file_name):
+        """
+        Samples per function of one file, including time in what it calls
+
+        Each busy sample counts once, for the innermost function of the
+        file on its stack, so a function that mostly calls into libraries
+        (templates calling Faker) still shows up.
+
+        Args:
+            file_name: Source file name, e.g. "threat_detector.py"
+
+        Returns:
+            Counter: "file.py:function" -> samples
+        """
+        prefix = file_name + ":"
+        functions = Counter()
+        for stack, count in self.stacks.items():
+            labels = stack.split(";")[1:]
+            if labels[-1] in IDLE_FRAMES:
+                continue  # waiting for work below this file's functions
+            for label in reversed(labels):
+                if label.startswith(prefix):
+                    functions[label] += count
+                    break
+        return functions
+
+    def report(self, top=10, focus_files=FOCUS_FILES):
+        """
+        Text summary: top functions by self time, then per focus file the
+        functions by time including their callees
+
+        Args:
+            top: Functions listed per section
+            focus_files: File names that get their own section
+
+        Returns:
+            str: Report text
+        """
+        leaves = self.self_time()
+        idle = sum(leaves.pop(label, 0) for label in IDLE_FRAMES)
+        busy = self.samples - idle
+        total = busy or 1
+        lines = [f"{self.samples} samples over {self.elapsed:.1f}s "
+                 f"(every {self.interval * 1000:.0f} ms), {busy} busy, {idle} waiting for work; "
+                 f"shares below are of busy samples"]
+
+        def section(title, items):
+            lines.append(title)
+            if not items:
+                lines.append("  (no samples)")
+            for label, count in items:
+                lines.append(f"  {count / total:6.1%}  {count * self.interval:7.2f}s  {label}")
+
+        section("Top functions by self time:", leaves.most_common(top))
+        for file_name in focus_files:
+            section(f"{file_name} (including callees):", self.inclusive_time(file_name).most_common(top))
+        return "\n".join(lines)
+
+    def write(self, directory="logs"):
+        """
+        Write the collapsed stacks and the report
+
+        Args:
+            directory: Output directory
+
+        Returns:
+            (collapsed stacks path, report path)
+        """
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"profile-{datetime.now():%Y%m%d-%H%M%S}")
+        with open(stem + ".folded", "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        with open(stem + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.report() + "\n")
+        return stem + ".folded", stem + ".txt"
+
+    def reset(self):
+        """Forget collected samples"""
+        self.stacks.clear()
+        self.samples = 0
+        self.elapsed = 0.0
+
+
+class ProfilerControl:
+    """
+    Starts/stops a SamplingProfiler for the agent: for a fixed time from
+    startup (--profile) or toggled at runtime with SIGUSR2
+    Each finished profiling session writes its collapsed stacks and
+    report to the output directory and logs the report.
+    """
+
+    def __init__(self, profiler, output_dir="logs", logger=None):
+        """
+        Args:
+            profiler: SamplingProfiler to control
+            output_dir: Directory receiving profile-*.folded/.txt files
+            logger: Optional EventLogger for the report
+        """
+        self.profiler = profiler
+        self.output_dir = output_dir
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def start(self, duration=None):
+        """
+        Start a profiling session
+
+        Args:
+            duration: Seconds after which the session ends by itself
+                      (None: until stop() or the next toggle)
+        """
+        with self._lock:
+            if self.profiler.running:
+                return
+            self.profiler.reset()
+            self.profiler.start()
+            if duration:
+                self._timer = threading.Timer(duration, self.stop)
+                self._timer.daemon = True
+                self._timer.start()
+        self._log(f"Profiling started (sampling every {self.profiler.interval * 1000:.0f} ms)")
+
+    def stop(self):
+        """
+        End the session and write its output
+
+        Returns:
+            (collapsed stacks path, report path), or None if not profiling
+        """
+        with self._lock:
+            if not self.profiler.running:
+                return None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self.profiler.stop()
+            paths = self.profiler.write(self.output_dir)
+        self._log(f"Profile written to {paths[0]}\n{self.profiler.report()}")
+        return paths
+
+    def toggle(self, *_):
+        """Signal handler: start profiling, or stop and write the profile"""
+        # Not run inside the handler: stop() joins the sampler thread
+        target = self.stop if self.profiler.running else self.start
+        threading.Thread(target=target, name="agent-profiler-toggle", daemon=True).start()
+
+    def install_signal(self):
+        """
+        Toggle profiling on SIGUSR2 (POSIX only)
+
+        Returns:
+            bool: True if the handler was installed
+        """
+        import signal
+
+        if not hasattr(signal, "SIGUSR2"):
+            return False
+        signal.signal(signal.SIGUSR2, self.toggle)
+        return True
+
+    def _log(self, message):
+        if self.logger is not None:
+            self.logger.log_info(message)
@@ -0,0 +1,81 @@
+# src/application/decoy_fingerprint.py
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+from ..entities.decoy import CANARY_LENGTH, Decoy, DecoyFingerprint, is_canary
+
+# Canary tokens are the random canary values rendered into every decoy
+# ({{canary}} template placeholder). Only these are used: template text and
+# Faker vocabulary words also appear in ordinary files and in other decoys.
+_CANDIDATE = re.compile(rb"(?<![0-9a-f])[0-9a-f]{%d}(?![0-9a-f])" % CANARY_LENGTH)
+
+
+def canary_candidates(data: bytes) -> List[bytes]:
+    """Free-standing 32-character lowercase hex runs in data"""
+    return _CANDIDATE.findall(data)
+
+
+def fingerprint_content(content: str) -> DecoyFingerprint:
+    """
+    Fingerprint decoy content
+
+    Args:
+        content: Decoy content
+
+    Returns:
+        DecoyFingerprint with the content hash and the content's canary
+        values as tokens (none if its template has no {{canary}})
+    """
+    data = content.encode("utf-8")
+    tokens = []
+    for candidate in canary_candidates(data):
+        token = candidate.decode("ascii")
+        if is_canary(token) and token not in tokens:
+            tokens.append(token)
+    return DecoyFingerprint(sha256=hashlib.sha256(data).hexdigest(), tokens=tuple(tokens))
+
+
+class DecoyFingerprintIndex:
+    """
+    Canary token -> decoy index
+    Finds decoy content inside arbitrary data with one pass of the canary
+    pattern plus dictionary lookups, independent of the number of decoys
+    """
+
+    def __init__(self):
+        self._by_token: Dict[bytes, Decoy] = {}
+
+    def add(self, decoy: Decoy):
+        """
+        Index a decoy's canary tokens (fingerprints it if needed)
+
+        Args:
+            decoy: Deployed decoy
+        """
+        if decoy.fingerprint is None:
+            decoy.fingerprint = fingerprint_content(decoy.content)
+        for token in decoy.fingerprint.tokens:
+            self._by_token[token.encode("utf-8")] = decoy
+
+    def match(self, data: bytes) -> Optional[Decoy]:
+        """
+        Find decoy content in data
+
+        Args:
+            data: Bytes to search (a whole file or a sampled window)
+
+        Returns:
+            The Decoy whose canary token appears in data, or None
+        """
+        by_token = self._by_token
+        if not by_token:
+            return None
+        for candidate in canary_candidates(data):
+            decoy = by_token.get(candidate)
+            if decoy is not None:
+                return decoy
+        return None
+
+    def __len__(self):
+        return len(self._by_token)
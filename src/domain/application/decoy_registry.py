@@ -0,0 +1,181 @@
+# src/application/decoy_registry.py
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..entities.decoy import Decoy
+
+
+def normalize_path(file_path: str) -> str:
+    """
+    Canonical form used as the registry key
+
+    Args:
+        file_path: Relative or absolute path
+
+    Returns:
+        Absolute, normalized path (case-folded on case-insensitive systems)
+    """
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+class DecoyRegistry:
+    """
+    Index of deployed decoys for O(1) "is this a decoy?" checks
+    Keyed by normalized absolute path and by (device, inode), so renamed,
+    hard-linked or symlinked decoys are still recognised. The inode index
+    is only consulted for paths in decoy directories or when asked, so
+    ordinary events never pay for a stat()
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._by_path: Dict[str, Decoy] = {}
+        self._by_inode: Dict[Tuple[int, int], Decoy] = {}
+        # Reverse index, id(decoy) -> its keys above, so renaming or
+        # forgetting a decoy never scans the whole registry
+        self._paths_of: Dict[int, List[str]] = {}
+        self._inode_of: Dict[int, Tuple[int, int]] = {}
+        self._real_dirs: Dict[str, str] = {}
+        self._decoy_dirs: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def add(self, decoy: Decoy, identity: Optional[Tuple[int, int]] = None):
+        """
+        Register a deployed decoy
+
+        Args:
+            decoy: Decoy whose file already exists on disk
+            identity: Known (device, inode) of the file; skips the stat()
+                      (used when restoring thousands of decoys at startup)
+        """
+        path = normalize_path(decoy.file_path)
+        with self._lock:
+            self._add_path(path, decoy)
+
+            # The decoy may sit below a symlinked directory
+            real_path = self._real_path(path)
+            if real_path != path:
+                self._add_path(real_path, decoy)
+
+            if identity is None:
+                identity = self._identity(path)
+            if identity is not None:
+                self._drop_inode(decoy)
+                previous = self._by_inode.get(identity)
+                if previous is not None and previous is not decoy:
+                    self._inode_of.pop(id(previous), None)
+                self._by_inode[identity] = decoy
+                self._inode_of[id(decoy)] = identity
+
+    def _add_path(self, path: str, decoy: Decoy):
+        """Index one path of a decoy, taking it over from a replaced decoy (lock held)"""
+        previous = self._by_path.get(path)
+        if previous is decoy:
+            return
+        if previous is not None:
+            paths = self._paths_of[id(previous)]
+            paths.remove(path)
+            if not paths:
+                # The replaced decoy is no longer reachable by any path
+                del self._paths_of[id(previous)]
+                self._drop_inode(previous)
+        self._by_path[path] = decoy
+        self._paths_of.setdefault(id(decoy), []).append(path)
+        self._decoy_dirs.add(os.path.dirname(path))
+
+    def _drop_inode(self, decoy: Decoy):
+        """Remove a decoy's inode entry, if it has one (lock held)"""
+        identity = self._inode_of.pop(id(decoy), None)
+        if identity is not None and self._by_inode.get(identity) is decoy:
+            del self._by_inode[identity]
+
+    def _real_path(self, path: str) -> str:
+        """Path with its directory's symlinks resolved (cached per directory)"""
+        directory, name = os.path.split(path)
+        real_directory = self._real_dirs.get(directory)
+        if real_directory is None:
+            real_directory = os.path.normcase(os.path.realpath(directory))
+            self._real_dirs[directory] = real_directory
+        return os.path.join(real_directory, name)
+
+    def lookup(self, file_path: str, check_inode: bool = False) -> Optional[Decoy]:
+        """
+        Find the decoy stored at a path
+
+        The path index answers most lookups. On a miss for a path in a
+        decoy directory, or when check_inode is set, one stat() checks
+        whether the path is a link to (or a renamed copy of) a decoy's inode.
+
+        Args:
+            file_path: Path reported by the file system event
+            check_inode: Fall back to the inode index wherever the path is
+                         (e.g. for the destination of a move)
+
+        Returns:
+            The matching Decoy, or None
+        """
+        path = normalize_path(file_path)
+        decoy = self._by_path.get(path)
+        if decoy is not None or not self._by_inode:
+            return decoy
+        if not check_inode and os.path.dirname(path) not in self._decoy_dirs:
+            return None
+
+        identity = self._identity(file_path)
+        if identity is None:
+            return None
+        return self._by_inode.get(identity)
+
+    def rename(self, src_path: str, dest_path: str) -> Optional[Decoy]:
+        """
+        Follow a decoy that was moved/renamed
+
+        Args:
+            src_path: Old location
+            dest_path: New location
+
+        Returns:
+            The moved Decoy, or None if src_path was not a decoy
+        """
+        decoy = self.lookup(src_path)
+        if decoy is None:
+            return None
+
+        with self._lock:
+            for key in self._paths_of.pop(id(decoy), ()):
+                del self._by_path[key]
+        decoy.file_path = dest_path
+        self.add(decoy)
+        return decoy
+
+    def forget_inode(self, file_path: str):
+        """
+        Drop the inode entry of a deleted decoy
+
+        The path entry is kept (a file recreated there is still a trap),
+        but the freed inode number may be reused by an unrelated file.
+
+        Args:
+            file_path: Path of the deleted decoy
+        """
+        decoy = self._by_path.get(normalize_path(file_path))
+        if decoy is None:
+            return
+        with self._lock:
+            self._drop_inode(decoy)
+
+    @staticmethod
+    def _identity(file_path: str) -> Optional[Tuple[int, int]]:
+        """(device, inode) of a path, following symlinks, or None if missing"""
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat_result.st_dev, stat_result.st_ino)
+
+    def __len__(self):
+        return len(self._paths_of)
+
+    def __contains__(self, file_path: str):
+        return self.lookup(file_path) is not None
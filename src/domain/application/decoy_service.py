@@ -1,7 +1,28 @@
 # src/application/decoy_service.py
 from ..interfaces.decoy_generator import IDecoyGenerator
+from ..interfaces.decoy_store import IDecoyStore
+from ..interfaces.decoy_writer import IDecoyWriter
 from ..entities.decoy import Decoy
-from typing import List
+from ..entities.deployment_report import DeploymentReport
+from .decoy_fingerprint import DecoyFingerprintIndex
+from .decoy_registry import DecoyRegistry
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+import time
+
+# Decoys (type, file name) deployed per threat level
+DECOY_PLANS = {
+    "Suspicious": [
+        ("credential", "passwords.txt"),
+        ("document", "confidential_report.txt"),
+    ],
+    "Critical": [
+        ("credential", "admin_passwords.txt"),
+        ("credential", "api_keys.txt"),
+        ("config", "database_config.yaml"),
+        ("document", "financial_data.txt"),
+    ],
+}
 
 class DecoyService:
     """
@@ -9,15 +30,33 @@ class DecoyService:
     Contains business logic for when and what decoys to deploy
     """
     
-    def __init__(self, decoy_generator: IDecoyGenerator):
+    def __init__(self, decoy_generator: IDecoyGenerator,
+                 decoy_writer: Optional[IDecoyWriter] = None,
+                 decoy_store: Optional[IDecoyStore] = None):
         """
         Initialize the decoy service
         
         Args:
             decoy_generator: Implementation of IDecoyGenerator interface
+            decoy_writer: Implementation of IDecoyWriter used to write
+                          batches of decoys (None writes them one by one
+                          through the generator)
+            decoy_store: Implementation of IDecoyStore that persists
+                         deployed decoys across restarts (None: memory only)
         """
         self.generator = decoy_generator
+        self.writer = decoy_writer
+        self.store = decoy_store
         self.deployed_decoys: List[Decoy] = []
+        
+        # Outcome of the most recent deployment
+        self.last_report: Optional[DeploymentReport] = None
+        
+        # Path/inode index for fast decoy lookups on every file event
+        self.registry = DecoyRegistry()
+        
+        # Canary token index for spotting copies of decoy content
+        self.fingerprints = DecoyFingerprintIndex()
     
     def generate_decoys_for_threat_level(self, threat_level: str, base_path: str) -> List[Decoy]:
         """
@@ -30,36 +69,170 @@ class DecoyService:
         Returns:
             List of generated Decoy objects
         """
-        decoys = []
+        specs = [
+            (decoy_type, f"{base_path}/{file_name}")
+            for decoy_type, file_name in DECOY_PLANS.get(threat_level, [])
+        ]
+        return self.deploy_decoys(specs).deployed
+    
+    def deploy_decoys(self, specs: Iterable[Tuple[str, str]],
+                      now: Optional[float] = None) -> DeploymentReport:
+        """
+        Deploy any number of decoys in one batch
         
-        if threat_level == "Suspicious":
-            # Deploy 2 decoys for suspicious activity
-            decoys.append(self.generator.create_credential_decoy(f"{base_path}/passwords.txt"))
-            decoys.append(self.generator.create_document_decoy(f"{base_path}/confidential_report.txt"))
+        Args:
+            specs: (decoy_type, file_path) pairs with distinct paths
+            now: Deployment time recorded as the decoys' created_at, in
+                 seconds (default: the system clock; simulations pass
+                 their own clock's time)
             
-        elif threat_level == "Critical":
-            # Deploy 4 decoys for critical threats
-            decoys.append(self.generator.create_credential_decoy(f"{base_path}/admin_passwords.txt"))
-            decoys.append(self.generator.create_credential_decoy(f"{base_path}/api_keys.txt"))
-            decoys.append(self.generator.create_config_decoy(f"{base_path}/database_config.yaml"))
-            decoys.append(self.generator.create_document_decoy(f"{base_path}/financial_data.txt"))
+        Returns:
+            DeploymentReport; only successfully written decoys are tracked
+        """
+        specs = list(specs)
+        created_at = datetime.fromtimestamp(now) if now is not None else None
         
-        # Track deployed decoys
-        self.deployed_decoys.extend(decoys)
+        if self.writer is not None:
+            # Render everything first (one bulk pass per type), then let
+            # the writer fan the writes out
+            paths_by_type = {}
+            for decoy_type, file_path in specs:
+                paths_by_type.setdefault(decoy_type, []).append(file_path)
+            rendered = {}
+            for decoy_type, paths in paths_by_type.items():
+                for decoy in self.generator.build_decoys(decoy_type, paths, created_at):
+                    rendered[decoy.file_path] = decoy
+            decoys = [rendered[file_path] for _, file_path in specs]
+            report = self.writer.write_decoys(decoys)
+        else:
+            create = {
+                "credential": self.generator.create_credential_decoy,
+                "document": self.generator.create_document_decoy,
+                "config": self.generator.create_config_decoy,
+            }
+            report = DeploymentReport()
+            start = time.perf_counter()
+            for decoy_type, file_path in specs:
+                written = time.perf_counter()
+                decoy = create[decoy_type](file_path)
+                if created_at is not None:
+                    decoy.created_at = created_at
+                report.deployed.append(decoy)
+                report.latencies[file_path] = time.perf_counter() - written
+            report.elapsed = time.perf_counter() - start
         
-        return decoys
+        # Track deployed decoys; a decoy redeployed at a path replaces the old one
+        replaced = []
+        for decoy in report.deployed:
+            old = self.registry.lookup(decoy.file_path)
+            if old is not None and old is not decoy:
+                self.registry.forget_inode(old.file_path)
+                replaced.append(old)
+            self.registry.add(decoy)
+            self.fingerprints.add(decoy)
+        if replaced:
+            replaced_ids = {id(d) for d in replaced}
+            self.deployed_decoys = [d for d in self.deployed_decoys if id(d) not in replaced_ids]
+        self.deployed_decoys.extend(report.deployed)
+        if self.store is not None and report.deployed:
+            self.store.save(report.deployed)
+        
+        self.last_report = report
+        return report
     
-    def is_decoy_file(self, file_path: str) -> bool:
+    def restore(self) -> dict:
+        """
+        Reload decoys deployed before a restart from the store and
+        reconcile them with the file system
+        
+        Returns:
+            dict: Restored decoy count plus the store's reconcile result
+        """
+        if self.store is None:
+            return {'restored': 0}
+        
+        records = self.store.load()
+        for decoy, identity in records:
+            self.deployed_decoys.append(decoy)
+            self.registry.add(decoy, identity)
+            self.fingerprints.add(decoy)
+        
+        result = self.store.reconcile()
+        for file_path, _ in result['missing']:
+            self.registry.forget_inode(file_path)
+        for file_path, identity in result['changed']:
+            decoy = self.registry.lookup(file_path)
+            if decoy is not None:
+                self.registry.forget_inode(file_path)
+                self.registry.add(decoy, identity)
+        
+        result['restored'] = len(records)
+        return result
+    
+    def is_decoy_file(self, file_path: str, check_inode: bool = False) -> bool:
         """
         Check if a file path is a deployed decoy
         
         Args:
             file_path: Path to check
+            check_inode: Also recognise links to / renamed decoys outside
+                         the decoy directories (costs a stat())
             
         Returns:
             True if file is a decoy, False otherwise
         """
-        return any(decoy.file_path == file_path for decoy in self.deployed_decoys)
+        return self.registry.lookup(file_path, check_inode) is not None
+    
+    def find_decoy(self, file_path: str) -> Optional[Decoy]:
+        """
+        Get the deployed decoy at a path (also via links or renames)
+        
+        Args:
+            file_path: Path to check
+            
+        Returns:
+            Decoy object, or None if the file is not a decoy
+        """
+        return self.registry.lookup(file_path, check_inode=True)
+    
+    def find_decoy_content(self, data: bytes) -> Optional[Decoy]:
+        """
+        Check whether data contains (part of) a deployed decoy
+        
+        Args:
+            data: File content or a sample of it
+            
+        Returns:
+            The Decoy whose canary token appears in data, or None
+        """
+        return self.fingerprints.match(data)
+    
+    def record_decoy_moved(self, src_path: str, dest_path: str) -> Optional[Decoy]:
+        """
+        Keep tracking a decoy after it was moved or renamed
+        
+        Args:
+            src_path: Old location
+            dest_path: New location
+            
+        Returns:
+            The moved Decoy, or None if src_path was not a decoy
+        """
+        decoy = self.registry.rename(src_path, dest_path)
+        if decoy is not None and self.store is not None:
+            self.store.rename(src_path, dest_path)
+        return decoy
+    
+    def record_decoy_deleted(self, file_path: str):
+        """
+        Note that a decoy file was deleted (its inode may now be reused)
+        
+        Args:
+            file_path: Path of the deleted decoy
+        """
+        self.registry.forget_inode(file_path)
+        if self.store is not None:
+            self.store.mark_missing(file_path)
     
     def get_deployed_decoys(self) -> List[Decoy]:
         """
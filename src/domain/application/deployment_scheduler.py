@@ -0,0 +1,189 @@
+# src/application/deployment_scheduler.py
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from .decoy_service import DECOY_PLANS
+
+# Threat levels in escalation order
+LEVEL_ORDER = {"Normal": 0, "Elevated": 1, "Suspicious": 2, "Critical": 3}
+
+
+class TokenBucket:
+    """
+    Token bucket limiting how many decoys are written per unit of time
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        """
+        Args:
+            rate_per_second: Tokens added per second
+            burst: Bucket capacity (largest single deployment)
+        """
+        self.rate = rate_per_second
+        self.capacity = burst
+        self.tokens = float(burst)
+        self._last: Optional[float] = None
+
+    def _refill(self, now: float):
+        if self._last is not None and now > self._last:
+            self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def take(self, wanted: int, now: float) -> int:
+        """
+        Take up to `wanted` tokens
+
+        Returns:
+            int: Tokens granted (0..wanted)
+        """
+        self._refill(now)
+        granted = min(wanted, int(self.tokens))
+        self.tokens -= granted
+        return granted
+
+
+@dataclass
+class RootDeployment:
+    """Deployment state of one watch root in the current epoch"""
+    epoch: int = 0
+    epoch_started: float = 0.0
+    level: int = -1                                # highest level fully served
+    paths: Set[str] = field(default_factory=set)   # decoys deployed this epoch
+    last_deployment: float = 0.0
+
+
+class DeploymentScheduler:
+    """
+    Decides which decoys to deploy, and when, per watch root
+    A root gets the plan of every level it escalates to (top-ups only add
+    decoys not yet deployed). An epoch ends epoch_seconds after it began,
+    so a later attack is served again from scratch. Decoys older than
+    rotate_after_seconds are refreshed, except in roots under attack. All
+    writes share one token bucket that bounds disk churn.
+    """
+
+    def __init__(self, plans: Dict[str, List[Tuple[str, str]]] = None,
+                 epoch_seconds: float = 3600, rotate_after_seconds: float = 86400,
+                 max_decoys_per_minute: int = 20):
+        """
+        Initialize the scheduler
+
+        Args:
+            plans: Threat level -> [(decoy_type, file name)] (default: DECOY_PLANS)
+            epoch_seconds: How long one attack epoch lasts per root
+            rotate_after_seconds: Age at which a decoy's content is refreshed
+                                  (0 disables rotation)
+            max_decoys_per_minute: Decoys written per minute at most
+        """
+        self.plans = plans if plans is not None else DECOY_PLANS
+        self.epoch_seconds = epoch_seconds
+        self.rotate_after_seconds = rotate_after_seconds
+        self.bucket = TokenBucket(max_decoys_per_minute / 60.0, max(1, max_decoys_per_minute))
+        self.roots: Dict[str, RootDeployment] = {}
+
+    def _state(self, root: str, now: float) -> RootDeployment:
+        """Root state, starting a new epoch if the current one expired"""
+        state = self.roots.get(root)
+        if state is None:
+            state = self.roots[root] = RootDeployment(epoch=1, epoch_started=now)
+        elif (state.level >= 0 or state.paths) and now - state.epoch_started >= self.epoch_seconds:
+            state.epoch += 1
+            state.epoch_started = now
+            state.level = -1
+            state.paths = set()
+        return state
+
+    def seed(self, root: str, file_path: str, created_at: float):
+        """
+        Register a decoy deployed before a restart
+
+        Its epoch is taken to have started when the newest such decoy was
+        created, so recent decoys are not redeployed.
+
+        Args:
+            root: Grouping key the decoy belongs to
+            file_path: Decoy path (as plan() would build it)
+            created_at: When the decoy was created
+        """
+        state = self.roots.get(root)
+        if state is None:
+            state = self.roots[root] = RootDeployment(epoch=1, epoch_started=created_at)
+        state.epoch_started = max(state.epoch_started, created_at)
+        state.last_deployment = state.epoch_started
+        state.paths.add(file_path)
+
+    def plan(self, threat_level: str, root: str, target_dir: str, now: float) -> List[Tuple[str, str]]:
+        """
+        Decoys to deploy for a threat seen in a root
+
+        Args:
+            threat_level: Current threat level
+            root: Watch root (or any grouping key) the threat happened in
+            target_dir: Directory the root's decoys go to
+            now: Current time
+
+        Returns:
+            [(decoy_type, file_path)] to deploy now (may be empty)
+        """
+        level = LEVEL_ORDER.get(threat_level, 0)
+        state = self._state(root, now)
+        if level <= state.level:
+            return []
+
+        # Plans of every level up to this one, minus what is already there
+        wanted = []
+        for name, order in sorted(LEVEL_ORDER.items(), key=lambda item: item[1]):
+            if order > level:
+                break
+            for decoy_type, file_name in self.plans.get(name, []):
+                file_path = f"{target_dir}/{file_name}"
+                if file_path not in state.paths:
+                    wanted.append((decoy_type, file_path))
+
+        granted = self.bucket.take(len(wanted), now)
+        specs = wanted[:granted]
+        if granted == len(wanted):
+            # Fully served; a rate-limited remainder is retried on the next event
+            state.level = level
+        if specs:
+            state.paths.update(path for _, path in specs)
+            state.last_deployment = now
+        return specs
+
+    def under_attack(self, root: str, now: float) -> bool:
+        """True while a root's current epoch had a Suspicious+ deployment"""
+        state = self.roots.get(root)
+        return (
+            state is not None
+            and state.level >= LEVEL_ORDER["Suspicious"]
+            and now - state.epoch_started < self.epoch_seconds
+        )
+
+    def rotation_due(self, created_at: float, root: str, now: float) -> bool:
+        """True if a decoy created at `created_at` should be refreshed now"""
+        return (
+            self.rotate_after_seconds > 0
+            and now - created_at >= self.rotate_after_seconds
+            and not self.under_attack(root, now)
+        )
+
+    def grant(self, wanted: int, now: float) -> int:
+        """Take rate-limit tokens for writes outside plan() (rotations)"""
+        return self.bucket.take(wanted, now)
+
+    def snapshot(self) -> dict:
+        """
+        Get per-root deployment state
+
+        Returns:
+            dict: root -> epoch, level served, decoys this epoch
+        """
+        levels = {order: name for name, order in LEVEL_ORDER.items()}
+        return {
+            root: {
+                'epoch': state.epoch,
+                'level': levels.get(state.level),
+                'decoys': len(state.paths),
+            }
+            for root, state in self.roots.items()
+        }
@@ -1,5 +1,47 @@
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional, Tuple
+
+# A canary is 32 lowercase hex characters: 24 random ones plus an 8-character
+# keyed check over them, so a decoy's own canary can be told apart from any
+# other hex string in its content (or in an ordinary file)
+CANARY_LENGTH = 32
+_CANARY_RANDOM_LENGTH = 24
+_CANARY_KEY = b"honeypot-decoy-canary"
+
+
+def _canary_check(random_part: str) -> str:
+    return hashlib.blake2b(random_part.encode("ascii"), digest_size=4, key=_CANARY_KEY).hexdigest()
+
+
+def make_canary(random_bits: int) -> str:
+    """
+    Build a canary value
+
+    Args:
+        random_bits: 96 random bits
+
+    Returns:
+        str: 32 hex characters that pass is_canary()
+    """
+    random_part = format(random_bits, f"0{_CANARY_RANDOM_LENGTH}x")
+    return random_part + _canary_check(random_part)
+
+
+def is_canary(value: str) -> bool:
+    """True if a 32-character hex string was made by make_canary()"""
+    random_part = value[:_CANARY_RANDOM_LENGTH]
+    return len(value) == CANARY_LENGTH and value[_CANARY_RANDOM_LENGTH:] == _canary_check(random_part)
+
+@dataclass(frozen=True)
+class DecoyFingerprint:
+    """
+    Content-defined identity of a decoy
+    Survives copies: any file containing a canary token holds decoy content
+    """
+    sha256: str                  # Hash of the full decoy content
+    tokens: Tuple[str, ...]      # Canary values rendered into the content
 
 @dataclass
 class Decoy:
@@ -10,4 +52,5 @@ class Decoy:
     decoy_type: str      # Type: "credential", "document", "config", etc.
     file_path: str       # Where the decoy is placed
     content: str         # The fake content inside the decoy
-    created_at: datetime # When the decoy was created 
\ No newline at end of file
+    created_at: datetime # When the decoy was created
+    fingerprint: Optional[DecoyFingerprint] = None  # Set when the decoy is deployed
@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from .decoy import Decoy
+
+@dataclass
+class DeploymentReport:
+    """
+    Outcome of writing a batch of decoys to disk
+    Pure business entity: which decoys landed, which failed and how long each took
+    """
+    deployed: List[Decoy] = field(default_factory=list)       # Decoys written successfully
+    failed: Dict[str, str] = field(default_factory=dict)      # file_path -> error message
+    latencies: Dict[str, float] = field(default_factory=dict) # file_path -> seconds to write
+    elapsed: float = 0.0                                       # Wall-clock seconds for the batch
+
+    def latency_percentile(self, percent: float) -> float:
+        """
+        Per-decoy write latency at a percentile
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds (0.0 for an empty batch)
+        """
+        values = sorted(self.latencies.values())
+        if not values:
+            return 0.0
+        index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+        return values[index]
+
+    def summary(self) -> str:
+        """One-line description for the logs"""
+        return (
+            f"{len(self.deployed)} written, {len(self.failed)} failed in {self.elapsed * 1000:.1f} ms "
+            f"(p50 {self.latency_percentile(50) * 1000:.1f} ms, "
+            f"p99 {self.latency_percentile(99) * 1000:.1f} ms per decoy)"
+        )
@@ -0,0 +1,129 @@
+# src/infrastructure/decoy_content_pool.py
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+
+class DecoyContentPool:
+    """
+    Keeps ready-rendered decoy payloads per decoy type
+    A background thread refills the pool between threats, so deploying a
+    decoy takes content instantly instead of paying for Faker on the spot
+    """
+
+    def __init__(self, renderers: Dict[str, Callable[[], str]], size: int = 8,
+                 refill_pause: float = 0.01,
+                 reseed: Optional[Callable[[Optional[int]], None]] = None):
+        """
+        Initialize the pool
+
+        Args:
+            renderers: decoy type -> function that renders one payload
+            size: Payloads kept ready per decoy type
+            refill_pause: Seconds the refill thread sleeps between renders,
+                          so it stays in the background
+            reseed: Function that reseeds the renderers' random source
+        """
+        self.renderers = renderers
+        self.size = size
+        self.refill_pause = refill_pause
+        self._reseed = reseed
+
+        self._payloads = {decoy_type: deque() for decoy_type in renderers}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.rendered = 0
+
+    def start(self):
+        """Start the background refill thread"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._refill_loop, name="decoy-content-refill", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the refill thread"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def take(self, decoy_type: str) -> Optional[str]:
+        """
+        Take a ready payload
+
+        Args:
+            decoy_type: Decoy type to take
+
+        Returns:
+            Rendered content, or None if the pool for this type is empty
+        """
+        payloads = self._payloads.get(decoy_type)
+        try:
+            content = payloads.popleft()
+        except (AttributeError, IndexError):
+            self.misses += 1
+            content = None
+        else:
+            self.hits += 1
+        self._wake.set()
+        return content
+
+    def fill(self):
+        """Render synchronously until every type has `size` payloads ready"""
+        for decoy_type, payloads in self._payloads.items():
+            while len(payloads) < self.size:
+                payloads.append(self.renderers[decoy_type]())
+                self.rendered += 1
+
+    def reseed(self, seed: Optional[int] = None):
+        """
+        Reseed the renderers and throw away payloads made with the old seed
+
+        Args:
+            seed: New seed (None reseeds randomly)
+        """
+        if self._reseed is not None:
+            self._reseed(seed)
+        for payloads in self._payloads.values():
+            payloads.clear()
+        self._wake.set()
+
+    def _refill_loop(self):
+        """Top up the emptiest type one payload at a time until stopped"""
+        while not self._stopping.is_set():
+            decoy_type = min(self._payloads, key=lambda t: len(self._payloads[t]), default=None)
+            if decoy_type is None or len(self._payloads[decoy_type]) >= self.size:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            self._payloads[decoy_type].append(self.renderers[decoy_type]())
+            self.rendered += 1
+            time.sleep(self.refill_pause)
+
+    def get_stats(self) -> dict:
+        """
+        Get pool metrics
+
+        Returns:
+            dict: Hits, misses, payloads rendered and ready payloads per type
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'rendered': self.rendered,
+            'ready': {t: len(p) for t, p in self._payloads.items()},
+            'size': self.size,
+        }
@@ -0,0 +1,281 @@
+# src/infrastructure/decoy_template_engine.py
+import base64
+import os
+import random
+import re
+import string
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from ..entities.decoy import make_canary
+
+# Built-in templates: one <decoy type>.tmpl file per decoy type
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "decoy_templates")
+TEMPLATE_SUFFIX = ".tmpl"
+
+# {{type}}, {{type:arg:arg}} or {{type:arg#label}} - placeholders with the
+# same label get the same value inside one rendered decoy
+_PLACEHOLDER = re.compile(r"\{\{\s*([a-z_0-9]+)((?::[^:#}]*)*)(?:#([A-Za-z_0-9]+))?\s*\}\}")
+
+# Faker-backed fields are drawn from a vocabulary sampled once per seed,
+# so bulk rendering never calls Faker per field
+VOCABULARY_SIZE = 256
+
+_PASSWORD_CHARS = string.ascii_letters + string.digits + "!@#$%^&*()_+-="
+_ALNUM_CHARS = string.ascii_letters + string.digits
+
+
+def _vocabulary_field(faker_call):
+    """Placeholder drawn from a Faker-sampled vocabulary (args are passed to Faker)"""
+    def generate(engine, args, count):
+        words = engine._vocabulary(faker_call, args)
+        return engine.rng.choices(words, k=count)
+    return generate
+
+
+def _random_chars(chars):
+    def generate(engine, args, count):
+        length = int(args[0]) if args else 16
+        choices = engine.rng.choices
+        return ["".join(choices(chars, k=length)) for _ in range(count)]
+    return generate
+
+
+def _password(engine, args, count):
+    chars = _ALNUM_CHARS if args[1:] == ["alnum"] else _PASSWORD_CHARS
+    return _random_chars(chars)(engine, args[:1], count)
+
+
+def _hex(engine, args, count):
+    length = int(args[0]) if args else 32
+    bits = engine.rng.getrandbits
+    return [format(bits(length * 4), f"0{length}x") for _ in range(count)]
+
+
+def _digits(engine, args, count):
+    length = int(args[0]) if args else 6
+    randint = engine.rng.randint
+    return [str(randint(10 ** (length - 1), 10 ** length - 1)) for _ in range(count)]
+
+
+def _int(engine, args, count):
+    low, high = (int(args[0]), int(args[1])) if len(args) == 2 else (0, 100)
+    randint = engine.rng.randint
+    return [str(randint(low, high)) for _ in range(count)]
+
+
+def _uuid(engine, args, count):
+    bits = engine.rng.getrandbits
+    return [str(uuid.UUID(int=bits(128), version=4)) for _ in range(count)]
+
+
+def _ipv4(engine, args, count):
+    randint = engine.rng.randint
+    return [
+        f"{randint(11, 223)}.{randint(0, 255)}.{randint(0, 255)}.{randint(1, 254)}"
+        for _ in range(count)
+    ]
+
+
+def _base64(engine, args, count):
+    size = int(args[0]) if args else 32
+    width = int(args[1]) if len(args) > 1 else 0
+    randbytes = engine.rng.randbytes
+    values = []
+    for _ in range(count):
+        encoded = base64.b64encode(randbytes(size)).decode("ascii")
+        if width:
+            encoded = "\n".join(encoded[i:i + width] for i in range(0, len(encoded), width))
+        values.append(encoded)
+    return values
+
+
+def _canary(engine, args, count):
+    bits = engine.rng.getrandbits
+    return [make_canary(bits(96)) for _ in range(count)]
+
+
+# Placeholder type -> generator(engine, args, count) returning `count` strings
+PLACEHOLDER_TYPES: Dict[str, Callable] = {
+    "username": _vocabulary_field(lambda f: f.user_name()),
+    "name": _vocabulary_field(lambda f: f.name()),
+    "job": _vocabulary_field(lambda f: f.job()),
+    "email": _vocabulary_field(lambda f: f.email()),
+    "phone": _vocabulary_field(lambda f: f.phone_number()),
+    "address": _vocabulary_field(lambda f: f.address()),
+    "domain": _vocabulary_field(lambda f: f.domain_name()),
+    "word": _vocabulary_field(lambda f: f.word()),
+    "company": _vocabulary_field(lambda f: f.company()),
+    "date": _vocabulary_field(lambda f: f.date()),
+    "paragraph": _vocabulary_field(lambda f, sentences="5": f.paragraph(nb_sentences=int(sentences))),
+    "text": _vocabulary_field(lambda f, max_chars="200": f.text(max_nb_chars=int(max_chars))),
+    "password": _password,
+    "alnum": _random_chars(_ALNUM_CHARS),
+    "upper": _random_chars(string.ascii_uppercase + string.digits),
+    "hex": _hex,
+    "digits": _digits,
+    "int": _int,
+    "uuid": _uuid,
+    "ipv4": _ipv4,
+    "base64": _base64,
+    "canary": _canary,  # the decoy's fingerprint token: one per template
+}
+
+
+class CompiledTemplate:
+    """
+    A decoy template compiled to a format string plus one generator per
+    distinct placeholder, so rendering is a single str.format call
+    """
+
+    def __init__(self, decoy_type: str, source: str):
+        """
+        Compile template source
+
+        Args:
+            decoy_type: Decoy type the template renders
+            source: Template text
+
+        Raises:
+            ValueError: If the template uses an unknown placeholder type
+        """
+        self.decoy_type = decoy_type
+        self.fields = []   # (generator, args) per format-string field
+        labels = {}
+        parts = []
+        position = 0
+
+        for match in _PLACEHOLDER.finditer(source):
+            kind, raw_args, label = match.groups()
+            if kind not in PLACEHOLDER_TYPES:
+                raise ValueError(
+                    f"Unknown placeholder {{{{{kind}}}}} in {decoy_type} template"
+                )
+
+            if label is not None and label in labels:
+                index = labels[label]
+            else:
+                index = len(self.fields)
+                args = raw_args.split(":")[1:] if raw_args else []
+                self.fields.append((PLACEHOLDER_TYPES[kind], args))
+                if label is not None:
+                    labels[label] = index
+
+            literal = source[position:match.start()]
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            parts.append(f"{{{index}}}")
+            position = match.end()
+
+        parts.append(source[position:].replace("{", "{{").replace("}", "}}"))
+        self.format_string = "".join(parts)
+
+    def render_many(self, engine: "DecoyTemplateEngine", count: int) -> List[str]:
+        """Render `count` decoys, generating each placeholder column in one call"""
+        columns = [generate(engine, args, count) for generate, args in self.fields]
+        fmt = self.format_string.format
+        if not columns:
+            return [fmt()] * count
+        return [fmt(*row) for row in zip(*columns)]
+
+
+class DecoyTemplateEngine:
+    """
+    Loads decoy templates from disk and renders them
+    Each <type>.tmpl file in the template directory becomes a decoy type;
+    templates are compiled once, so adding a decoy type needs no code
+    """
+
+    def __init__(self, template_dir: Optional[str] = None, seed: Optional[int] = None):
+        """
+        Initialize the engine and compile every template
+
+        Args:
+            template_dir: Directory of *.tmpl files (default: built-in templates)
+            seed: Random seed (same seed -> same sequence of decoys)
+        """
+        self.template_dir = template_dir or DEFAULT_TEMPLATE_DIR
+        self.templates: Dict[str, CompiledTemplate] = {}
+
+        # Generators share one random source; the pool renders in the background
+        self._lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self._seed = seed
+        self._faker = None
+        self._vocabularies = {}
+
+        self.load()
+
+    def load(self):
+        """(Re)compile every template in the template directory"""
+        templates = {}
+        for file_name in sorted(os.listdir(self.template_dir)):
+            if not file_name.endswith(TEMPLATE_SUFFIX):
+                continue
+            decoy_type = file_name[:-len(TEMPLATE_SUFFIX)]
+            with open(os.path.join(self.template_dir, file_name), encoding="utf-8") as f:
+                templates[decoy_type] = CompiledTemplate(decoy_type, f.read())
+        self.templates = templates
+
+    def types(self) -> List[str]:
+        """Decoy types that have a template"""
+        return list(self.templates)
+
+    def reseed(self, seed: Optional[int] = None):
+        """
+        Reseed the random source and resample the vocabularies
+
+        Args:
+            seed: New seed (None reseeds randomly)
+        """
+        with self._lock:
+            self.rng.seed(seed)
+            self._seed = seed
+            self._vocabularies.clear()
+
+    def _vocabulary(self, faker_call, args) -> List[str]:
+        """Faker samples for one field (built on first use per seed)"""
+        key = (faker_call, tuple(args))
+        words = self._vocabularies.get(key)
+        if words is None:
+            if self._faker is None:
+                # Imported on first use: loading Faker's locales is slow
+                from faker import Faker
+                self._faker = Faker()
+            self._faker.seed_instance(self.rng.getrandbits(64) if self._seed is not None else None)
+            words = [faker_call(self._faker, *args) for _ in range(VOCABULARY_SIZE)]
+            self._vocabularies[key] = words
+        return words
+
+    def _template(self, decoy_type: str) -> CompiledTemplate:
+        template = self.templates.get(decoy_type)
+        if template is None:
+            raise ValueError(f"No template for decoy type: {decoy_type}")
+        return template
+
+    def render(self, decoy_type: str) -> str:
+        """
+        Render one decoy
+
+        Args:
+            decoy_type: Decoy type (template name)
+
+        Returns:
+            Rendered content
+        """
+        return self.render_many(decoy_type, 1)[0]
+
+    def render_many(self, decoy_type: str, count: int) -> List[str]:
+        """
+        Render many decoys of one type in a single call
+
+        Args:
+            decoy_type: Decoy type (template name)
+            count: Number of decoys
+
+        Returns:
+            List of rendered contents
+        """
+        template = self._template(decoy_type)
+        with self._lock:
+            return template.render_many(self, count)
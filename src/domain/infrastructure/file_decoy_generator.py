@@ -1,19 +1,119 @@
 # src/infrastructure/file_decoy_generator.py
-from faker import Faker
 from datetime import datetime
+from functools import partial
+from typing import List, Optional
 import os
 from ..interfaces.decoy_generator import IDecoyGenerator
 from ..entities.decoy import Decoy
+from .decoy_content_pool import DecoyContentPool
+from .decoy_template_engine import DecoyTemplateEngine
+from .parallel_decoy_writer import write_file_atomic
 
 class FileDecoyGenerator(IDecoyGenerator):
     """
-    Implements IDecoyGenerator using Faker library
+    Implements IDecoyGenerator with compiled decoy templates
     Creates realistic fake files and writes them to the file system
     """
     
-    def __init__(self):
-        """Initialize the file decoy generator with Faker"""
-        self.faker = Faker()
+    def __init__(self, pool_size: int = 0, refill_pause: float = 0.01,
+                 template_dir: Optional[str] = None):
+        """
+        Initialize the file decoy generator and compile its templates
+        
+        Args:
+            pool_size: Ready-rendered payloads kept per decoy type
+                       (0 renders every decoy on demand)
+            refill_pause: Seconds between background pool renders
+            template_dir: Directory of <type>.tmpl decoy templates
+                          (default: the built-in templates)
+        """
+        self.templates = DecoyTemplateEngine(template_dir)
+        
+        self.content_pool: Optional[DecoyContentPool] = None
+        if pool_size > 0:
+            self.content_pool = DecoyContentPool(
+                {t: partial(self.templates.render, t) for t in self.templates.types()},
+                size=pool_size,
+                refill_pause=refill_pause,
+                reseed=self.reseed,
+            )
+            self.content_pool.start()
+    
+    def reseed(self, seed: Optional[int] = None):
+        """
+        Reseed the templates (same seed -> same sequence of decoy contents)
+        
+        Args:
+            seed: New seed (None reseeds randomly)
+        """
+        self.templates.reseed(seed)
+    
+    def _content_for(self, decoy_type: str) -> str:
+        """Take a pooled payload if one is ready, otherwise render one now"""
+        if self.content_pool is not None:
+            content = self.content_pool.take(decoy_type)
+            if content is not None:
+                return content
+        return self.templates.render(decoy_type)
+    
+    def build_decoy(self, decoy_type: str, file_path: str,
+                    created_at: Optional[datetime] = None) -> Decoy:
+        """
+        Render a decoy without writing it (a writer puts it on disk later)
+        
+        Args:
+            decoy_type: Any template type ("credential", "env", "ssh_key", ...)
+            file_path: Where the decoy file will be placed
+            created_at: Creation time to record (default: now)
+            
+        Returns:
+            Decoy object with rendered content
+        """
+        return Decoy(
+            decoy_type=decoy_type,
+            file_path=file_path,
+            content=self._content_for(decoy_type),
+            created_at=created_at or datetime.now()
+        )
+    
+    def build_decoys(self, decoy_type: str, file_paths: List[str],
+                     created_at: Optional[datetime] = None) -> List[Decoy]:
+        """
+        Render many decoys of one type, taking pooled payloads first and
+        rendering the remainder in one bulk template pass
+        
+        Args:
+            decoy_type: Any template type
+            file_paths: Where each decoy will be placed
+            created_at: Creation time to record (default: now)
+            
+        Returns:
+            List of Decoy objects, one per path
+        """
+        if len(file_paths) == 1:
+            return [self.build_decoy(decoy_type, file_paths[0], created_at)]
+        
+        created_at = created_at or datetime.now()
+        contents = []
+        if self.content_pool is not None:
+            while len(contents) < len(file_paths):
+                content = self.content_pool.take(decoy_type)
+                if content is None:
+                    break
+                contents.append(content)
+        remaining = len(file_paths) - len(contents)
+        if remaining:
+            contents.extend(self.templates.render_many(decoy_type, remaining))
+        return [
+            Decoy(decoy_type=decoy_type, file_path=path, content=content, created_at=created_at)
+            for path, content in zip(file_paths, contents)
+        ]
+    
+    def _create(self, decoy_type: str, file_path: str) -> Decoy:
+        """Render a decoy and write it to the file system"""
+        decoy = self.build_decoy(decoy_type, file_path)
+        self._write_to_file(file_path, decoy.content)
+        return decoy
     
     def create_credential_decoy(self, file_path: str) -> Decoy:
         """
@@ -25,33 +125,7 @@ class FileDecoyGenerator(IDecoyGenerator):
         Returns:
             Decoy object with fake credential content
         """
-        # Generate fake credentials using Faker
-        content = f"""# Credentials File
-# DO NOT SHARE - CONFIDENTIAL
-
-Username: {self.faker.user_name()}
-Password: {self.faker.password(length=12, special_chars=True)}
-
-Admin Username: {self.faker.user_name()}
-Admin Password: {self.faker.password(length=16, special_chars=True)}
-
-Database User: {self.faker.user_name()}
-Database Password: {self.faker.password(length=20, special_chars=True)}
-
-API Key: {self.faker.uuid4()}
-Secret Token: {self.faker.sha256()}
-"""
-        
-        # Write to file system
-        self._write_to_file(file_path, content)
-        
-        # Return Decoy object
-        return Decoy(
-            decoy_type="credential",
-            file_path=file_path,
-            content=content,
-            created_at=datetime.now()
-        )
+        return self._create("credential", file_path)
     
     def create_document_decoy(self, file_path: str) -> Decoy:
         """
@@ -63,39 +137,7 @@ Secret Token: {self.faker.sha256()}
         Returns:
             Decoy object with fake document content
         """
-        # Generate fake document using Faker
-        content = f"""CONFIDENTIAL REPORT
-Date: {self.faker.date()}
-Author: {self.faker.name()}
-Department: {self.faker.job()}
-
-SUMMARY:
-{self.faker.paragraph(nb_sentences=5)}
-
-DETAILS:
-{self.faker.text(max_nb_chars=500)}
-
-FINANCIAL DATA:
-Revenue: ${self.faker.random_number(digits=7)}
-Expenses: ${self.faker.random_number(digits=6)}
-Profit Margin: {self.faker.random_int(min=10, max=40)}%
-
-CONTACT INFORMATION:
-Email: {self.faker.email()}
-Phone: {self.faker.phone_number()}
-Address: {self.faker.address()}
-"""
-        
-        # Write to file system
-        self._write_to_file(file_path, content)
-        
-        # Return Decoy object
-        return Decoy(
-            decoy_type="document",
-            file_path=file_path,
-            content=content,
-            created_at=datetime.now()
-        )
+        return self._create("document", file_path)
     
     def create_config_decoy(self, file_path: str) -> Decoy:
         """
@@ -107,41 +149,7 @@ Address: {self.faker.address()}
         Returns:
             Decoy object with fake config content
         """
-        # Generate fake config using Faker
-        content = f"""# Database Configuration
-# PRODUCTION SETTINGS - DO NOT MODIFY
-
-database:
-  host: {self.faker.ipv4()}
-  port: {self.faker.random_int(min=3000, max=9999)}
-  username: {self.faker.user_name()}
-  password: {self.faker.password(length=16)}
-  database_name: {self.faker.word()}_production
-
-api:
-  endpoint: https://{self.faker.domain_name()}/api/v1
-  api_key: {self.faker.uuid4()}
-  secret_key: {self.faker.sha256()}
-  
-security:
-  encryption_key: {self.faker.sha256()}
-  jwt_secret: {self.faker.uuid4()}
-  
-admin:
-  email: {self.faker.email()}
-  backup_email: {self.faker.email()}
-"""
-        
-        # Write to file system
-        self._write_to_file(file_path, content)
-        
-        # Return Decoy object
-        return Decoy(
-            decoy_type="config",
-            file_path=file_path,
-            content=content,
-            created_at=datetime.now()
-        )
+        return self._create("config", file_path)
     
     def _write_to_file(self, file_path: str, content: str):
         """
@@ -153,9 +161,8 @@ admin:
         """
         # Create directory if it doesn't exist
         directory = os.path.dirname(file_path)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
         
-        # Write content to file
-        with open(file_path, 'w') as f:
-            f.write(content)
+        # Temp file + rename, so nobody reads a half-written decoy
+        write_file_atomic(file_path, content)
@@ -0,0 +1,60 @@
+# src/infrastructure/lazy_decoy_generator.py
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from ..entities.decoy import Decoy
+from ..interfaces.decoy_generator import IDecoyGenerator
+
+
+class LazyDecoyGenerator(IDecoyGenerator):
+    """
+    Implements IDecoyGenerator by building the real generator on first use
+    Decoys are only needed once a threat is detected, so the agent starts
+    without compiling templates or loading Faker
+    """
+
+    def __init__(self, factory: Callable[[], IDecoyGenerator]):
+        """
+        Args:
+            factory: Builds the real generator (called at most once)
+        """
+        self._factory = factory
+        self._target = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """True once the real generator exists"""
+        return self._target is not None
+
+    @property
+    def target(self) -> IDecoyGenerator:
+        """The real generator, built on first access"""
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._factory()
+        return self._target
+
+    @property
+    def content_pool(self):
+        """The real generator's content pool, without building it"""
+        return getattr(self._target, "content_pool", None)
+
+    def create_credential_decoy(self, file_path: str) -> Decoy:
+        return self.target.create_credential_decoy(file_path)
+
+    def create_document_decoy(self, file_path: str) -> Decoy:
+        return self.target.create_document_decoy(file_path)
+
+    def create_config_decoy(self, file_path: str) -> Decoy:
+        return self.target.create_config_decoy(file_path)
+
+    def build_decoy(self, decoy_type: str, file_path: str,
+                    created_at: Optional[datetime] = None) -> Decoy:
+        return self.target.build_decoy(decoy_type, file_path, created_at)
+
+    def build_decoys(self, decoy_type: str, file_paths: List[str],
+                     created_at: Optional[datetime] = None) -> List[Decoy]:
+        return self.target.build_decoys(decoy_type, file_paths, created_at)
@@ -0,0 +1,146 @@
+# src/infrastructure/parallel_decoy_writer.py
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from ..entities.decoy import Decoy
+from ..entities.deployment_report import DeploymentReport
+from ..interfaces.decoy_writer import IDecoyWriter
+
+# Names of the temporary files a decoy is written to before its rename
+TEMP_PREFIX = ".~"
+TEMP_SUFFIX = ".tmp"
+
+
+def is_temp_file(file_path: str) -> bool:
+    """True if a path looks like a decoy's temporary file"""
+    name = os.path.basename(file_path)
+    return name.startswith(TEMP_PREFIX) and name.endswith(TEMP_SUFFIX)
+
+
+def _create_temp_file(directory: str):
+    """
+    Create a uniquely named temporary file in a directory
+
+    Created with mode 0666 so the umask gives the same permissions a
+    plain open() would (mkstemp forces 0600).
+
+    Returns:
+        (file descriptor, path)
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_path = os.path.join(directory, f"{TEMP_PREFIX}{os.urandom(6).hex()}{TEMP_SUFFIX}")
+        try:
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+def write_file_atomic(file_path: str, content: str):
+    """
+    Write a file so readers see either nothing or the complete content
+
+    The content goes to a temporary file in the same directory which is
+    then renamed over file_path; a reader never catches a half-written decoy.
+
+    Args:
+        file_path: Destination path (its directory must exist)
+        content: Text to write
+    """
+    directory = os.path.dirname(file_path) or "."
+    fd, temp_path = _create_temp_file(directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ParallelDecoyWriter(IDecoyWriter):
+    """
+    Implements IDecoyWriter with a thread pool and atomic renames
+    Decoys are written concurrently, so deploying dozens or thousands of
+    them costs roughly the slowest write instead of the sum of all writes
+    """
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Initialize the writer
+
+        Args:
+            max_workers: Concurrent write threads
+        """
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # Directories already created (skips a makedirs per decoy)
+        self._known_dirs = set()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool, created on the first deployment"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="decoy-writer"
+                )
+            return self._executor
+
+    def _ensure_directory(self, file_path: str):
+        directory = os.path.dirname(file_path)
+        if directory and directory not in self._known_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._known_dirs.add(directory)
+
+    def _write_one(self, decoy: Decoy):
+        """Write one decoy; returns (decoy, seconds, error message or None)"""
+        start = time.perf_counter()
+        try:
+            self._ensure_directory(decoy.file_path)
+            write_file_atomic(decoy.file_path, decoy.content)
+        except OSError as e:
+            return decoy, time.perf_counter() - start, str(e)
+        return decoy, time.perf_counter() - start, None
+
+    def write_decoys(self, decoys: List[Decoy]) -> DeploymentReport:
+        """
+        Write decoys concurrently
+
+        Args:
+            decoys: Rendered Decoy objects
+
+        Returns:
+            DeploymentReport (deployed keeps the input order)
+        """
+        report = DeploymentReport()
+        start = time.perf_counter()
+
+        if len(decoys) == 1 or self.max_workers == 1:
+            results = map(self._write_one, decoys)
+        else:
+            results = self._get_executor().map(self._write_one, decoys)
+
+        for decoy, seconds, error in results:
+            report.latencies[decoy.file_path] = seconds
+            if error is None:
+                report.deployed.append(decoy)
+            else:
+                report.failed[decoy.file_path] = error
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def close(self):
+        """Shut the thread pool down"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
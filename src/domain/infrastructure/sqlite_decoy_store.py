@@ -0,0 +1,279 @@
+# src/infrastructure/sqlite_decoy_store.py
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..entities.decoy import Decoy, DecoyFingerprint
+from ..interfaces.decoy_store import IDecoyStore, Identity
+
+_SCHEMA = """
+BEGIN;
+CREATE TABLE IF NOT EXISTS decoys (
+    path       TEXT PRIMARY KEY,
+    directory  TEXT NOT NULL,
+    decoy_type TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    sha256     TEXT,
+    tokens     TEXT,
+    device     INTEGER,
+    inode      INTEGER,
+    size       INTEGER,
+    mtime_ns   INTEGER
+);
+CREATE INDEX IF NOT EXISTS decoys_by_directory ON decoys (directory);
+CREATE TABLE IF NOT EXISTS directories (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER
+);
+COMMIT;
+"""
+
+# Canary tokens are stored in one column
+_TOKEN_SEPARATOR = "\n"
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+class SqliteDecoyStore(IDecoyStore):
+    """
+    Implements IDecoyStore with SQLite in WAL mode
+    One row per decoy (path, inode, type, fingerprint, created_at) plus the
+    mtime of every decoy directory. At startup only directories whose
+    mtime changed are re-examined, so restarting with tens of thousands of
+    decoys costs one query instead of a stat() per file.
+
+    Decoy content is not stored (it lives in the decoy file); restored
+    decoys carry their fingerprint instead.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the store
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+
+        # A new database is only created on the first save: switching it to
+        # WAL costs an fsync that should not delay the agent's first start
+        self._connection = None
+        if os.path.exists(db_path):
+            self._connect()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._connection = connection
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Database connection, created on first use"""
+        if self._connection is None:
+            self._connect()
+        return self._connection
+
+    def load(self) -> List[Tuple[Decoy, Optional[Identity]]]:
+        """
+        Load every stored decoy
+
+        Returns:
+            (Decoy, identity) pairs
+        """
+        if self._connection is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, decoy_type, created_at, sha256, tokens, device, inode FROM decoys"
+            ).fetchall()
+
+        fromtimestamp = datetime.fromtimestamp
+        records = []
+        for path, decoy_type, created_at, sha256, tokens, device, inode in rows:
+            fingerprint = None
+            if sha256 is not None:
+                fingerprint = DecoyFingerprint(
+                    sha256=sha256,
+                    tokens=tuple(tokens.split(_TOKEN_SEPARATOR)) if tokens else (),
+                )
+            decoy = Decoy(
+                decoy_type=decoy_type,
+                file_path=path,
+                content="",
+                created_at=fromtimestamp(created_at),
+                fingerprint=fingerprint,
+            )
+            records.append((decoy, (device, inode) if inode is not None else None))
+        return records
+
+    def save(self, decoys: List[Decoy]):
+        """
+        Store newly deployed decoys in one transaction
+
+        Args:
+            decoys: Deployed Decoy objects
+        """
+        rows = []
+        directories = set()
+        for decoy in decoys:
+            path = os.path.abspath(decoy.file_path)
+            directory = os.path.dirname(path)
+            directories.add(directory)
+            st = _stat(path)
+            fingerprint = decoy.fingerprint
+            rows.append((
+                path,
+                directory,
+                decoy.decoy_type,
+                decoy.created_at.timestamp(),
+                fingerprint.sha256 if fingerprint else None,
+                _TOKEN_SEPARATOR.join(fingerprint.tokens) if fingerprint else None,
+                st.st_dev if st else None,
+                st.st_ino if st else None,
+                st.st_size if st else None,
+                st.st_mtime_ns if st else None,
+            ))
+
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO decoys VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._record_directories(directories)
+
+    def rename(self, src_path: str, dest_path: str):
+        """
+        Record that a decoy was moved
+
+        Args:
+            src_path: Old location
+            dest_path: New location
+        """
+        dest_path = os.path.abspath(dest_path)
+        st = _stat(dest_path)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM decoys WHERE path = ?", (dest_path,))
+            self._conn.execute(
+                "UPDATE decoys SET path = ?, directory = ?, device = ?, inode = ?, "
+                "size = ?, mtime_ns = ? WHERE path = ?",
+                (
+                    dest_path, os.path.dirname(dest_path),
+                    st.st_dev if st else None, st.st_ino if st else None,
+                    st.st_size if st else None, st.st_mtime_ns if st else None,
+                    os.path.abspath(src_path),
+                ),
+            )
+            self._record_directories({os.path.dirname(os.path.abspath(src_path)),
+                                      os.path.dirname(dest_path)})
+
+    def mark_missing(self, file_path: str):
+        """
+        Record that a decoy file was deleted (the path is kept as a trap)
+
+        Args:
+            file_path: Path of the deleted decoy
+        """
+        file_path = os.path.abspath(file_path)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "UPDATE decoys SET device = NULL, inode = NULL, size = NULL, mtime_ns = NULL "
+                "WHERE path = ?",
+                (file_path,),
+            )
+            self._record_directories({os.path.dirname(file_path)})
+
+    def reconcile(self) -> Dict[str, Any]:
+        """
+        Re-examine decoys in directories modified since they were recorded
+
+        A directory's mtime changes whenever an entry is added, removed or
+        renamed, so unchanged directories cannot hide deleted or replaced
+        decoys and are skipped without touching their files.
+
+        Returns:
+            {'missing': [(path, None)], 'changed': [(path, identity)],
+             'directories_checked': n, 'directories_skipped': n}
+        """
+        if self._connection is None:
+            return {'missing': [], 'changed': [], 'directories_checked': 0, 'directories_skipped': 0}
+        with self._lock:
+            directories = self._conn.execute("SELECT path, mtime_ns FROM directories").fetchall()
+
+        missing, changed = [], []
+        checked, skipped = [], 0
+        for directory, mtime_ns in directories:
+            st = _stat(directory)
+            if st is not None and st.st_mtime_ns == mtime_ns:
+                skipped += 1
+                continue
+            checked.append(directory)
+
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT path, device, inode, size, mtime_ns FROM decoys WHERE directory = ?",
+                    (directory,),
+                ).fetchall()
+            for path, device, inode, size, file_mtime_ns in rows:
+                st = _stat(path)
+                if st is None:
+                    if inode is not None:
+                        missing.append((path, None))
+                elif (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns) != (device, inode, size, file_mtime_ns):
+                    changed.append((path, st))
+
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "UPDATE decoys SET device = NULL, inode = NULL, size = NULL, mtime_ns = NULL "
+                "WHERE path = ?", [(path,) for path, _ in missing],
+            )
+            self._conn.executemany(
+                "UPDATE decoys SET device = ?, inode = ?, size = ?, mtime_ns = ? WHERE path = ?",
+                [(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, path) for path, st in changed],
+            )
+            self._record_directories(checked)
+
+        return {
+            'missing': missing,
+            'changed': [(path, (st.st_dev, st.st_ino)) for path, st in changed],
+            'directories_checked': len(checked),
+            'directories_skipped': skipped,
+        }
+
+    def _record_directories(self, directories):
+        """Remember the current mtime of decoy directories (inside a transaction)"""
+        rows = []
+        for directory in directories:
+            st = _stat(directory)
+            rows.append((directory, st.st_mtime_ns if st else None))
+        self._conn.executemany("INSERT OR REPLACE INTO directories VALUES (?, ?)", rows)
+
+    def count(self) -> int:
+        """Number of stored decoys"""
+        if self._connection is None:
+            return 0
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM decoys").fetchone()[0]
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
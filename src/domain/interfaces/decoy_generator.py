@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
 from ..entities.decoy import Decoy
 
 
@@ -46,4 +48,35 @@ class IDecoyGenerator(ABC):
             Decoy object with fake config content.
         """
         pass
-        
+
+    @abstractmethod
+    def build_decoy(self, decoy_type: str, file_path: str,
+                    created_at: Optional[datetime] = None) -> Decoy:
+        """
+        Render a decoy without writing it (used for batched deployment)
+
+        Args:
+            decoy_type: "credential", "document", "config" or any other
+                        type the implementation supports.
+            file_path: Where the decoy file will be placed.
+            created_at: Creation time to record (default: now).
+
+        Returns:
+            Decoy object with rendered content, not yet on disk.
+        """
+        pass
+
+    def build_decoys(self, decoy_type: str, file_paths: List[str],
+                     created_at: Optional[datetime] = None) -> List[Decoy]:
+        """
+        Render many decoys of one type (implementations may batch this)
+
+        Args:
+            decoy_type: Type of every decoy.
+            file_paths: Where each decoy will be placed.
+            created_at: Creation time to record (default: now).
+
+        Returns:
+            List of Decoy objects, one per path, not yet on disk.
+        """
+        return [self.build_decoy(decoy_type, path, created_at) for path in file_paths]
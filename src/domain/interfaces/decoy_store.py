@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..entities.decoy import Decoy
+
+# (device, inode) of a decoy file
+Identity = Tuple[int, int]
+
+
+class IDecoyStore(ABC):
+    """
+    Interface that defines how deployed decoys are persisted
+    Lets the agent remember its traps across restarts.
+    """
+
+    @abstractmethod
+    def load(self) -> List[Tuple[Decoy, Optional[Identity]]]:
+        """
+        Load every stored decoy
+
+        Returns:
+            (Decoy, identity) pairs; identity is None if the file was missing.
+        """
+        pass
+
+    @abstractmethod
+    def save(self, decoys: List[Decoy]):
+        """
+        Store newly deployed decoys (their files already exist)
+
+        Args:
+            decoys: Deployed Decoy objects.
+        """
+        pass
+
+    @abstractmethod
+    def rename(self, src_path: str, dest_path: str):
+        """
+        Record that a decoy was moved
+
+        Args:
+            src_path: Old location.
+            dest_path: New location.
+        """
+        pass
+
+    @abstractmethod
+    def mark_missing(self, file_path: str):
+        """
+        Record that a decoy file was deleted (the path is kept as a trap)
+
+        Args:
+            file_path: Path of the deleted decoy.
+        """
+        pass
+
+    @abstractmethod
+    def reconcile(self) -> Dict[str, Any]:
+        """
+        Bring the stored identities up to date with the file system
+
+        Returns:
+            {'missing': [(path, None)], 'changed': [(path, new identity)]}
+            plus implementation-specific counters.
+        """
+        pass
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from ..entities.decoy import Decoy
+from ..entities.deployment_report import DeploymentReport
+
+
+class IDecoyWriter(ABC):
+    """
+    Interface that defines how rendered decoys are put on disk
+    Lets the application layer deploy many decoys at once without knowing
+    how (threads, atomic renames, ...) the files get written.
+    """
+
+    @abstractmethod
+    def write_decoys(self, decoys: List[Decoy]) -> DeploymentReport:
+        """
+        Write every decoy's content to its file_path
+
+        Args:
+            decoys: Rendered Decoy objects
+
+        Returns:
+            DeploymentReport with the written decoys, failures and latencies
+        """
+        pass
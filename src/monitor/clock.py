@@ -0,0 +1,66 @@
+# src/monitor/clock.py
+import time
+
+
+class SystemClock:
+    """
+    The real clock
+    Detectors and managers read time through a clock object so tests and
+    simulations can substitute a SimulatedClock.
+    """
+
+    def time(self):
+        """Wall-clock time in seconds since the epoch (time.time())"""
+        return time.time()
+
+    def monotonic(self):
+        """Monotonic seconds for measuring durations (time.monotonic())"""
+        return time.monotonic()
+
+
+class SimulatedClock:
+    """
+    A clock that only moves when told to
+    Lets an attack timeline spanning hours be replayed at full CPU speed
+    with exactly reproducible windows and time-of-day rules.
+    """
+
+    def __init__(self, start=0.0):
+        """
+        Args:
+            start: Initial wall-clock time (seconds since the epoch)
+        """
+        self.start = start
+        self.now = start
+
+    def time(self):
+        """Current simulated wall-clock time"""
+        return self.now
+
+    def monotonic(self):
+        """Simulated seconds since the clock was created"""
+        return self.now - self.start
+
+    def set(self, timestamp):
+        """
+        Jump to a point in time
+
+        Args:
+            timestamp: New wall-clock time (must not go backwards)
+        """
+        if timestamp < self.now:
+            raise ValueError(f"Simulated clock cannot go back from {self.now} to {timestamp}")
+        self.now = timestamp
+
+    def advance(self, seconds):
+        """
+        Move the clock forward
+
+        Args:
+            seconds: Seconds to advance
+        """
+        self.set(self.now + seconds)
+
+
+# Shared default for components created without a clock
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,346 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+import yaml
+
+# Relative config paths are resolved against the project root
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Points a sensitive keyword adds when the config gives no weight
+DEFAULT_KEYWORD_WEIGHT = 25
+
+DEFAULT_SENSITIVE_KEYWORDS = (
+    'password', 'passwd', 'pwd',
+    'secret', 'key', 'token',
+    'config', 'credential', 'auth',
+    'private', 'id_rsa', 'ssh',
+    'api_key', 'database', 'backup',
+)
+
+
+# How events are grouped into independent detector shards
+PARTITION_KEYS = ("global", "root", "top_dir", "owner")
+
+
+def _number(section, key, default, minimum=0, allow_minimum=True, cast=None):
+    """
+    Read a numeric setting, raising ValueError if it is not a usable number
+
+    Args:
+        section: Config section dict
+        key: Setting name
+        default: Value when the key is missing
+        minimum: Smallest accepted value
+        allow_minimum: Whether minimum itself is accepted
+        cast: Type to convert to (default: keep ints and floats as written)
+
+    Returns:
+        The number
+    """
+    value = section.get(key, default)
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(f"{key} must be a number, not {value!r}") from None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        raise ValueError(f"{key} must be a number, not {value!r}")
+    if value < minimum or (value == minimum and not allow_minimum):
+        bound = ">=" if allow_minimum else ">"
+        raise ValueError(f"{key} must be {bound} {minimum}, not {value!r}")
+    if cast is not None:
+        if cast is int and value != int(value):
+            raise ValueError(f"{key} must be a whole number, not {value!r}")
+        value = cast(value)
+    return value
+
+
+def resolve_config_path(config_path):
+    """Absolute path of a config file (relative paths are under the project root)"""
+    config_file = Path(config_path)
+    if not config_file.is_absolute():
+        config_file = PROJECT_ROOT / config_file
+    return config_file
+
+
+def _parse_config(config_file):
+    """Parse a YAML config file, raising OSError/ValueError if it is missing or broken"""
+    with open(config_file, "r", encoding="utf-8") as file:
+        data = yaml.safe_load(file) or {}
+    if not isinstance(data, dict):
+        raise ValueError("top level is not a mapping")
+    return data
+
+
+def _read_config(config_file, logger=None):
+    """Parse a YAML config file; missing or broken files give an empty dict"""
+    if not config_file.exists():
+        if logger:
+            logger.log_warning(f"Config not found at {config_file}; using defaults")
+        return {}
+
+    try:
+        data = _parse_config(config_file)
+        ThreatDetectionSettings.from_config(data)
+        return data
+    except Exception as exc:
+        if logger:
+            logger.log_error(f"Failed to load config {config_file}: {exc}; using defaults")
+        return {}
+
+
+@dataclass(frozen=True)
+class ThreatDetectionSettings:
+    """Typed view of the threat_detection config section"""
+
+    # Time window for event analysis (5 minutes = 300 seconds)
+    time_window: float = 300
+
+    # Rapid access threshold (events in 10 seconds)
+    rapid_access_window: float = 10
+    rapid_access_threshold: float = 5
+
+    # Deletion threshold (deletions in 30 seconds)
+    deletion_window: float = 30
+    deletion_threshold: float = 3
+
+    # Extra weight each merged repeat of a coalesced event adds to the
+    # rapid-access and deletion counts (0 = a storm counts as one event)
+    repeat_event_weight: float = 0.0
+
+    # Number of path verdicts remembered by the keyword matcher
+    sensitive_path_cache_size: int = 4096
+
+    # Points added for a path containing each keyword
+    sensitive_keyword_weights: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(DEFAULT_SENSITIVE_KEYWORDS, DEFAULT_KEYWORD_WEIGHT)
+    )
+
+    # How events are grouped into detector shards (only read at startup)
+    partition_key: str = "global"
+
+    @classmethod
+    def from_config(cls, config_data):
+        """
+        Build settings from a parsed config dict
+        Missing keys fall back to the defaults above.
+
+        Args:
+            config_data: Parsed config dict
+
+        Returns:
+            ThreatDetectionSettings
+
+        Raises:
+            ValueError: A setting has the wrong type or is out of range
+        """
+        threat_config = config_data.get("threat_detection") or {}
+        if not isinstance(threat_config, dict):
+            raise ValueError("threat_detection must be a mapping")
+        defaults = cls()
+
+        # Keywords may be a plain list (default weight) or keyword: weight
+        keywords = threat_config.get("sensitive_keywords")
+        if isinstance(keywords, dict):
+            weights = {
+                str(keyword).lower(): _number(keywords, keyword, 0, cast=int)
+                for keyword in keywords
+            }
+        elif isinstance(keywords, list):
+            weights = {str(keyword).lower(): DEFAULT_KEYWORD_WEIGHT for keyword in keywords}
+        elif keywords is None:
+            weights = defaults.sensitive_keyword_weights
+        else:
+            raise ValueError("sensitive_keywords must be a list or a keyword: weight mapping")
+
+        partition_key = threat_config.get("partition_key", defaults.partition_key)
+        if partition_key not in PARTITION_KEYS:
+            raise ValueError(
+                f"partition_key must be one of {', '.join(PARTITION_KEYS)}, not {partition_key!r}"
+            )
+
+        return cls(
+            time_window=_number(
+                threat_config, "time_window_seconds", defaults.time_window, allow_minimum=False
+            ),
+            rapid_access_window=_number(
+                threat_config, "rapid_access_window_seconds", defaults.rapid_access_window,
+                allow_minimum=False,
+            ),
+            rapid_access_threshold=_number(
+                threat_config, "rapid_access_threshold", defaults.rapid_access_threshold,
+                allow_minimum=False,
+            ),
+            deletion_window=_number(
+                threat_config, "deletion_window_seconds", defaults.deletion_window,
+                allow_minimum=False,
+            ),
+            deletion_threshold=_number(
+                threat_config, "deletion_threshold", defaults.deletion_threshold,
+                allow_minimum=False,
+            ),
+            repeat_event_weight=_number(
+                threat_config, "repeat_event_weight", defaults.repeat_event_weight
+            ),
+            sensitive_path_cache_size=_number(
+                threat_config, "sensitive_path_cache_size", defaults.sensitive_path_cache_size,
+                cast=int,
+            ),
+            sensitive_keyword_weights=weights,
+            partition_key=partition_key,
+        )
+
+
+class AgentConfig:
+    """
+    The agent's config file, parsed once and shared by every component
+    check() compares the file's mtime and size at most once per
+    check_interval and re-parses it only when they changed; subscribers
+    are then called with the new config so they can apply it live. A
+    reload that finds the file missing, unparsable or holding invalid
+    values keeps the last good config.
+    """
+
+    def __init__(self, config_path="config/config.yaml", check_interval=1.0, logger=None):
+        """
+        Load the config file
+
+        Args:
+            config_path: Path to the config file (relative to the project root
+                         unless absolute)
+            check_interval: Seconds between file checks in check()
+            logger: Optional EventLogger used to report load problems/reloads
+        """
+        self.path = resolve_config_path(config_path)
+        self.check_interval = check_interval
+        self.logger = logger
+        self.version = 0
+
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._signature = self._file_signature()
+        # Signature of a missing/broken file already reported, so a bad
+        # edit is logged once rather than on every check
+        self._bad_signature = None
+        self._set(_read_config(self.path, logger))
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _set(self, data, settings=None):
+        self.data = data
+        self.threat_detection = settings or ThreatDetectionSettings.from_config(data)
+        self.version += 1
+
+    def subscribe(self, callback):
+        """
+        Call callback(config) after every reload
+
+        Args:
+            callback: Function taking this AgentConfig
+        """
+        self._subscribers.append(callback)
+
+    def check(self, now=None, force=False):
+        """
+        Reload the config if the file changed
+
+        Between checks this is a single time comparison, so it can be
+        called on every event or worker wakeup.
+
+        Args:
+            now: Current time.monotonic() (defaults to now)
+            force: Look at the file even if check_interval has not passed
+
+        Returns:
+            bool: True if the config was reloaded
+        """
+        if now is None:
+            now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+
+        with self._lock:
+            self._next_check = now + self.check_interval
+            signature = self._file_signature()
+            if signature == self._signature or signature == self._bad_signature:
+                return False
+            try:
+                data = _parse_config(self.path)
+                settings = ThreatDetectionSettings.from_config(data)
+            except Exception as exc:
+                self._bad_signature = signature
+                if self.logger:
+                    self.logger.log_error(
+                        f"Failed to reload config {self.path}: {exc}; keeping the previous config"
+                    )
+                return False
+            self._signature = signature
+            self._bad_signature = None
+            self._set(data, settings)
+            subscribers = list(self._subscribers)
+
+        if self.logger:
+            self.logger.log_info(f"Config {self.path} reloaded (version {self.version})")
+        for callback in subscribers:
+            try:
+                callback(self)
+            except Exception as exc:
+                if self.logger:
+                    self.logger.log_error(f"Applying reloaded config failed: {exc}")
+        return True
+
+
+# One AgentConfig per config file, shared by everything that loads it
+_configs = {}
+_configs_lock = threading.Lock()
+
+
+def get_config(config_path="config/config.yaml", logger=None):
+    """
+    Shared AgentConfig for a config file
+
+    The file is parsed on the first call; later calls only check whether
+    it changed since.
+
+    Args:
+        config_path: Path to the config file (relative to the project root
+                     unless absolute)
+        logger: Optional EventLogger used to report a missing/broken file
+
+    Returns:
+        AgentConfig
+    """
+    key = str(resolve_config_path(config_path))
+    with _configs_lock:
+        config = _configs.get(key)
+        if config is None:
+            config = _configs[key] = AgentConfig(key, logger=logger)
+            return config
+    config.check(force=True)
+    return config
+
+
+def load_config(config_path="config/config.yaml", logger=None):
+    """
+    Read the agent's YAML config file
+
+    Args:
+        config_path: Path to the config file (relative to the project root
+                     unless absolute)
+        logger: Optional EventLogger used to report a missing/broken file
+
+    Returns:
+        dict: Parsed config (shared between callers - do not modify), or an
+              empty dict if the file is missing/invalid
+    """
+    return get_config(config_path, logger).data
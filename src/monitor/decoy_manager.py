@@ -1,8 +1,37 @@
 # src/monitor/decoy_manager.py
 from domain.application.decoy_service import DecoyService
-from domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+from domain.application.deployment_scheduler import DeploymentScheduler
+from domain.infrastructure.lazy_decoy_generator import LazyDecoyGenerator
+from domain.infrastructure.parallel_decoy_writer import ParallelDecoyWriter, is_temp_file
+from domain.infrastructure.sqlite_decoy_store import SqliteDecoyStore
+from .clock import SYSTEM_CLOCK
+from .decoy_scanner import DecoyContentScanner
 from .logger import EventLogger
+from .metrics import REGISTRY
 import os
+import threading
+import time
+
+# Our own writes (temp files, fresh decoys) are ignored by the monitor this long
+OWN_WRITE_GRACE_SECONDS = 5.0
+
+# Decoy metrics
+_DEPLOY_SECONDS = REGISTRY.histogram(
+    "honeypot_decoy_deploy_seconds", "Time to render and write one batch of decoys"
+).labels()
+_DECOYS_WRITTEN = REGISTRY.counter(
+    "honeypot_decoys_written_total", "Decoys written (deployments and rotations)"
+).labels()
+_DECOY_FAILURES = REGISTRY.counter(
+    "honeypot_decoy_write_failures_total", "Decoys that could not be written"
+).labels()
+_DECOY_HITS = REGISTRY.counter(
+    "honeypot_decoy_hits_total", "Events touching a deployed decoy, by type", ("type",)
+)
+_DECOY_COPIES = REGISTRY.counter(
+    "honeypot_decoy_copies_total", "Files found to contain copied decoy content"
+).labels()
+_DECOYS_DEPLOYED = REGISTRY.gauge("honeypot_decoys", "Decoys currently deployed").labels()
 
 class DecoyManager:
     """
@@ -10,41 +39,115 @@ class DecoyManager:
     Bridges FileMonitor with DecoyService (clean architecture)
     """
     
-    def __init__(self, decoy_base_path="decoys"):
+    def __init__(self, decoy_base_path="decoys", content_pool_size=0, deploy_workers=8,
+                 template_dir=None, content_scan=None, store_path=None,
+                 placement="base_path", watch_roots=(), root_subdir="", redeploy=None,
+                 clock=None):
         """
         Initialize the decoy manager
         
         Args:
             decoy_base_path: Base directory for deploying decoys
+            content_pool_size: Pre-rendered payloads kept ready per decoy
+                               type (0 renders decoys on demand)
+            deploy_workers: Threads writing decoys during a deployment
+            template_dir: Directory of <type>.tmpl decoy templates
+                          (None uses the built-in templates)
+            content_scan: DecoyContentScanner settings (max_bytes,
+                          window_bytes, windows, workers, max_pending) for
+                          finding copied decoy content; None disables it
+            store_path: SQLite file remembering deployed decoys across
+                        restarts (None keeps them in memory only)
+            placement: "base_path" puts every decoy in decoy_base_path;
+                       "watch_root" puts them in the watch root where the
+                       threat happened (decoy_base_path outside any root)
+            watch_roots: Monitored directories (for "watch_root" placement)
+            root_subdir: Directory inside a watch root that receives its decoys
+            redeploy: DeploymentScheduler settings (epoch_seconds,
+                      rotate_after_seconds, max_decoys_per_minute) plus
+                      rotation_check_seconds
+            clock: Time source for deployments, rotations and own-write
+                   expiry (default: system clock)
         """
-        # Create decoy generator (Infrastructure layer)
-        generator = FileDecoyGenerator()
+        self.clock = clock or SYSTEM_CLOCK
+        
+        # Create decoy generator (Infrastructure layer) - built on first use,
+        # so startup does not pay for templates and Faker
+        def build_generator():
+            from domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+            return FileDecoyGenerator(pool_size=content_pool_size, template_dir=template_dir)
+        generator = LazyDecoyGenerator(build_generator)
+        self.generator = generator
         
         # Create decoy service (Application layer)
-        self.decoy_service = DecoyService(generator)
+        self.writer = ParallelDecoyWriter(max_workers=deploy_workers)
+        self.store = SqliteDecoyStore(store_path) if store_path else None
+        self.decoy_service = DecoyService(generator, self.writer, self.store)
+        
+        # Look for copies of decoy content in new/modified files
+        self.scanner = None
+        if content_scan is not None:
+            self.scanner = DecoyContentScanner(
+                self.decoy_service.find_decoy_content,
+                on_match=self._report_decoy_copy,
+                **content_scan
+            )
         
         # Set up decoy deployment path
         self.decoy_base_path = decoy_base_path
+        self.placement = placement
+        self.root_subdir = root_subdir
+        # Longest roots first so nested roots win over their parents
+        self.watch_roots = sorted((os.path.abspath(r) for r in watch_roots), key=len, reverse=True)
+        
+        # When, where and how many decoys to (re)deploy
+        redeploy = dict(redeploy or {})
+        self.rotation_check_seconds = redeploy.pop("rotation_check_seconds", 60)
+        self.scheduler = DeploymentScheduler(**redeploy)
+        self._deploy_lock = threading.Lock()
+        self._last_maintenance = 0.0
+        self._recent_writes = {}
+        self._target_dirs = {os.path.abspath(decoy_base_path)}
         
         # Create decoy directory if it doesn't exist
         if not os.path.exists(decoy_base_path):
             os.makedirs(decoy_base_path)
         
+        registry = self.decoy_service.registry
+        _DECOYS_DEPLOYED.function = lambda: len(registry)
+        
         # Initialize logger
         self.logger = EventLogger()
         self.logger.log_info(f"DecoyManager initialized - decoys will be deployed to: {decoy_base_path}")
         
-        # Track if decoys have been deployed (prevent duplicate deployments)
-        self.decoys_deployed = False
+        # Pick up the decoys of previous runs
+        if self.store is not None:
+            start = time.perf_counter()
+            restored = self.decoy_service.restore()
+            for decoy in self.decoy_service.get_deployed_decoys():
+                target_dir = os.path.dirname(os.path.abspath(decoy.file_path))
+                self.scheduler.seed(target_dir, decoy.file_path, decoy.created_at.timestamp())
+                self._target_dirs.add(target_dir)
+            self.logger.log_info(
+                f"Restored {restored['restored']} decoy(s) from {store_path} in "
+                f"{(time.perf_counter() - start) * 1000:.1f} ms "
+                f"({restored['directories_checked']} director(ies) reconciled, "
+                f"{len(restored['missing'])} missing, {len(restored['changed'])} changed)"
+            )
     
-    def deploy_for_threat(self, threat_score, threat_level, trigger_path):
+    def deploy_for_threat(self, threat_score, threat_level, trigger_path, now=None):
         """
         Deploy decoys based on threat level
         
+        Each target directory is served once per level and epoch: an
+        escalation tops it up with the higher level's decoys, a new epoch
+        starts over, and everything is rate limited.
+        
         Args:
             threat_score: Current threat score (0-100)
             threat_level: Threat level category
             trigger_path: File path that triggered the threat
+            now: Current time (defaults to the clock's time)
             
         Returns:
             List of deployed Decoy objects, or None if no deployment
@@ -53,51 +156,190 @@ class DecoyManager:
         if threat_score < 51:
             return None
         
-        # Prevent duplicate deployments
-        if self.decoys_deployed:
-            return None
-        
-        # Deploy decoys using DecoyService
-        self.logger.log_warning(
-            f"Deploying decoys for {threat_level} threat (Score: {threat_score}) "
-            f"triggered by: {trigger_path}"
-        )
-        
-        decoys = self.decoy_service.generate_decoys_for_threat_level(
-            threat_level, 
-            self.decoy_base_path
-        )
+        now = self.clock.time() if now is None else now
+        target_dir = self._target_dir(trigger_path)
         
-        # Mark as deployed
-        self.decoys_deployed = True
+        with self._deploy_lock:
+            specs = self.scheduler.plan(threat_level, target_dir, target_dir, now)
+            if not specs:
+                return None
+            
+            # Deploy decoys using DecoyService
+            self.logger.log_warning(
+                f"Deploying {len(specs)} decoy(s) to {target_dir} for {threat_level} threat "
+                f"(Score: {threat_score}) triggered by: {trigger_path}"
+            )
+            decoys = self._deploy(specs, now)
         
         # Log deployment details
         self.logger.log_warning(
             f"✅ Deployed {len(decoys)} decoy(s): " +
             ", ".join([os.path.basename(d.file_path) for d in decoys])
         )
-        
         return decoys
     
-    def track_decoy_access(self, file_path, event_type, threat_level, threat_score):
+    def maintain(self, now=None):
+        """
+        Refresh stale decoys (called periodically by the event workers)
+        
+        Args:
+            now: Current time (defaults to the clock's time)
+            
+        Returns:
+            List of rotated Decoy objects
+        """
+        now = self.clock.time() if now is None else now
+        if now - self._last_maintenance < self.rotation_check_seconds:
+            return []
+        
+        with self._deploy_lock:
+            if now - self._last_maintenance < self.rotation_check_seconds:
+                return []
+            self._last_maintenance = now
+            self._recent_writes = {p: t for p, t in self._recent_writes.items() if t > now}
+            
+            stale = [
+                (decoy.decoy_type, decoy.file_path)
+                for decoy in self.decoy_service.get_deployed_decoys()
+                if self.scheduler.rotation_due(
+                    decoy.created_at.timestamp(), os.path.dirname(os.path.abspath(decoy.file_path)), now
+                )
+            ]
+            if not stale:
+                return []
+            granted = self.scheduler.grant(len(stale), now)
+            if not granted:
+                return []
+            rotated = self._deploy(stale[:granted], now)
+        
+        self.logger.log_info(
+            f"Rotated {len(rotated)} stale decoy(s) ({len(stale) - granted} deferred by rate limit)"
+        )
+        return rotated
+    
+    def _deploy(self, specs, now):
+        """Write decoys (deploy lock held) and remember them as our own writes"""
+        for _, file_path in specs:
+            self._recent_writes[os.path.abspath(file_path)] = now + OWN_WRITE_GRACE_SECONDS
+        
+        started = time.perf_counter()
+        report = self.decoy_service.deploy_decoys(specs, now)
+        _DEPLOY_SECONDS.observe(time.perf_counter() - started)
+        _DECOYS_WRITTEN.inc(len(report.deployed))
+        if report.failed:
+            _DECOY_FAILURES.inc(len(report.failed))
+        self.logger.log_info(f"Decoy deployment: {report.summary()}")
+        for file_path, error in report.failed.items():
+            self.logger.log_error(f"Failed to deploy decoy {file_path}: {error}")
+        return report.deployed
+    
+    def _target_dir(self, trigger_path):
+        """Directory that receives the decoys for a threat at trigger_path"""
+        if self.placement == "watch_root":
+            path = os.path.abspath(trigger_path)
+            for root in self.watch_roots:
+                if path.startswith(root + os.sep):
+                    target_dir = os.path.join(root, self.root_subdir) if self.root_subdir else root
+                    self._target_dirs.add(target_dir)
+                    return target_dir
+        return os.path.abspath(self.decoy_base_path)
+    
+    def is_own_write(self, file_path, now=None):
+        """
+        Check whether a file event was caused by our own decoy deployment
+        
+        Args:
+            file_path: Path from the file event
+            now: Current time (defaults to the clock's time)
+            
+        Returns:
+            bool: True for decoy temp files and decoys written moments ago
+        """
+        if not self._recent_writes and not is_temp_file(file_path):
+            return False
+        path = os.path.abspath(file_path)
+        if is_temp_file(path):
+            return os.path.dirname(path) in self._target_dirs
+        expiry = self._recent_writes.get(path)
+        return expiry is not None and expiry > (self.clock.time() if now is None else now)
+    
+    def track_decoy_access(self, file_path, event_type, threat_level, threat_score,
+                           dest_path=None):
         """
         Check if accessed file is a decoy and log if attacker caught
         
         Args:
             file_path: Path of accessed file
-            event_type: Type of access (created, modified, deleted)
+            event_type: Type of access (created, modified, deleted, moved)
             threat_level: Current threat level
             threat_score: Current threat score
+            dest_path: New location for 'moved' events
         """
-        # Check if this file is a deployed decoy
+        # Check if this file is a deployed decoy; a file moved into place
+        # may be a link to one, so only moves pay for an inode check
+        is_decoy = self.decoy_service.is_decoy_file(file_path)
+        if not is_decoy and event_type == "moved" and dest_path:
+            is_decoy = self.decoy_service.is_decoy_file(dest_path, check_inode=True)
+        if not is_decoy:
+            # Other files may hold copied decoy content; scan them off-thread
+            if (self.scanner is not None and len(self.decoy_service.fingerprints)
+                    and event_type in ("created", "modified", "moved")):
+                self.scanner.submit(dest_path if event_type == "moved" and dest_path else file_path)
+            return False
+        
+        _DECOY_HITS.labels(event_type).inc()
+        if event_type == "moved" and dest_path:
+            self.decoy_service.record_decoy_moved(file_path, dest_path)
+            file_path = f"{file_path} -> {dest_path}"
+        elif event_type == "deleted":
+            self.decoy_service.record_decoy_deleted(file_path)
+        
+        self.logger.log_error(
+            f"🚨 ATTACKER CAUGHT! Decoy accessed: {file_path} | "
+            f"Event: {event_type} | Threat: {threat_level} ({threat_score})"
+        )
+        return True
+    
+    def _report_decoy_copy(self, file_path, decoy):
+        """Scanner callback: a file contains content of a deployed decoy"""
         if self.decoy_service.is_decoy_file(file_path):
-            self.logger.log_error(
-                f"🚨 ATTACKER CAUGHT! Decoy accessed: {file_path} | "
-                f"Event: {event_type} | Threat: {threat_level} ({threat_score})"
-            )
-            return True
+            return  # the decoy itself (e.g. modified in place)
+        if is_temp_file(file_path) and os.path.dirname(file_path) == os.path.dirname(decoy.file_path):
+            return  # our own atomic write in progress
+        
+        _DECOY_COPIES.inc()
+        self.logger.log_error(
+            f"🚨 DECOY CONTENT COPIED! {file_path} contains content of decoy "
+            f"{decoy.file_path} ({decoy.decoy_type})"
+        )
+    
+    def warm_up(self, delay=0.0):
+        """
+        Build the decoy generator in the background (fills the content pool)
+        
+        Args:
+            delay: Seconds to wait first, so startup work is not slowed down
+            
+        Returns:
+            The warm-up thread
+        """
+        def build():
+            time.sleep(delay)
+            self.generator.target
         
-        return False
+        thread = threading.Thread(target=build, name="decoy-warm-up", daemon=True)
+        thread.start()
+        return thread
+    
+    def close(self):
+        """Stop background work (content pool refill, writer pool, scanner)"""
+        if self.generator.content_pool is not None:
+            self.generator.content_pool.stop()
+        self.writer.close()
+        if self.scanner is not None:
+            self.scanner.close()
+        if self.store is not None:
+            self.store.close()
     
     def get_deployment_status(self):
         """
@@ -108,9 +350,47 @@ class DecoyManager:
         """
         deployed_decoys = self.decoy_service.get_deployed_decoys()
         
+        pool = self.generator.content_pool
+        report = self.decoy_service.last_report
+        
         return {
-            'deployed': self.decoys_deployed,
+            'deployed': bool(deployed_decoys),
             'count': len(deployed_decoys),
             'decoys': deployed_decoys,
-            'base_path': self.decoy_base_path
+            'base_path': self.decoy_base_path,
+            'content_pool': pool.get_stats() if pool else None,
+            'last_deployment': report.summary() if report else None,
+            'content_scan': self.scanner.get_stats() if self.scanner else None,
+            'targets': self.scheduler.snapshot()
         }
+
+
+def create_decoy_manager(config_data, watch_roots=(), clock=None):
+    """
+    Build a DecoyManager from the 'decoy' config section
+    
+    Args:
+        config_data: Parsed config dict
+        watch_roots: Monitored directories (for decoy.placement "watch_root")
+        clock: Optional time source (default: system clock)
+        
+    Returns:
+        DecoyManager
+    """
+    decoy_config = config_data.get("decoy", {})
+    content_scan = dict(decoy_config.get("content_scan") or {"enabled": False})
+    if not content_scan.pop("enabled", True):
+        content_scan = None
+    return DecoyManager(
+        decoy_base_path=decoy_config.get("base_path", "decoys"),
+        content_pool_size=decoy_config.get("content_pool_size", 0),
+        deploy_workers=decoy_config.get("deploy_workers", 8),
+        template_dir=decoy_config.get("template_dir"),
+        content_scan=content_scan,
+        store_path=decoy_config.get("store_path"),
+        placement=decoy_config.get("placement", "base_path"),
+        watch_roots=watch_roots,
+        root_subdir=decoy_config.get("root_subdir", ""),
+        redeploy=decoy_config.get("redeploy"),
+        clock=clock,
+    )
@@ -0,0 +1,163 @@
+# src/monitor/decoy_scanner.py
+import mmap
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .logger import EventLogger
+
+# Files smaller than this are read directly instead of memory-mapped
+MMAP_MIN_BYTES = 64 * 1024
+
+# Non-blocking open, so a FIFO or device cannot stall a scanner thread
+# (regular files read the same either way)
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0)
+
+
+class DecoyContentScanner:
+    """
+    Scans new and modified files for copied decoy content
+    Runs on its own small thread pool so neither the watchdog observer nor
+    the analysis workers wait on file reads. Files up to max_bytes are
+    scanned whole; larger ones are sampled in fixed-size windows spread
+    from head to tail, so the cost per file is bounded.
+    """
+
+    def __init__(self, match, on_match=None, max_bytes=1024 * 1024, window_bytes=64 * 1024,
+                 windows=4, workers=2, max_pending=1024):
+        """
+        Initialize the scanner
+
+        Args:
+            match: Function(data) -> Decoy or None (e.g. DecoyService.find_decoy_content)
+            on_match: Called as on_match(file_path, decoy) when decoy content is found
+            max_bytes: Files up to this size are scanned completely
+            window_bytes: Size of each sampled window in larger files
+            windows: Windows sampled per large file (head, tail and evenly in between)
+            workers: Scanner threads
+            max_pending: Files queued for scanning before new ones are skipped
+        """
+        self.match = match
+        self.on_match = on_match
+        self.max_bytes = max_bytes
+        self.window_bytes = window_bytes
+        self.windows = max(1, windows)
+        self.max_pending = max_pending
+
+        self.logger = EventLogger()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decoy-scanner")
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Metrics
+        self.scanned = 0
+        self.matched = 0
+        self.skipped = 0
+        self.bytes_read = 0
+
+    def submit(self, file_path):
+        """
+        Queue a file for scanning
+
+        Args:
+            file_path: File to scan
+
+        Returns:
+            bool: False if the file was skipped (already queued or backlog full)
+        """
+        with self._lock:
+            if self._closed or file_path in self._pending:
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.skipped += 1
+                return False
+            self._pending.add(file_path)
+        self._executor.submit(self._run, file_path)
+        return True
+
+    def _run(self, file_path):
+        try:
+            decoy = self.scan_file(file_path)
+        except Exception as e:
+            self.logger.log_warning(f"Decoy content scan of {file_path} failed: {e}")
+            decoy = None
+        finally:
+            with self._lock:
+                self._pending.discard(file_path)
+        if decoy is not None and self.on_match is not None:
+            self.on_match(file_path, decoy)
+
+    def scan_file(self, file_path):
+        """
+        Scan one file now (on the calling thread)
+
+        Args:
+            file_path: File to scan
+
+        Returns:
+            The Decoy whose content the file contains, or None
+        """
+        try:
+            fd = os.open(file_path, _OPEN_FLAGS)
+        except OSError:
+            return None  # gone already, a directory, or unreadable
+
+        with os.fdopen(fd, "rb") as f:
+            st = os.fstat(fd)
+            if not stat.S_ISREG(st.st_mode):
+                return None  # FIFO, socket or device: nothing to scan
+            size = st.st_size
+            if size == 0:
+                return None
+            self.scanned += 1
+
+            if size < MMAP_MIN_BYTES:
+                data = f.read(size)
+                self.bytes_read += len(data)
+                return self._record(self.match(data))
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if size <= self.max_bytes:
+                    self.bytes_read += size
+                    return self._record(self.match(mapped))
+
+                window = min(self.window_bytes, size)
+                last = size - window
+                offsets = sorted({
+                    last * i // (self.windows - 1) if self.windows > 1 else 0
+                    for i in range(self.windows)
+                })
+                for offset in offsets:
+                    self.bytes_read += window
+                    decoy = self.match(mapped[offset:offset + window])
+                    if decoy is not None:
+                        return self._record(decoy)
+        return None
+
+    def _record(self, decoy):
+        if decoy is not None:
+            self.matched += 1
+        return decoy
+
+    def close(self):
+        """Stop scanning; queued files are dropped"""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self):
+        """
+        Get scanner metrics
+
+        Returns:
+            dict: Files scanned, matches, skipped files, bytes read, queued files
+        """
+        return {
+            'scanned': self.scanned,
+            'matched': self.matched,
+            'skipped': self.skipped,
+            'bytes_read': self.bytes_read,
+            'pending': len(self._pending),
+        }
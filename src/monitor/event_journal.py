@@ -0,0 +1,288 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+# File starts with a magic marker + format version
+JOURNAL_MAGIC = b"HPEJ\x01\x00\x00\x00"
+
+# Fixed-width record header, followed by the UTF-8 path bytes:
+# timestamp (float64), count (uint32), score (uint8),
+# level code (uint8), event type code (uint8), path length (uint16)
+RECORD_HEADER = struct.Struct("<dIBBBH")
+
+EVENT_TYPES = ("created", "modified", "deleted", "moved")
+THREAT_LEVELS = ("Normal", "Elevated", "Suspicious", "Critical")
+
+_EVENT_TYPE_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+_THREAT_LEVEL_CODES = {name: code for code, name in enumerate(THREAT_LEVELS)}
+
+JournalRecord = namedtuple(
+    "JournalRecord", ["timestamp", "event_type", "file_path", "score", "level", "count"]
+)
+
+
+def _encode_record(event_type, file_path, timestamp, score, level, count=1):
+    """One journal record: fixed header followed by the UTF-8 path"""
+    path_bytes = file_path.encode("utf-8", "surrogateescape")
+    header = RECORD_HEADER.pack(
+        timestamp,
+        min(count, 0xFFFFFFFF),
+        score,
+        _THREAT_LEVEL_CODES[level],
+        _EVENT_TYPE_CODES[event_type],
+        len(path_bytes),
+    )
+    return header + path_bytes
+
+
+class EventJournal:
+    """
+    Append-only binary journal of the events ThreatDetector scores
+    Each record is a fixed-width header plus a length-prefixed path.
+    Buffered records are pushed to the OS at most flush_interval apart
+    (via maybe_flush() from the event worker's tick), and the file is
+    rotated to events.journal.1, .2, ... once it reaches max_bytes.
+    """
+
+    def __init__(self, journal_path="logs/events.journal", buffer_size=256 * 1024,
+                 flush_interval=1.0, max_bytes=0, backup_count=3):
+        """
+        Open (or create) the journal for appending
+
+        Args:
+            journal_path: Journal file path
+            buffer_size: Write buffer size in bytes
+            flush_interval: Longest time (seconds) records wait in the
+                            buffer when maybe_flush() is called regularly
+            max_bytes: Rotate once the journal reaches this size (0 = never)
+            backup_count: Rotated journals to keep
+        """
+        journal_dir = os.path.dirname(journal_path)
+        if journal_dir and not os.path.exists(journal_dir):
+            os.makedirs(journal_dir)
+
+        self.journal_path = journal_path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        self._open()
+        self._last_flush = time.monotonic()
+        self.records_written = 0
+        self.rotations = 0
+
+    def _open(self):
+        """Open the journal file for appending (lock held or not yet shared)"""
+        self._file = open(self.journal_path, "ab", buffering=self.buffer_size)
+        self._size = self._file.tell()
+        if self._size == 0:
+            self._file.write(JOURNAL_MAGIC)
+            self._size = len(JOURNAL_MAGIC)
+
+    def _write(self, data):
+        """Write encoded records, rotating first if they would overflow (lock held)"""
+        if (self.max_bytes > 0 and self._size > len(JOURNAL_MAGIC)
+                and self._size + len(data) > self.max_bytes):
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data)
+
+    def _rotate(self):
+        """Shift events.journal -> .1 -> .2 ... and start a new file (lock held)"""
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.journal_path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.journal_path}.{index + 1}")
+            os.replace(self.journal_path, f"{self.journal_path}.1")
+        else:
+            os.remove(self.journal_path)
+        self._open()
+        self.rotations += 1
+
+    def append(self, event_type, file_path, timestamp, score, level, count=1):
+        """
+        Add one scored event to the journal
+
+        Args:
+            event_type: 'created', 'modified', 'deleted' or 'moved'
+            file_path: Path the detector scored
+            timestamp: Event time in seconds
+            score: Threat score after the event (0-100)
+            level: Threat level name after the event
+            count: Raw events merged into this one
+        """
+        record = _encode_record(event_type, file_path, timestamp, score, level, count)
+        with self._lock:
+            self._write(record)
+            self.records_written += 1
+
+    def append_many(self, records):
+        """
+        Add a batch of scored events with one lock acquisition and one write
+
+        Args:
+            records: (event_type, file_path, timestamp, score, level, count)
+                     tuples, in append() argument order
+        """
+        data = b"".join([_encode_record(*record) for record in records])
+        with self._lock:
+            self._write(data)
+            self.records_written += len(records)
+
+    def flush(self):
+        """Push buffered records to the OS"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self, now=None):
+        """
+        Flush if flush_interval has passed since the last flush
+
+        Args:
+            now: Current time.monotonic() (defaults to now)
+
+        Returns:
+            bool: True if the journal was flushed
+        """
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_flush < self.flush_interval:
+            return False
+        self.flush()
+        self._last_flush = now
+        return True
+
+    def close(self):
+        """Flush and close the journal"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_journal(journal_path):
+    """
+    Stream records from a journal through a read-only memory map
+
+    A truncated record at the end (e.g. after a crash mid-write) ends the
+    stream instead of raising.
+
+    Args:
+        journal_path: Journal file path
+
+    Yields:
+        JournalRecord for each event, in the order they were written
+    """
+    with open(journal_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size <= len(JOURNAL_MAGIC):
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(JOURNAL_MAGIC)] != JOURNAL_MAGIC:
+                raise ValueError(f"{journal_path} is not an event journal")
+
+            unpack_header = RECORD_HEADER.unpack_from
+            header_size = RECORD_HEADER.size
+            size = len(data)
+            offset = len(JOURNAL_MAGIC)
+
+            # Most journals repeat a small set of paths; decode each once
+            paths = {}
+
+            while offset + header_size <= size:
+                timestamp, count, score, level_code, type_code, path_len = unpack_header(data, offset)
+                offset += header_size
+                if offset + path_len > size:
+                    break
+                raw_path = data[offset:offset + path_len]
+                offset += path_len
+
+                file_path = paths.get(raw_path)
+                if file_path is None:
+                    file_path = raw_path.decode("utf-8", "surrogateescape")
+                    paths[raw_path] = file_path
+
+                yield JournalRecord(
+                    timestamp,
+                    EVENT_TYPES[type_code],
+                    file_path,
+                    score,
+                    THREAT_LEVELS[level_code],
+                    count,
+                )
+
+
+def replay_journal(journal_path, detector):
+    """
+    Feed journaled events back through a ThreatDetector as fast as possible
+
+    Events keep their recorded timestamps, so windows and scores evolve
+    exactly as they would have live (under the detector's current rules).
+
+    Args:
+        journal_path: Journal file path
+        detector: Detector to drive, partitioned like the one that wrote
+                  the journal (a fresh ThreatDetector or ShardedThreatDetector
+                  without a journal, e.g. from create_threat_detector)
+
+    Returns:
+        dict: Events replayed, peak score, and how many scores differ from
+              the recorded ones (non-zero when rules/thresholds changed)
+    """
+    replayed = 0
+    peak_score = 0
+    changed_scores = 0
+    add_event = detector.add_event
+
+    for record in read_journal(journal_path):
+        score = add_event(record.event_type, record.file_path, record.count, record.timestamp)
+        replayed += 1
+        if score > peak_score:
+            peak_score = score
+        if score != record.score:
+            changed_scores += 1
+
+    return {
+        'events': replayed,
+        'peak_score': peak_score,
+        'changed_scores': changed_scores,
+    }
+
+
+# Replay a journal from the command line
+if __name__ == "__main__":
+    import argparse
+
+    from .config_loader import load_config
+    from .threat_partition import create_threat_detector
+
+    parser = argparse.ArgumentParser(description="Replay an event journal through the detector")
+    parser.add_argument("journal", help="Journal file")
+    parser.add_argument("--config", default="config/config.yaml",
+                        help="Config whose threat_detection settings (and partition key) to replay with")
+    parser.add_argument("--watch", action="append", metavar="DIR",
+                        help="Watch root the journal was recorded with (repeatable; "
+                             "default: monitoring.watch_directories)")
+    args = parser.parse_args()
+
+    # Shard events the same way as the agent that wrote the journal
+    config_data = load_config(args.config)
+    watch_roots = args.watch or config_data.get("monitoring", {}).get("watch_directories", [])
+    detector = create_threat_detector(config_data, watch_roots)
+
+    start = time.perf_counter()
+    summary = replay_journal(args.journal, detector)
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {summary['events']} events in {elapsed:.2f}s "
+          f"({summary['events'] / max(elapsed, 1e-9):,.0f} events/sec)")
+    print(f"Peak score: {summary['peak_score']}")
+    print(f"Scores that differ from the journal: {summary['changed_scores']}")
@@ -0,0 +1,270 @@
+import threading
+from collections import deque
+
+from .logger import EventLogger
+
+# What put() does when the queue is full
+BACKPRESSURE_POLICIES = ("block", "drop_oldest", "coalesce")
+
+
+class EventQueue:
+    """
+    Bounded hand-off queue between watchdog callbacks and the analysis stage
+    Applies a backpressure policy when full and counts depth and drops
+    """
+
+    def __init__(self, maxsize=10000, policy="block", block_timeout=None):
+        """
+        Initialize the queue
+        
+        Args:
+            maxsize: Maximum number of pending events
+            policy: 'block' (wait for room), 'drop_oldest' (evict the oldest
+                    pending event) or 'coalesce' (merge into an identical
+                    pending event, else evict the oldest)
+            block_timeout: Seconds 'block' waits before dropping the new
+                           event (None waits forever)
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"Unknown backpressure policy {policy!r}; "
+                f"expected one of {', '.join(BACKPRESSURE_POLICIES)}"
+            )
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        self._items = deque()
+        # Pending events by (path, type), only kept for the coalesce policy
+        self._pending = {}
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+
+        # Counters
+        self.enqueued = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self):
+        """Number of events waiting to be processed"""
+        return len(self._items)
+
+    @property
+    def closed(self):
+        """True once close() has been called"""
+        return self._closed
+
+    def put(self, event):
+        """
+        Add an event, applying the backpressure policy if the queue is full
+        
+        Args:
+            event: FileEvent to enqueue
+            
+        Returns:
+            bool: True if the event was queued, False if it was dropped
+                  or merged into an already pending event
+        """
+        with self._lock:
+            if self._closed:
+                self.dropped += 1
+                return False
+
+            if len(self._items) >= self.maxsize:
+                if not self._make_room(event):
+                    return False
+
+            self._items.append(event)
+            if self.policy == "coalesce":
+                self._pending[event.key()] = event
+
+            self.enqueued += 1
+            if len(self._items) > self.max_depth:
+                self.max_depth = len(self._items)
+            self._not_empty.notify()
+            return True
+
+    def put_many(self, events):
+        """
+        Add a batch of events under one lock acquisition
+        Each event gets the same backpressure treatment as with put()
+        once the queue is full.
+        
+        Args:
+            events: FileEvents in arrival order
+            
+        Returns:
+            int: Number of events queued
+        """
+        queued = 0
+        with self._lock:
+            items = self._items
+            for event in events:
+                if self._closed:
+                    self.dropped += 1
+                    continue
+                if len(items) >= self.maxsize and not self._make_room(event):
+                    continue
+                items.append(event)
+                if self.policy == "coalesce":
+                    self._pending[event.key()] = event
+                queued += 1
+                if len(items) > self.max_depth:
+                    self.max_depth = len(items)
+
+            if queued:
+                self.enqueued += queued
+                self._not_empty.notify()
+        return queued
+
+    def _make_room(self, event):
+        """
+        Apply the backpressure policy to a full queue (lock must be held)
+        
+        Returns:
+            bool: True if the new event should still be appended
+        """
+        if self.policy == "block":
+            # A batch being added may not have woken the consumer yet
+            self._not_empty.notify()
+            has_room = self._not_full.wait_for(
+                lambda: len(self._items) < self.maxsize or self._closed,
+                timeout=self.block_timeout,
+            )
+            if has_room and not self._closed:
+                return True
+            self.dropped += 1
+            return False
+
+        if self.policy == "coalesce" and event.key() in self._pending:
+            self._pending[event.key()].count += event.count
+            self.coalesced += 1
+            return False
+
+        # drop_oldest, or coalesce with nothing to merge into
+        oldest = self._items.popleft()
+        self._forget(oldest)
+        self.dropped += 1
+        return True
+
+    def _forget(self, event):
+        """Remove an event from the coalesce index (lock must be held)"""
+        if self._pending.get(event.key()) is event:
+            del self._pending[event.key()]
+
+    def get_batch(self, max_items=256, timeout=None):
+        """
+        Take up to max_items events, waiting until at least one is available
+        
+        Args:
+            max_items: Largest batch to return
+            timeout: Seconds to wait for an event (None waits forever)
+            
+        Returns:
+            list: Events in arrival order (empty on timeout or when closed)
+        """
+        with self._lock:
+            if not self._items:
+                self._not_empty.wait_for(
+                    lambda: self._items or self._closed, timeout=timeout
+                )
+
+            batch = []
+            items = self._items
+            while items and len(batch) < max_items:
+                event = items.popleft()
+                if self._pending:
+                    self._forget(event)
+                batch.append(event)
+
+            if batch:
+                self._not_full.notify(len(batch))
+            return batch
+
+    def close(self):
+        """Stop accepting events and wake up any waiting producer/consumer"""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def get_stats(self):
+        """
+        Get queue counters
+        
+        Returns:
+            dict: Current depth, maximum depth seen, enqueued/dropped/coalesced counts
+        """
+        return {
+            'depth': len(self._items),
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'policy': self.policy,
+        }
+
+
+class EventWorker(threading.Thread):
+    """
+    Analysis stage: consumes batches from an EventQueue on its own thread
+    Keeps slow work (scoring, decoy writes) off the watchdog observer thread
+    """
+
+    def __init__(self, event_queue, handle_batch, batch_size=256, poll_interval=0.5,
+                 tick=None, name="honeypot-event-worker"):
+        """
+        Initialize the worker
+        
+        Args:
+            event_queue: EventQueue to consume
+            handle_batch: Callable invoked with each list of events
+            batch_size: Maximum events taken per wakeup
+            poll_interval: Seconds to wait for events before re-checking shutdown
+            tick: Optional callable invoked after every wakeup (used to
+                  flush time-based work such as debounced events)
+            name: Thread name
+        """
+        super().__init__(name=name, daemon=True)
+        self.event_queue = event_queue
+        self.handle_batch = handle_batch
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.tick = tick
+        self.processed = 0
+        self.logger = EventLogger()
+
+    def run(self):
+        """Process batches until the queue is closed and drained"""
+        while True:
+            batch = self.event_queue.get_batch(self.batch_size, timeout=self.poll_interval)
+            if batch:
+                try:
+                    self.handle_batch(batch)
+                except Exception as exc:
+                    self.logger.log_error(f"Event worker failed on batch: {exc}")
+                self.processed += len(batch)
+            elif self.event_queue.closed and self.event_queue.depth == 0:
+                break
+
+            if self.tick is not None:
+                try:
+                    self.tick()
+                except Exception as exc:
+                    self.logger.log_error(f"Event worker tick failed: {exc}")
+
+    def stop(self, timeout=None):
+        """
+        Close the queue and wait for remaining events to be processed
+        
+        Args:
+            timeout: Seconds to wait for the worker to finish
+        """
+        self.event_queue.close()
+        self.join(timeout)
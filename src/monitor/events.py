@@ -0,0 +1,87 @@
+from sys import intern
+
+
+class FileEvent:
+    """
+    Compact record of one file system event
+    Created by the watchdog callbacks and handed to the analysis stage
+    """
+
+    __slots__ = ("event_type", "file_path", "timestamp", "count", "dest_path")
+
+    def __init__(self, event_type, file_path, timestamp, count=1, dest_path=None):
+        """
+        Args:
+            event_type: Type of event ('created', 'modified', 'deleted', 'moved')
+            file_path: Path to the file involved (source path for moves)
+            timestamp: time.time() when the event was (first) observed
+            count: Number of raw events merged into this record
+            dest_path: New path for 'moved' events
+        """
+        self.event_type = event_type
+        self.file_path = file_path
+        self.timestamp = timestamp
+        self.count = count
+        self.dest_path = dest_path
+
+    def key(self):
+        """Identity used to recognise repeats of the same change"""
+        return (self.file_path, self.event_type, self.dest_path)
+
+    def __repr__(self):
+        return (
+            f"FileEvent({self.event_type!r}, {self.file_path!r}, "
+            f"{self.timestamp!r}, count={self.count})"
+        )
+
+
+class EventRecord:
+    """
+    A scored event kept in a ThreatDetector's analysis window
+    Slots instead of a per-event dict, and interned type/path strings, so
+    a window of tens of thousands of events (many touching the same few
+    files) stays small. Reads like the dict it replaces: record['path'].
+    """
+
+    __slots__ = ("type", "path", "time", "count")
+
+    # Fields in dict order, for keys()/to_dict()
+    FIELDS = ("type", "path", "time", "count")
+
+    def __init__(self, event_type, file_path, timestamp, count=1):
+        """
+        Args:
+            event_type: Type of event ('created', 'modified', 'deleted', 'moved')
+            file_path: Path the event was scored for
+            timestamp: When the event happened
+            count: Number of raw events this one stands for (from coalescing)
+        """
+        self.type = intern(event_type)
+        self.path = intern(file_path)
+        self.time = timestamp
+        self.count = count
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self):
+        """The event as the {'type', 'path', 'time', 'count'} dict"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, EventRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"EventRecord({self.type!r}, {self.path!r}, {self.time!r}, count={self.count})"
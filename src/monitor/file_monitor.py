@@ -1,45 +1,334 @@
 from .logger import EventLogger
 from .threat_detector import ThreatDetector
-from .decoy_manager import DecoyManager
+from .threat_partition import create_threat_detector
+from .decoy_manager import DecoyManager, create_decoy_manager
+from .clock import SYSTEM_CLOCK
+from .config_loader import get_config
+from .event_journal import EventJournal
+from .event_pipeline import EventQueue, EventWorker
+from .events import FileEvent
+from .metrics import REGISTRY, start_metrics
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+import threading
 import time
 
+# Log label for each event type
+EVENT_LABELS = {
+    "created": "File Created",
+    "modified": "File Modified",
+    "deleted": "File Deleted",
+    "moved": "File Moved",
+}
+
+# Event-path metrics (series are looked up once, not per event)
+_EVENTS = REGISTRY.counter("honeypot_events_total", "File events analyzed, by type", ("type",))
+_EVENTS_BY_TYPE = {event_type: _EVENTS.labels(event_type) for event_type in EVENT_LABELS}
+_OWN_WRITES = REGISTRY.counter(
+    "honeypot_own_write_events_total", "Events caused by our own decoy writes (ignored)"
+).labels()
+_SCORING_SECONDS = REGISTRY.histogram(
+    "honeypot_scoring_seconds", "Time scoring takes per event (batches: per-event average)"
+).labels()
+_HANDLING_SECONDS = REGISTRY.histogram(
+    "honeypot_event_handling_seconds",
+    "Time to handle one event (scoring, decoys, logging; batches: per-event average)",
+).labels()
+
+# Detector whose state the gauges below report (see FileMonitor.expose_metrics)
+_metrics_detector = None
+
+
+def _detector_gauge(read):
+    """Gauge function reading the exposed detector at collection time"""
+    def value():
+        detector = _metrics_detector
+        return read(detector) if detector is not None else 0
+    return value
+
+
+_WINDOW_EVENTS = REGISTRY.gauge(
+    "honeypot_window_events", "Events inside the threat detector's analysis window"
+).labels(function=_detector_gauge(lambda detector: detector.event_count))
+_THREAT_SCORE = REGISTRY.gauge(
+    "honeypot_threat_score", "Current (highest) threat score"
+).labels(function=_detector_gauge(lambda detector: detector.threat_score))
+
+
+class EventCoalescer:
+    """
+    Merges repeats of the same (path, event type) inside a debounce window
+    A storm of on_modified events for one file becomes a single event
+    carrying the number of raw events it stands for.
+    """
+
+    def __init__(self, debounce_seconds=0.5):
+        """
+        Args:
+            debounce_seconds: How long after the first occurrence repeats
+                              are merged before the event is released
+        """
+        self.debounce_seconds = debounce_seconds
+        # Pending events by (path, type), in order of first occurrence
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.merged = 0
+
+    def add(self, event):
+        """Merge an event into a pending one, or start a new pending event."""
+        with self._lock:
+            pending = self._pending.get(event.key())
+            if pending is None:
+                self._pending[event.key()] = FileEvent(
+                    event.event_type, event.file_path, event.timestamp,
+                    event.count, event.dest_path,
+                )
+            else:
+                pending.count += event.count
+                self.merged += event.count
+
+    def flush_due(self, now):
+        """
+        Release events whose debounce window has closed
+        
+        Args:
+            now: Current time in seconds
+            
+        Returns:
+            list: Released FileEvents in order of first occurrence
+        """
+        ready = []
+        with self._lock:
+            pending = self._pending
+            for event in pending.values():
+                if now - event.timestamp < self.debounce_seconds:
+                    break
+                ready.append(event)
+            for event in ready:
+                del pending[event.key()]
+        return ready
+
+    def flush_all(self):
+        """Release every pending event regardless of its window."""
+        with self._lock:
+            ready = list(self._pending.values())
+            self._pending.clear()
+        return ready
+
+    def __len__(self):
+        return len(self._pending)
+
 
 class FileMonitor(FileSystemEventHandler):
     """Monitors file system for changes."""
 
-    def __init__(self):
+    def __init__(self, event_queue=None, batch_size=256, debounce_seconds=0.0,
+                 journal=None, threat_detector=None, decoy_manager=None, started_at=None,
+                 config=None, clock=None):
+        """
+        Args:
+            event_queue: Optional EventQueue. When given, watchdog callbacks
+                         only enqueue events and a worker thread (see start())
+                         analyzes them; otherwise events are analyzed inline.
+            batch_size: Maximum events the worker takes per wakeup
+            debounce_seconds: Merge repeated (path, type) events seen within
+                              this window before analysis (0 disables)
+            journal: Optional EventJournal recording every scored event
+            threat_detector: Detector to use (e.g. a ShardedThreatDetector);
+                             a global ThreatDetector is created if omitted
+            decoy_manager: DecoyManager to use (default one created if omitted)
+            started_at: time.monotonic() when the agent started; the delay
+                        until the first event is handled is logged
+            config: Optional AgentConfig; it is checked for changes on every
+                    worker wakeup and reloaded settings go to the detector
+            clock: Time source for event timestamps and debouncing, also
+                   given to the default detector and decoy manager
+                   (default: system clock)
+        """
         super().__init__()
         self.logger = EventLogger()
-        self.threat_detector = ThreatDetector()
-        self.decoy_manager = DecoyManager()
+        self.clock = clock or SYSTEM_CLOCK
+        self.threat_detector = threat_detector or ThreatDetector(journal=journal, clock=clock)
+        self.decoy_manager = decoy_manager or DecoyManager(clock=clock)
+        self.event_queue = event_queue
+        self.batch_size = batch_size
+        self.coalescer = EventCoalescer(debounce_seconds) if debounce_seconds > 0 else None
+        self._worker = None
+        self.started_at = self.clock.monotonic() if started_at is None else started_at
+        self.first_event_seconds = None
+        self.config = config
+        if config is not None:
+            config.subscribe(self.threat_detector.apply_config)
         self.logger.log_info("FileMonitor initialized with threat detection")
 
+    def expose_metrics(self):
+        """Report this monitor's detector in the window-events and threat-score gauges (the agent's monitor calls this once)."""
+        global _metrics_detector
+        _metrics_detector = self.threat_detector
+
     def on_created(self, event):
         """Called when a file is created."""
         if not event.is_directory:
-            self._handle_file_event("created", event.src_path, "File Created")
+            self._dispatch("created", event.src_path)
 
     def on_modified(self, event):
         """Called when a file is modified."""
         if not event.is_directory:
-            self._handle_file_event("modified", event.src_path, "File Modified")
+            self._dispatch("modified", event.src_path)
 
     def on_deleted(self, event):
         """Called when a file is deleted."""
         if not event.is_directory:
-            self._handle_file_event("deleted", event.src_path, "File Deleted")
+            self._dispatch("deleted", event.src_path)
+
+    def on_moved(self, event):
+        """Called when a file is moved or renamed."""
+        if not event.is_directory:
+            self._dispatch("moved", event.src_path, event.dest_path)
+
+    def _dispatch(self, event_type, file_path, dest_path=None):
+        """Queue the event for the worker, or analyze it now if there is no queue."""
+        if self.event_queue is None:
+            self._handle_file_event(
+                event_type, file_path, EVENT_LABELS[event_type], dest_path=dest_path
+            )
+        else:
+            self.event_queue.put(
+                FileEvent(event_type, file_path, self.clock.time(), dest_path=dest_path)
+            )
+
+    def start(self):
+        """Start the worker thread that drains the event queue."""
+        if self.event_queue is None or self._worker is not None:
+            return
+        self._worker = self.create_worker(self.event_queue)
+        self._worker.start()
+
+    def create_worker(self, event_queue, name="honeypot-event-worker"):
+        """Build an EventWorker that analyzes batches from event_queue with this monitor."""
+        poll_interval = 0.5
+        if self.coalescer is not None:
+            poll_interval = min(poll_interval, self.coalescer.debounce_seconds)
+        return EventWorker(
+            event_queue,
+            self.process_batch,
+            self.batch_size,
+            poll_interval=poll_interval,
+            tick=self.tick,
+            name=name,
+        )
 
-    def _handle_file_event(self, event_type, file_path, event_label):
+    def stop(self, timeout=None):
+        """Stop accepting events and wait for queued ones to be analyzed."""
+        if self._worker is not None:
+            self._worker.stop(timeout)
+            self._worker = None
+            if self.coalescer is not None:
+                self._analyze(self.coalescer.flush_all())
+            self.logger.log_info(f"Event queue stopped: {self.event_queue.get_stats()}")
+
+    def process_batch(self, events, now=None):
+        """
+        Analyze a batch of queued FileEvents in arrival order
+        
+        With coalescing enabled, events are merged first and only those
+        whose debounce window has closed by `now` are analyzed.
+        """
+        if self.coalescer is None:
+            self._analyze(events)
+            return
+        for event in events:
+            self.coalescer.add(event)
+        self.flush_pending(now)
+
+    def flush_pending(self, now=None):
+        """Analyze coalesced events whose debounce window has closed."""
+        if self.coalescer is not None:
+            self._analyze(self.coalescer.flush_due(self.clock.time() if now is None else now))
+
+    def tick(self, now=None):
+        """Periodic work between batches: reload a changed config, flush coalesced events and the journal, expire idle detector state, rotate stale decoys."""
+        if self.config is not None:
+            self.config.check()
+        self.flush_pending(now)
+        journal = self.threat_detector.journal
+        if journal is not None:
+            journal.maybe_flush()
+        self.threat_detector.maintain(now)
+        self.decoy_manager.maintain(now)
+
+    def _analyze(self, events):
+        """
+        Analyze a batch of FileEvents: one ThreatDetector.add_events call
+        scores them all, then each is logged and handed to the decoy manager
+        """
+        is_own_write = self.decoy_manager.is_own_write
+        batch = []
+        for event in events:
+            # Writing decoys must not count as suspicious activity
+            if is_own_write(event.dest_path or event.file_path):
+                _OWN_WRITES.inc()
+            else:
+                batch.append(event)
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        # A moved file is scored by where it ended up
+        scores = self.threat_detector.add_events([
+            (event.event_type, event.dest_path or event.file_path, event.count, event.timestamp)
+            for event in batch
+        ])
+        _SCORING_SECONDS.observe((time.perf_counter() - started) / len(batch), len(batch))
+
+        # One warning per batch, for its highest-scoring event
+        peak = max(scores)
+        if peak >= 31:
+            elevated = sum(1 for score in scores if score >= 31)
+            peak_path = batch[scores.index(peak)].file_path
+            more = f" (+{elevated - 1} more event(s) Elevated or above)" if elevated > 1 else ""
+            self.logger.log_warning(
+                f"Threat Level: {self.threat_detector.get_threat_level(peak)} "
+                f"(Score: {peak}) - File: {peak_path}{more}"
+            )
+
+        for event, threat_score in zip(batch, scores):
+            self._respond(
+                event.event_type, event.file_path, EVENT_LABELS[event.event_type],
+                event.count, event.dest_path, threat_score,
+            )
+        _HANDLING_SECONDS.observe((time.perf_counter() - started) / len(batch), len(batch))
+
+    def _handle_file_event(self, event_type, file_path, event_label, count=1,
+                           dest_path=None):
         """Analyze file events and trigger decoy deployment when needed."""
-        self.logger.log_info(f"{event_label}: {file_path}")
+        # Writing decoys must not count as suspicious activity
+        if self.decoy_manager.is_own_write(dest_path or file_path):
+            _OWN_WRITES.inc()
+            return
+        started = time.perf_counter()
 
-        self.threat_detector.add_event(event_type, file_path)
-        threat_level = self.threat_detector.get_threat_level()
-        threat_score = self.threat_detector.threat_score
+        # A moved file is scored by where it ended up
+        threat_score = self.threat_detector.add_event(event_type, dest_path or file_path, count)
+        _SCORING_SECONDS.observe(time.perf_counter() - started)
 
-        if threat_score >= 31:
+        self._respond(event_type, file_path, event_label, count, dest_path, threat_score,
+                      warn=True)
+        _HANDLING_SECONDS.observe(time.perf_counter() - started)
+
+    def _respond(self, event_type, file_path, event_label, count, dest_path, threat_score,
+                 warn=False):
+        """Log a scored event, deploy decoys for its score and track decoy access."""
+        _EVENTS_BY_TYPE[event_type].inc(count)
+
+        shown_path = f"{file_path} -> {dest_path}" if dest_path else file_path
+        if count > 1:
+            self.logger.log_info(f"{event_label}: {shown_path} (x{count})")
+        else:
+            self.logger.log_info(f"{event_label}: {shown_path}")
+
+        threat_level = self.threat_detector.get_threat_level(threat_score)
+        if warn and threat_score >= 31:
             self.logger.log_warning(
                 f"Threat Level: {threat_level} (Score: {threat_score}) - File: {file_path}"
             )
@@ -59,13 +348,73 @@ class FileMonitor(FileSystemEventHandler):
             event_type=event_type,
             threat_level=threat_level,
             threat_score=threat_score,
+            dest_path=dest_path,
         )
 
-def start_monitoring(path_to_watch):
+        if self.first_event_seconds is None:
+            self.first_event_seconds = self.clock.monotonic() - self.started_at
+            self.logger.log_info(
+                f"First event handled {self.first_event_seconds * 1000:.0f} ms after startup"
+            )
+
+def configure_logging(config_data):
+    """Switch EventLogger to the queued backend if the 'logging' config asks for it."""
+    log_config = config_data.get("logging", {})
+    if not log_config.get("queue_mode", False):
+        return
+    EventLogger(
+        log_config.get("file", "logs/events.log"),
+        queue_mode=True,
+        flush_interval=log_config.get("flush_interval_seconds", 1.0),
+        max_bytes=log_config.get("max_bytes", 0),
+        backup_count=log_config.get("backup_count", 5),
+        rotation_interval=log_config.get("rotation_interval_seconds", 0),
+    )
+
+
+def create_journal(config_data):
+    """Open the EventJournal if the 'journal' config section enables it."""
+    journal_config = config_data.get("journal", {})
+    if not journal_config.get("enabled", False):
+        return None
+    return EventJournal(
+        journal_config.get("path", "logs/events.journal"),
+        flush_interval=journal_config.get("flush_interval_seconds", 1.0),
+        max_bytes=journal_config.get("max_bytes", 64 * 1024 * 1024),
+        backup_count=journal_config.get("backup_count", 3),
+    )
+
+
+def create_event_queue(config_data):
+    """Build the EventQueue described by the 'pipeline' config section."""
+    pipeline_config = config_data.get("pipeline", {})
+    return EventQueue(
+        maxsize=pipeline_config.get("queue_size", 10000),
+        policy=pipeline_config.get("backpressure", "block"),
+        block_timeout=pipeline_config.get("block_timeout_seconds"),
+    )
+
+
+def start_monitoring(path_to_watch, config_path="config/config.yaml"):
     """ Start monitoring a directory"""
     print(f"Starting to monitor:{path_to_watch}")
     
-    event_handler = FileMonitor()
+    config = get_config(config_path)
+    config_data = config.data
+    configure_logging(config_data)
+    pipeline_config = config_data.get("pipeline", {})
+    journal = create_journal(config_data)
+    event_handler = FileMonitor(
+        event_queue=create_event_queue(config_data),
+        batch_size=pipeline_config.get("batch_size", 256),
+        debounce_seconds=pipeline_config.get("debounce_seconds", 0.0),
+        threat_detector=create_threat_detector(config_data, [path_to_watch], journal),
+        decoy_manager=create_decoy_manager(config_data, [path_to_watch]),
+        config=config,
+    )
+    event_handler.expose_metrics()
+    event_handler.start()
+    metrics = start_metrics(config_data)
     
     observer = Observer()
     
@@ -82,6 +431,13 @@ def start_monitoring(path_to_watch):
         print("Monitoring Stopped")
     
     observer.join()  
+    event_handler.stop()
+    event_handler.decoy_manager.close()
+    if journal is not None:
+        journal.close()
+    if metrics is not None:
+        metrics.close()
+    EventLogger.shutdown()
     
     
 if __name__ =="__main__":
@@ -0,0 +1,393 @@
+# src/monitor/inotify_source.py
+"""
+Native inotify event source (Linux)
+Reads raw inotify records straight from the kernel, many per read(), and
+decodes each read into one batch of FileEvents for the root's worker
+queue. This skips watchdog's per-event objects and handler dispatch, and
+directories are registered a slice at a time from the reader thread, so
+events start flowing before a large tree has been fully walked.
+
+Other platforms (or monitoring.event_source: watchdog) use watchdog.
+"""
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from .clock import SYSTEM_CLOCK
+from .events import FileEvent
+from .logger import EventLogger
+from .metrics import REGISTRY
+
+# monitoring.event_source values
+EVENT_SOURCES = ("auto", "inotify", "watchdog")
+
+# inotify_init1 flags
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Event bits (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+
+# What every watched directory reports (the events watchdog turns into
+# created/modified/deleted/moved)
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_EXCL_UNLINK | IN_ONLYDIR)
+
+# struct inotify_event header: wd, mask, cookie, len (the name follows)
+_HEADER = struct.Struct("iIII")
+
+# Bytes per read(): room for thousands of records per wakeup
+DEFAULT_BUFFER_SIZE = 256 * 1024
+
+_OVERFLOWS = REGISTRY.counter(
+    "honeypot_inotify_overflows_total", "Kernel inotify queue overflows (events were lost)"
+).labels()
+
+_libc = None
+
+
+def _load_libc():
+    """libc with the inotify functions typed (loaded on first use)"""
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        signatures = {
+            "inotify_init1": [ctypes.c_int],
+            "inotify_add_watch": [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32],
+            "inotify_rm_watch": [ctypes.c_int, ctypes.c_int],
+        }
+        for name, argtypes in signatures.items():
+            function = getattr(libc, name)
+            function.argtypes = argtypes
+            function.restype = ctypes.c_int
+        _libc = libc
+    return _libc
+
+
+def inotify_available():
+    """True on Linux when libc provides the inotify calls"""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        _load_libc()
+    except (OSError, AttributeError):
+        return False
+    return True
+
+
+def resolve_event_source(name="auto", logger=None):
+    """
+    Pick the event source for this platform
+
+    Args:
+        name: 'auto' (inotify where available), 'inotify' or 'watchdog'
+        logger: Optional EventLogger, warned when inotify was asked for
+                but is not available
+
+    Returns:
+        str: 'inotify' or 'watchdog'
+    """
+    if name not in EVENT_SOURCES:
+        raise ValueError(f"Unknown event source {name!r}; expected one of {', '.join(EVENT_SOURCES)}")
+    if name == "watchdog":
+        return "watchdog"
+    if inotify_available():
+        return "inotify"
+    if name == "inotify" and logger is not None:
+        logger.log_warning("inotify is not available on this platform; using watchdog")
+    return "watchdog"
+
+
+class InotifySource(threading.Thread):
+    """
+    Watches one root recursively with a single inotify descriptor
+    Used in place of a watchdog Observer: start(), stop(), join(). Every
+    read() of the descriptor becomes one list of FileEvents handed to the
+    sink's enqueue_batch() (a RootEventHandler), stamped with one clock
+    reading since inotify records carry no time of their own.
+    """
+
+    def __init__(self, root, sink, clock=None, buffer_size=DEFAULT_BUFFER_SIZE, watch_batch=256,
+                 poll_interval=0.5, name="honeypot-inotify"):
+        """
+        Args:
+            root: Directory to watch, with everything below it
+            sink: Receives each decoded batch via enqueue_batch(events)
+            clock: Time source for event timestamps (default: system clock)
+            buffer_size: Bytes read from the descriptor per wakeup
+            watch_batch: Directories registered between two reads while
+                         a tree is being walked
+            poll_interval: Seconds to wait for events before re-checking stop()
+            name: Thread name
+        """
+        super().__init__(name=name, daemon=True)
+        self.root = os.path.abspath(root)
+        self.sink = sink
+        self.clock = clock or SYSTEM_CLOCK
+        # A read must fit at least one record with a maximal name
+        self.buffer_size = max(buffer_size, _HEADER.size + 256)
+        self.watch_batch = watch_batch
+        self.poll_interval = poll_interval
+        self.logger = EventLogger()
+
+        self._fd = None
+        self._paths = {}          # watch descriptor -> directory
+        self._wds = {}            # directory -> watch descriptor
+        self._pending_dirs = []   # (directory, report its files as created) still to watch
+        self._moves = {}          # cookie -> (source path, is_dir) awaiting its IN_MOVED_TO
+        self._stop_event = threading.Event()
+        self._limit_warned = False
+        self.overflows = 0
+
+    @property
+    def watch_count(self):
+        """Number of directories currently watched"""
+        return len(self._paths)
+
+    def start(self):
+        """
+        Open the inotify descriptor and start reading
+
+        Raises:
+            OSError: If no descriptor can be created (e.g. the per-user
+                     instance limit is reached)
+        """
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, f"inotify_init1: {os.strerror(code)}")
+        self._fd = fd
+        self._libc = libc
+        if not self._watch(self.root, IN_ONLYDIR):
+            code = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(code, f"Cannot watch {self.root}: {os.strerror(code)}")
+        self._pending_dirs = [(entry, False) for entry in self._subdirectories(self.root, None, 0.0)]
+        super().start()
+
+    def stop(self):
+        """Ask the reader thread to finish (join() to wait for it)"""
+        self._stop_event.set()
+
+    def run(self):
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        walk_started = time.monotonic()
+        walking = True
+        try:
+            while not self._stop_event.is_set():
+                if self._pending_dirs:
+                    self._add_watches(self.watch_batch)
+                    timeout = 0
+                else:
+                    if walking:
+                        walking = False
+                        self.logger.log_info(
+                            f"inotify: watching {self.watch_count} director(ies) under {self.root} "
+                            f"(registered in {(time.monotonic() - walk_started) * 1000:.0f} ms)"
+                        )
+                    timeout = self.poll_interval * 1000
+
+                if poller.poll(timeout):
+                    self._read()
+                elif self._moves:
+                    # The rename's other half never came: moved out of the tree
+                    self._emit(self._flush_moves(self._moves))
+                    self._moves = {}
+
+            # Deliver what the kernel had already queued when stop() was called
+            if poller.poll(0):
+                self._read()
+            if self._moves:
+                self._emit(self._flush_moves(self._moves))
+                self._moves = {}
+        finally:
+            os.close(self._fd)
+
+    def _emit(self, events):
+        if events:
+            self.sink.enqueue_batch(events)
+
+    def _read(self):
+        try:
+            data = os.read(self._fd, self.buffer_size)
+        except BlockingIOError:
+            return
+        self._emit(self._decode(data, self.clock.time()))
+
+    def _decode(self, data, now):
+        """
+        Turn one read() worth of inotify records into FileEvents
+
+        Args:
+            data: Bytes read from the descriptor
+            now: Timestamp given to every event of the read
+
+        Returns:
+            list: FileEvents in kernel order
+        """
+        events = []
+        append = events.append
+        paths = self._paths
+        unpack = _HEADER.unpack_from
+        header_size = _HEADER.size
+        # Renames whose IN_MOVED_FROM ended the previous read
+        earlier_moves = self._moves
+        moves = self._moves = {}
+
+        offset = 0
+        end = len(data)
+        while offset < end:
+            wd, mask, cookie, length = unpack(data, offset)
+            offset += header_size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflows += 1
+                _OVERFLOWS.inc()
+                self.logger.log_warning(f"inotify queue overflowed under {self.root}; events were lost")
+                continue
+            if mask & IN_IGNORED:
+                self._forget_watch(wd)
+                continue
+            directory = paths.get(wd)
+            if directory is None or not name:
+                continue  # unknown watch, or an event about the directory itself
+
+            path = os.path.join(directory, os.fsdecode(name))
+            is_dir = mask & IN_ISDIR
+            if mask & IN_MOVED_FROM:
+                moves[cookie] = (path, is_dir)
+            elif mask & IN_MOVED_TO:
+                source = moves.pop(cookie, None) or earlier_moves.pop(cookie, None)
+                if source is None:
+                    # Moved in from outside the tree: new to us
+                    if is_dir:
+                        self._pending_dirs.append((path, True))
+                    else:
+                        append(FileEvent("created", path, now))
+                elif is_dir:
+                    self._rename_watches(source[0], path)
+                else:
+                    append(FileEvent("moved", source[0], now, dest_path=path))
+            elif is_dir:
+                # Directories only matter for registration, as with watchdog
+                if mask & IN_CREATE:
+                    self._pending_dirs.append((path, True))
+            elif mask & IN_CREATE:
+                append(FileEvent("created", path, now))
+            elif mask & IN_DELETE:
+                append(FileEvent("deleted", path, now))
+            else:
+                append(FileEvent("modified", path, now))
+
+        if earlier_moves:
+            events[:0] = self._flush_moves(earlier_moves)
+        return events
+
+    def _flush_moves(self, moves):
+        """Renames out of the tree: files count as deleted, directories are unwatched"""
+        events = []
+        now = self.clock.time()
+        for path, is_dir in moves.values():
+            if is_dir:
+                self._unwatch_tree(path)
+            else:
+                events.append(FileEvent("deleted", path, now))
+        return events
+
+    def _add_watches(self, budget):
+        """
+        Register up to `budget` pending directories, queueing their
+        subdirectories; files of directories that appeared while running
+        are reported as created (they may predate the watch)
+        """
+        events = []
+        now = self.clock.time()
+        pending = self._pending_dirs
+        while pending and budget > 0:
+            budget -= 1
+            path, report_files = pending.pop()
+            if self._watch(path, IN_DONT_FOLLOW):
+                pending.extend(
+                    (entry, report_files)
+                    for entry in self._subdirectories(path, events if report_files else None, now)
+                )
+        self._emit(events)
+
+    def _subdirectories(self, path, created, now):
+        """Subdirectories of path (symlinks not followed); files go to `created` if given"""
+        subdirectories = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        subdirectories.append(entry.path)
+                    elif created is not None:
+                        created.append(FileEvent("created", entry.path, now))
+        except OSError:
+            pass  # removed or unreadable by the time we got to it
+        return subdirectories
+
+    def _watch(self, path, flags=0):
+        """Add a watch on a directory; returns False if it could not be added"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK | flags)
+        if wd < 0:
+            if ctypes.get_errno() == errno.ENOSPC and not self._limit_warned:
+                self._limit_warned = True
+                self.logger.log_warning(
+                    f"inotify watch limit reached under {self.root}; directories beyond "
+                    f"{self.watch_count} are not watched (raise fs.inotify.max_user_watches)"
+                )
+            return False
+        previous = self._paths.get(wd)
+        if previous is not None and self._wds.get(previous) == wd:
+            del self._wds[previous]
+        self._paths[wd] = path
+        self._wds[path] = wd
+        return True
+
+    def _tree(self, path):
+        prefix = path + os.sep
+        return [watched for watched in self._wds if watched == path or watched.startswith(prefix)]
+
+    def _rename_watches(self, old_path, new_path):
+        """A watched directory moved inside the tree: its watches follow it"""
+        for watched in self._tree(old_path):
+            wd = self._wds.pop(watched)
+            renamed = new_path + watched[len(old_path):]
+            self._wds[renamed] = wd
+            self._paths[wd] = renamed
+
+    def _unwatch_tree(self, path):
+        for watched in self._tree(path):
+            wd = self._wds.pop(watched)
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _forget_watch(self, wd):
+        path = self._paths.pop(wd, None)
+        if path is not None and self._wds.get(path) == wd:
+            del self._wds[path]
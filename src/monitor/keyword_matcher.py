@@ -0,0 +1,89 @@
+import re
+from functools import lru_cache
+
+
+def _build_trie_pattern(keywords):
+    """
+    Build one regex that matches any of the keywords
+
+    Keywords are merged into a character trie first, so the regex engine
+    follows shared prefixes once instead of retrying every keyword at every
+    position. A keyword that is a prefix of a longer one ends the branch,
+    because matching the shorter keyword is already enough.
+
+    Args:
+        keywords: Iterable of lowercase keywords
+
+    Returns:
+        str: Regex source text
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        if "" in node:
+            return ""
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Scores file paths against weighted sensitive keywords
+    The keyword list is compiled once and verdicts are cached per path
+    """
+
+    def __init__(self, keyword_weights, cache_size=4096):
+        """
+        Compile the keyword list
+
+        Args:
+            keyword_weights: Mapping of keyword -> points for a path containing it
+            cache_size: Number of path verdicts kept in the LRU cache
+        """
+        # Group keywords by weight so the highest weight is tested first
+        by_weight = {}
+        for keyword, weight in keyword_weights.items():
+            if keyword and weight > 0:
+                by_weight.setdefault(weight, []).append(keyword.lower())
+
+        self._patterns = [
+            (weight, re.compile(_build_trie_pattern(by_weight[weight])))
+            for weight in sorted(by_weight, reverse=True)
+        ]
+
+        # Per-path verdict cache; a path seen again is never rescanned
+        self.match_weight = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, file_path):
+        """
+        Find the highest weight of any keyword contained in the path
+
+        Args:
+            file_path: Path to check
+
+        Returns:
+            int: Weight of the best matching keyword, or 0
+        """
+        file_path_lower = file_path.lower()
+        for weight, pattern in self._patterns:
+            if pattern.search(file_path_lower):
+                return weight
+        return 0
+
+    def cache_info(self):
+        """
+        Get hit/miss statistics for the path verdict cache
+
+        Returns:
+            functools cache info tuple (hits, misses, maxsize, currsize)
+        """
+        return self.match_weight.cache_info()
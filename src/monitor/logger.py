@@ -1,16 +1,137 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%y-%m-%d %H:%M:%S'
+
+# Active queue backend (listener + file handler), shared by every EventLogger
+_queue_backend = None
+_queue_backend_lock = threading.Lock()
+
+
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """File handler for the queued backend
+    Buffers writes and flushes them in batches, and rotates the file
+    when it grows past max_bytes or gets older than rotation_interval
+    """
+    def __init__(self, filename, max_bytes=0, backup_count=5,
+                 rotation_interval=0, flush_interval=1.0, buffer_size=64 * 1024):
+        """
+        Args:
+            filename: Log file path
+            max_bytes: Rotate once the file reaches this size (0 = never)
+            backup_count: Rotated files to keep (events.log.1, .2, ...)
+            rotation_interval: Rotate after this many seconds (0 = never)
+            flush_interval: Longest time a record waits in the buffer
+            buffer_size: Write buffer size in bytes
+        """
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.rotation_interval = rotation_interval
+        super().__init__(filename, maxBytes=max_bytes,
+                         backupCount=backup_count, encoding='utf-8')
+        self._size = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        self._last_flush = time.monotonic()
+        self._rotate_at = self._next_rotation_time()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, encoding=self.encoding,
+                    buffering=self.buffer_size)
+
+    def _next_rotation_time(self):
+        if self.rotation_interval > 0:
+            return time.time() + self.rotation_interval
+        return None
+
+    def emit(self, record):
+        """Append one record to the buffer, rotating first if needed"""
+        try:
+            msg = self.format(record) + self.terminator
+            # maxBytes is a byte limit; non-ASCII paths take several bytes a character
+            msg_size = len(msg.encode(self.encoding, errors="replace"))
+            if self._should_rotate(msg_size):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self._size += msg_size
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def _should_rotate(self, msg_size):
+        # Size is tracked in memory instead of seeking/stat-ing per record
+        if self.maxBytes > 0 and self._size + msg_size >= self.maxBytes:
+            return True
+        return self._rotate_at is not None and time.time() >= self._rotate_at
+
+    def doRollover(self):
+        super().doRollover()
+        self._size = 0
+        self._rotate_at = self._next_rotation_time()
+
+    def flush(self):
+        """Flush only once flush_interval has passed since the last flush"""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.force_flush()
+
+    def force_flush(self):
+        """Write everything buffered to disk now"""
+        self.acquire()
+        try:
+            if self.stream and hasattr(self.stream, "flush"):
+                self.stream.flush()
+        finally:
+            self.release()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.force_flush()
+        super().close()
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue goes idle
+    so buffered records never wait longer than flush_interval
+    """
+    def __init__(self, log_queue, handler, flush_interval=1.0):
+        super().__init__(log_queue, handler)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.force_flush()
+
+
 class EventLogger:
     """Handles logging of file system events 
     Writes events to logs/events.log with timestamps
     """
-    def __init__(self,log_file='logs/events.log'):
+    def __init__(self,log_file='logs/events.log', queue_mode=False,
+                 flush_interval=1.0, max_bytes=0, backup_count=5,
+                 rotation_interval=0):
         """Initialize the event logger
         
         Args:
              log_file: Path to the log file (default: logs/events.log)
+             queue_mode: Hand records to a background writer thread so
+                         callers never block on disk (applies to every
+                         EventLogger in the process once enabled)
+             flush_interval: Queue mode - seconds between batched flushes
+             max_bytes: Queue mode - rotate at this file size (0 = never)
+             backup_count: Queue mode - rotated files to keep
+             rotation_interval: Queue mode - rotate after this many
+                                seconds (0 = never)
         """
         log_dir = os.path.dirname(log_file)
         if log_dir and not os.path.exists(log_dir):
@@ -18,16 +139,27 @@ class EventLogger:
         
         self.log_file = log_file #Stores the log file path
         
-        #Configure logging
-        
-        logging.basicConfig(
-            filename= log_file,
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%y-%m-%d %H:%M:%S'
-        )
-       
         self.logger = logging.getLogger(__name__)  
+        
+        if queue_mode:
+            _start_queue_backend(
+                self.logger, log_file, flush_interval,
+                max_bytes, backup_count, rotation_interval,
+            )
+        elif _queue_backend is None:
+            #Configure logging
+            
+            logging.basicConfig(
+                filename= log_file,
+                level=logging.INFO,
+                format=LOG_FORMAT,
+                datefmt=LOG_DATE_FORMAT
+            )
+    
+    @staticmethod
+    def shutdown():
+        """Drain the queue backend (if running) and close the log file"""
+        _stop_queue_backend()
     
     def log_info(self, message):
         """Log an informational message
@@ -54,6 +186,53 @@ class EventLogger:
         self.logger.error(message)
 
 
+def _start_queue_backend(logger, log_file, flush_interval, max_bytes,
+                         backup_count, rotation_interval):
+    """Route the event logger through a QueueHandler (once per process)"""
+    global _queue_backend
+    with _queue_backend_lock:
+        if _queue_backend is not None:
+            return
+
+        handler = BatchingRotatingFileHandler(
+            log_file,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+            rotation_interval=rotation_interval,
+            flush_interval=flush_interval,
+        )
+        handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+
+        # SimpleQueue is unbounded, so logging never blocks the caller
+        log_queue = queue.SimpleQueue()
+        listener = FlushingQueueListener(log_queue, handler, flush_interval)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+
+        logger.addHandler(queue_handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        listener.start()
+
+        _queue_backend = (logger, queue_handler, listener, handler)
+        atexit.register(_stop_queue_backend)
+
+
+def _stop_queue_backend():
+    """Write out every queued record, then detach the queue backend"""
+    global _queue_backend
+    with _queue_backend_lock:
+        if _queue_backend is None:
+            return
+        logger, queue_handler, listener, handler = _queue_backend
+        _queue_backend = None
+
+        # The listener handles all records queued before its stop sentinel
+        listener.stop()
+        handler.close()
+        logger.removeHandler(queue_handler)
+        logger.propagate = True
+
+
 if __name__ =="__main__":
     logger = EventLogger() #create a logger object
     
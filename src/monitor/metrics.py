@@ -0,0 +1,358 @@
+# src/monitor/metrics.py
+import bisect
+import os
+import tempfile
+import threading
+
+from .logger import EventLogger
+
+# Latency buckets in seconds: microseconds for scoring, up to seconds for I/O
+LATENCY_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing count (one series of a metric)"""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        """Add to the count"""
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """
+    Value that goes up and down (one series of a metric)
+    A gauge built with a function reads it at collection time, so values
+    such as window or queue sizes cost nothing on the event path.
+    """
+
+    __slots__ = ("value", "function")
+
+    def __init__(self, function=None):
+        self.value = 0
+        self.function = function
+
+    def set(self, value):
+        """Set the current value"""
+        self.value = value
+
+    def get(self):
+        """Current value (calls the gauge function if there is one)"""
+        return self.function() if self.function is not None else self.value
+
+
+class Histogram:
+    """
+    Distribution of observed values in fixed buckets (one series of a metric)
+    observe() is a bisect plus three additions, so timing the event path
+    stays well under a microsecond.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot: above every bound
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value, count=1):
+        """
+        Record a value
+
+        Args:
+            value: Observed value
+            count: Number of observations of this value (e.g. the events
+                   of a batch, observed at the batch's per-event average)
+        """
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += count
+            self.sum += value * count
+            self.count += count
+
+    def cumulative(self):
+        """[(upper bound, observations <= bound)] including +Inf"""
+        with self._lock:
+            counts = list(self.counts)
+        total = 0
+        buckets = []
+        for bound, count in zip(self.bounds + (float("inf"),), counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+
+class Metric:
+    """
+    A named metric: one series per combination of label values
+    Series are created on first use; callers on the hot path keep the
+    series object returned by labels() instead of looking it up per event.
+    """
+
+    KINDS = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+
+    def __init__(self, name, help_text, kind, label_names=(), **series_options):
+        """
+        Args:
+            name: Metric name (honeypot_...)
+            help_text: One-line description
+            kind: 'counter', 'gauge' or 'histogram'
+            label_names: Names of the labels that tell series apart
+            series_options: Passed to every series (e.g. bounds=...)
+        """
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self._series_options = series_options
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **options):
+        """
+        Series for a combination of label values
+
+        Args:
+            values: One value per label name
+            options: Series arguments for a new series (e.g. function= for gauges)
+
+        Returns:
+            Counter, Gauge or Histogram
+        """
+        values = tuple(str(value) for value in values)
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}, got {values}")
+            with self._lock:
+                series = self._series.get(values)
+                if series is None:
+                    series = self.KINDS[self.kind](**{**self._series_options, **options})
+                    self._series[values] = series
+        return series
+
+    def remove(self, *values):
+        """Drop a series (e.g. a gauge of a component that was closed)"""
+        with self._lock:
+            self._series.pop(tuple(str(value) for value in values), None)
+
+    def render(self):
+        """Prometheus text-format lines of this metric"""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            series = list(self._series.items())
+        for values, item in series:
+            if self.kind == "histogram":
+                for bound, count in item.cumulative():
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.label_names, values, le)} {count}")
+                labels = _format_labels(self.label_names, values)
+                lines.append(f"{self.name}_sum{labels} {_format_value(item.sum)}")
+                lines.append(f"{self.name}_count{labels} {item.count}")
+            else:
+                try:
+                    value = item.get() if self.kind == "gauge" else item.value
+                except Exception:
+                    continue  # a gauge whose source is gone
+                lines.append(f"{self.name}{_format_labels(self.label_names, values)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """All metrics of the process, rendered together for the endpoint/snapshot"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name, help_text, kind, label_names, **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Metric(name, help_text, kind, label_names, **options)
+            elif metric.kind != kind:
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, label_names=()):
+        """Get or create a counter metric"""
+        return self._register(name, help_text, "counter", label_names)
+
+    def gauge(self, name, help_text, label_names=()):
+        """Get or create a gauge metric"""
+        return self._register(name, help_text, "gauge", label_names)
+
+    def histogram(self, name, help_text, label_names=(), bounds=LATENCY_BUCKETS):
+        """Get or create a histogram metric"""
+        return self._register(name, help_text, "histogram", label_names, bounds=bounds)
+
+    def render(self):
+        """
+        Every metric in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by the monitor components
+REGISTRY = MetricsRegistry()
+
+
+def _handler_class(registry):
+    """HTTP handler serving a registry (http.server is imported on first use)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes are not worth a log line each
+
+    return MetricsHandler
+
+
+class MetricsExporter:
+    """
+    Publishes a registry over local HTTP (/metrics) and/or as a snapshot
+    file rewritten every interval
+    """
+
+    def __init__(self, registry=REGISTRY, http_port=None, bind="127.0.0.1",
+                 snapshot_path=None, snapshot_interval=15.0):
+        """
+        Args:
+            registry: MetricsRegistry to publish
+            http_port: Port of the text endpoint (None disables it; 0 picks a free port)
+            bind: Address the endpoint listens on (local only by default)
+            snapshot_path: File that receives the exposition text (None disables it)
+            snapshot_interval: Seconds between snapshot rewrites
+        """
+        self.registry = registry
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.logger = EventLogger()
+        self._stop = threading.Event()
+        self._threads = []
+        self.server = None
+
+        if http_port is not None:
+            from http.server import ThreadingHTTPServer
+            self.server = ThreadingHTTPServer((bind, http_port), _handler_class(registry))
+            self.server.daemon_threads = True
+            self._start(self.server.serve_forever, "metrics-http")
+            self.logger.log_info(f"Metrics endpoint: http://{bind}:{self.port}/metrics")
+
+        if snapshot_path:
+            self._start(self._snapshot_loop, "metrics-snapshot")
+            self.logger.log_info(f"Metrics snapshot: {snapshot_path} every {snapshot_interval}s")
+
+    @property
+    def port(self):
+        """Port the endpoint listens on (None without endpoint)"""
+        return self.server.server_address[1] if self.server is not None else None
+
+    def _start(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def write_snapshot(self):
+        """Write the current exposition text to snapshot_path (atomically)"""
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.registry.render())
+            os.replace(temp_path, self.snapshot_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.snapshot_interval):
+            try:
+                self.write_snapshot()
+            except OSError as exc:
+                self.logger.log_warning(f"Metrics snapshot failed: {exc}")
+
+    def close(self):
+        """Stop the endpoint and write a last snapshot"""
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        if self.snapshot_path:
+            self.write_snapshot()
+
+
+def start_metrics(config_data, registry=REGISTRY):
+    """
+    Start the exporter described by the 'metrics' config section
+
+    Args:
+        config_data: Parsed config dict
+        registry: Registry to publish
+
+    Returns:
+        MetricsExporter, or None if metrics are disabled
+    """
+    metrics_config = config_data.get("metrics", {})
+    if not metrics_config.get("enabled", False):
+        return None
+    try:
+        return MetricsExporter(
+            registry,
+            http_port=metrics_config.get("http_port"),
+            bind=metrics_config.get("bind", "127.0.0.1"),
+            snapshot_path=metrics_config.get("snapshot_path"),
+            snapshot_interval=metrics_config.get("snapshot_interval_seconds", 15.0),
+        )
+    except OSError as exc:
+        # Monitoring goes on without metrics (e.g. the port is taken)
+        EventLogger().log_error(f"Metrics exporter not started: {exc}")
+        return None
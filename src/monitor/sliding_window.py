@@ -0,0 +1,60 @@
+from collections import deque
+
+
+class SlidingWindowCounter:
+    """
+    Keeps a running total of weighted hits inside a trailing time window
+    Hits enter on the right and expire from the left, so every update is
+    amortized O(1) instead of rescanning the whole event history
+    """
+
+    def __init__(self):
+        """Initialize an empty window"""
+        # Timestamps and weights in arrival order, kept in two deques so a
+        # hit costs two pointers instead of a tuple object
+        self._times = deque()
+        self._weights = deque()
+
+        # Sum of weights currently inside the window
+        self.total = 0
+
+    def add(self, timestamp, weight=1):
+        """
+        Record a hit at the given time
+
+        Args:
+            timestamp: Event time in seconds (non-decreasing across calls)
+            weight: Amount this hit contributes to the running total
+        """
+        self._times.append(timestamp)
+        self._weights.append(weight)
+        self.total += weight
+
+    def expire(self, now, window_seconds):
+        """
+        Drop hits that are no longer inside the window
+
+        Uses the same test as the original list filters
+        (now - time < window keeps the hit) so scores match exactly.
+
+        Args:
+            now: Current time in seconds
+            window_seconds: Width of the trailing window
+
+        Returns:
+            int: Running total after expiry
+        """
+        times = self._times
+        while times and now - times[0] >= window_seconds:
+            times.popleft()
+            self.total -= self._weights.popleft()
+        return self.total
+
+    def clear(self):
+        """Forget every hit in the window"""
+        self._times.clear()
+        self._weights.clear()
+        self.total = 0
+
+    def __len__(self):
+        return len(self._times)
@@ -1,9 +1,18 @@
+import threading
 import time
+from collections import deque
 from datetime import datetime
-from pathlib import Path
 
-import yaml
+from .clock import SYSTEM_CLOCK
+from .config_loader import ThreatDetectionSettings, load_config
+from .events import EventRecord
+from .keyword_matcher import KeywordMatcher
 from .logger import EventLogger
+from .sliding_window import SlidingWindowCounter
+
+# Local hour is constant inside 15-minute UTC buckets (every time zone
+# offset is a multiple of 15 minutes), so add_events looks it up once per bucket
+_HOUR_BUCKET_SECONDS = 900
 
 
 class ThreatDetector:
@@ -12,172 +21,372 @@ class ThreatDetector:
     Detects suspicious patterns and assigns threat levels
     """
     
-    def __init__(self, config_path="config/config.yaml"):
+    def __init__(self, config_path="config/config.yaml", journal=None, config_data=None,
+                 clock=None, keyword_matcher=None):
         """
         Initialize the threat detector
         Sets up event tracking and scoring system
+        
+        Args:
+            config_path: YAML config with threat_detection settings
+            journal: Optional EventJournal that records every scored event
+            config_data: Already-parsed config dict (skips reading config_path)
+            clock: Time source for events without a timestamp (default: the
+                   system clock; a SimulatedClock replays timelines)
+            keyword_matcher: Already-compiled KeywordMatcher for the config's
+                             keywords (shared by the shards of a
+                             ShardedThreatDetector); compiled if omitted
         """
-        # Event history - stores recent file events
-        self.events = []
+        self.clock = clock or SYSTEM_CLOCK
+        
+        # Event history - EventRecords of recent file events (oldest first)
+        self.events = deque()
         
         # Current threat score (0-100)
         self.threat_score = 0
         
-        # Time window for event analysis (5 minutes = 300 seconds)
-        self.time_window = 300
-        
-        # Rapid access threshold (events in 10 seconds)
-        self.rapid_access_window = 10
-        self.rapid_access_threshold = 5
-        
-        # Deletion threshold (deletions in 30 seconds)
-        self.deletion_window = 30
-        self.deletion_threshold = 3
+        # Append-only record of scored events (for replay/forensics)
+        self.journal = journal
         
-        # Sensitive file keywords
-        self.sensitive_keywords = [
-            'password', 'passwd', 'pwd',
-            'secret', 'key', 'token',
-            'config', 'credential', 'auth',
-            'private', 'id_rsa', 'ssh',
-            'api_key', 'database', 'backup'
-        ]
+        # Serializes add_event so worker threads can share a detector
+        self._lock = threading.Lock()
         
         # Initialize logger
         self.logger = EventLogger()
-        self._load_config(config_path)
+        if config_data is None:
+            config_data = load_config(config_path, self.logger)
+
+        # Windows, thresholds and keyword weights (see ThreatDetectionSettings)
+        self.settings = None
+        self.keyword_matcher = None
+        self._apply_config(config_data, keyword_matcher)
+
+        # Running counters per detection rule, updated as events enter
+        # and leave their windows so scoring never rescans the history
+        self._rapid_counter = SlidingWindowCounter()
+        self._deletion_counter = SlidingWindowCounter()
+        self._sensitive_counter = SlidingWindowCounter()
+
         self.logger.log_info("ThreatDetector initialized")
 
-    def _load_config(self, config_path):
+    def _apply_config(self, config_data, keyword_matcher=None):
         """
-        Load threat detector settings from YAML config.
-        Falls back to constructor defaults if file/keys are missing.
+        Load threat detector settings from parsed YAML config.
+        Falls back to the ThreatDetectionSettings defaults if keys are missing.
         """
-        config_file = Path(config_path)
-        if not config_file.is_absolute():
-            project_root = Path(__file__).resolve().parents[2]
-            config_file = project_root / config_file
+        self.apply_settings(ThreatDetectionSettings.from_config(config_data), keyword_matcher)
 
-        if not config_file.exists():
-            self.logger.log_warning(
-                f"ThreatDetector config not found at {config_file}; using defaults"
-            )
-            return
-
-        try:
-            with open(config_file, "r", encoding="utf-8") as file:
-                config_data = yaml.safe_load(file) or {}
-        except Exception as exc:
-            self.logger.log_error(
-                f"Failed to load config {config_file}: {exc}; using defaults"
+    def apply_settings(self, settings, keyword_matcher=None):
+        """
+        Switch to new windows, thresholds and keywords
+        
+        The swap happens under the detector lock, so every event is scored
+        entirely with the old or entirely with the new settings. Events in
+        the history and sliding windows are kept; with a shorter window
+        the events that fall outside it expire on the next event.
+        
+        Args:
+            settings: ThreatDetectionSettings to use from now on
+            keyword_matcher: Already-compiled KeywordMatcher for the new
+                             keywords (default: reuse or recompile)
+        """
+        # The keyword matcher is only recompiled if keywords changed
+        matcher = keyword_matcher or self.keyword_matcher
+        if keyword_matcher is None and (matcher is None or keywords_changed(self.settings, settings)):
+            matcher = KeywordMatcher(
+                settings.sensitive_keyword_weights, settings.sensitive_path_cache_size
             )
-            return
 
-        threat_config = config_data.get("threat_detection", {})
-        self.time_window = threat_config.get("time_window_seconds", self.time_window)
-        self.rapid_access_window = threat_config.get(
-            "rapid_access_window_seconds", self.rapid_access_window
-        )
-        self.rapid_access_threshold = threat_config.get(
-            "rapid_access_threshold", self.rapid_access_threshold
-        )
-        self.deletion_window = threat_config.get(
-            "deletion_window_seconds", self.deletion_window
-        )
-        self.deletion_threshold = threat_config.get(
-            "deletion_threshold", self.deletion_threshold
-        )
+        with self._lock:
+            self.settings = settings
+            self.time_window = settings.time_window
+            self.rapid_access_window = settings.rapid_access_window
+            self.rapid_access_threshold = settings.rapid_access_threshold
+            self.deletion_window = settings.deletion_window
+            self.deletion_threshold = settings.deletion_threshold
+            self.repeat_event_weight = settings.repeat_event_weight
+            self.sensitive_path_cache_size = settings.sensitive_path_cache_size
+            self.sensitive_keyword_weights = settings.sensitive_keyword_weights
+            self.sensitive_keywords = list(settings.sensitive_keyword_weights)
+            self.keyword_matcher = matcher
+    
+    def apply_config(self, config):
+        """
+        Apply a reloaded AgentConfig (AgentConfig.subscribe callback)
+        
+        Args:
+            config: AgentConfig whose threat_detection settings to use
+        """
+        self.apply_settings(config.threat_detection)
+        self.logger.log_info("ThreatDetector settings reloaded")
     
-    def add_event(self, event_type, file_path):
+    def add_event(self, event_type, file_path, count=1, timestamp=None):
         """
         Add a new file system event and update threat score
         
         Args:
             event_type: Type of event ('created', 'modified', 'deleted')
             file_path: Path to the file involved
+            count: Number of raw events this one stands for (from coalescing)
+            timestamp: When the event happened (defaults to the clock; replays
+                       pass the recorded time, in non-decreasing order)
+        
+        Returns:
+            int: Threat score after this event
         """
+        with self._lock:
+            return self._add_event(event_type, file_path, count, timestamp)
+
+    def _add_event(self, event_type, file_path, count, timestamp):
+        """Body of add_event; the caller holds self._lock."""
         # Get current timestamp
-        timestamp = time.time()
+        if timestamp is None:
+            timestamp = self.clock.time()
         
-        # Create event dictionary
-        event = {
-            'type': event_type,
-            'path': file_path,
-            'time': timestamp
-        }
+        # Compact record (slots, interned strings) instead of a dict
+        event = EventRecord(event_type, file_path, timestamp, count)
+        
+        # A coalesced event counts once plus a configurable share of its repeats
+        weight = 1 if count == 1 else 1 + (count - 1) * self.repeat_event_weight
         
-        # Add to event history
+        # Add to event history and to each rule's running counter
         self.events.append(event)
+        self._rapid_counter.add(timestamp, weight)
+        if event_type == 'deleted':
+            self._deletion_counter.add(timestamp, weight)
+        sensitive_points = self.check_sensitive_files(file_path)
+        if sensitive_points:
+            self._sensitive_counter.add(timestamp, sensitive_points)
         
         # Clean up old events (older than time_window)
-        current_time = time.time()
-        self.events = [e for e in self.events 
-                       if current_time - e['time'] < self.time_window]
+        self._expire_events(timestamp)
         
         # Calculate new threat score
         old_score = self.threat_score
-        self.threat_score = self.calculate_threat_score()
+        self.threat_score = self.calculate_threat_score(now=timestamp)
         
         # Log if threat level changed significantly
         if self.threat_score > old_score and self.threat_score >= 50:
-            threat_level = self.get_threat_level()
-            self.logger.log_warning(
-                f"Threat detected! Level: {threat_level}, "
-                f"Score: {self.threat_score}, File: {file_path}"
+            self._log_threat(self.threat_score, file_path)
+        
+        if self.journal is not None:
+            self.journal.append(
+                event_type, file_path, timestamp,
+                self.threat_score, self.get_threat_level(), count,
             )
+        
+        return self.threat_score
+
+    def add_events(self, events):
+        """
+        Add a batch of file system events in one pass
+        
+        Windows and scores evolve exactly as with add_event() on each
+        event in turn, but the lock, history expiry and journal write are
+        paid once per batch, and at most one "Threat detected" warning is
+        logged for the whole batch (at its highest score).
+        
+        Args:
+            events: (event_type, file_path, count, timestamp) tuples in time
+                    order - add_event's arguments; a None timestamp means
+                    the clock's time
+        
+        Returns:
+            list: Threat score after each event
+        """
+        with self._lock:
+            start_score = self.threat_score
+            scores = self._add_events(events)
+        peak = batch_peak(start_score, events, scores)
+        if peak is not None:
+            self._log_threat(*peak, batch_size=len(scores))
+        return scores
+
+    def _add_events(self, events, journal_records=None):
+        """
+        Body of add_events; the caller holds self._lock.
+        
+        Args:
+            events: See add_events
+            journal_records: List that receives one journal record per
+                             event instead of this detector writing them
+                             (lets a sharded caller journal in batch order)
+        """
+        scores = []
+        if not events:
+            return scores
+        record_score = scores.append
+
+        # Everything the loop touches, looked up once per batch
+        history = self.events
+        rapid = self._rapid_counter
+        deletions = self._deletion_counter
+        sensitive = self._sensitive_counter
+        match_weight = self.keyword_matcher.match_weight
+        repeat_weight = self.repeat_event_weight
+        time_window = self.time_window
+        rapid_window = self._window(self.rapid_access_window)
+        rapid_threshold = self.rapid_access_threshold
+        deletion_window = self._window(self.deletion_window)
+        deletion_threshold = self.deletion_threshold
+        clock_time = self.clock.time
+        write_journal = journal_records is None and self.journal is not None
+        if write_journal:
+            journal_records = []
+
+        hour_bucket = None
+        unusual_points = 0
+        for event_type, file_path, count, timestamp in events:
+            if timestamp is None:
+                timestamp = clock_time()
+            weight = 1 if count == 1 else 1 + (count - 1) * repeat_weight
+
+            history.append(EventRecord(event_type, file_path, timestamp, count))
+            rapid.add(timestamp, weight)
+            if event_type == 'deleted':
+                deletions.add(timestamp, weight)
+            sensitive_points = match_weight(file_path)
+            if sensitive_points:
+                sensitive.add(timestamp, sensitive_points)
+
+            # Same rules as calculate_threat_score, without the method calls
+            bucket = timestamp // _HOUR_BUCKET_SECONDS
+            if bucket != hour_bucket:
+                hour_bucket = bucket
+                unusual_points = self.check_unusual_time(timestamp)
+            score = unusual_points + sensitive.expire(timestamp, time_window)
+            if rapid.expire(timestamp, rapid_window) >= rapid_threshold:
+                score += 20
+            if deletions.expire(timestamp, deletion_window) >= deletion_threshold:
+                score += 30
+            if score > 100:
+                score = 100
+            record_score(score)
+
+            if journal_records is not None:
+                journal_records.append(
+                    (event_type, file_path, timestamp, score, self.get_threat_level(score), count)
+                )
+
+        # The history is only read between batches: expire it once
+        self._expire_events(timestamp)
+        self.threat_score = score
+        if write_journal:
+            self.journal.append_many(journal_records)
+        return scores
+
+    def _log_threat(self, score, file_path, batch_size=1):
+        """Warn about a score that rose to 50 or more"""
+        message = (
+            f"Threat detected! Level: {self.get_threat_level(score)}, "
+            f"Score: {score}, File: {file_path}"
+        )
+        if batch_size > 1:
+            message += f" ({batch_size} events in batch)"
+        self.logger.log_warning(message)
+
+    def _expire_events(self, now):
+        """
+        Drop events that have left the analysis window
+        
+        Events arrive in time order, so expired ones are always at the
+        left end of the deque and each event is removed exactly once.
+        
+        Args:
+            now: Current time in seconds
+        """
+        events = self.events
+        while events and now - events[0].time >= self.time_window:
+            events.popleft()
+
+    def maintain(self, now=None):
+        """
+        Drop events that left the analysis window while no new ones arrived
+        (called periodically by the event workers)
+        
+        Args:
+            now: Current time (defaults to the clock's time)
+        """
+        now = self.clock.time() if now is None else now
+        with self._lock:
+            self._expire_events(now)
+
+    def _window(self, rule_window):
+        """
+        Effective width of a rule window
+        
+        Rules only ever see events still inside time_window, so a rule
+        window can never be wider than it.
+        """
+        return min(rule_window, self.time_window)
     
-    def calculate_threat_score(self):
+    def calculate_threat_score(self, now=None):
         """
         Calculate total threat score based on all detection rules
         
+        Args:
+            now: Time to score at (defaults to the clock's time)
+        
         Returns:
             int: Threat score (0-100)
         """
+        if now is None:
+            now = self.clock.time()
+
         score = 0
         
         # Check for rapid file access
-        score += self.check_rapid_access()
+        score += self.check_rapid_access(now)
         
         # Check for unusual time access
-        score += self.check_unusual_time()
+        score += self.check_unusual_time(now)
         
         # Check for multiple deletions
-        score += self.check_deletions()
+        score += self.check_deletions(now)
         
-        # Check each event for sensitive files
-        for event in self.events:
-            score += self.check_sensitive_files(event['path'])
+        # Sensitive file points for every event still in the window
+        score += self._sensitive_counter.expire(now, self.time_window)
         
         # Cap score at 100
         return min(score, 100)
     
-    def check_rapid_access(self):
+    def check_rapid_access(self, now=None):
         """
         Check for rapid file access pattern
         
+        Args:
+            now: Time to check at (defaults to the clock's time)
+        
         Returns:
             int: Points to add (0 or 20)
         """
-        current_time = time.time()
+        if now is None:
+            now = self.clock.time()
         
         # Count events in the rapid access window
-        recent_events = [e for e in self.events 
-                        if current_time - e['time'] < self.rapid_access_window]
+        recent_count = self._rapid_counter.expire(
+            now, self._window(self.rapid_access_window)
+        )
         
         # If too many events in short time, it's suspicious
-        if len(recent_events) >= self.rapid_access_threshold:
+        if recent_count >= self.rapid_access_threshold:
             return 20
         
         return 0
     
-    def check_unusual_time(self):
+    def check_unusual_time(self, now=None):
         """
         Check if activity is happening at unusual hours
         
+        Args:
+            now: Time to check at (defaults to the clock's time)
+        
         Returns:
             int: Points to add (0 or 15)
         """
-        current_hour = datetime.now().hour
+        if now is None:
+            now = self.clock.time()
+        current_hour = datetime.fromtimestamp(now).hour
         
         # Activity between midnight and 5 AM is suspicious
         if 0 <= current_hour < 5:
@@ -193,54 +402,61 @@ class ThreatDetector:
             file_path: Path to check
             
         Returns:
-            int: Points to add (0 or 25)
+            int: Points to add (weight of the best matching keyword, or 0)
         """
-        # Convert to lowercase for case-insensitive matching
-        file_path_lower = file_path.lower()
-        
-        # Check if any sensitive keyword is in the path
-        for keyword in self.sensitive_keywords:
-            if keyword in file_path_lower:
-                return 25
-        
-        return 0
+        # Case-insensitive match against the compiled keyword set
+        return self.keyword_matcher.match_weight(file_path)
     
-    def check_deletions(self):
+    def check_deletions(self, now=None):
         """
         Check for multiple file deletions in short time
         
+        Args:
+            now: Time to check at (defaults to the clock's time)
+        
         Returns:
             int: Points to add (0 or 30)
         """
-        current_time = time.time()
+        if now is None:
+            now = self.clock.time()
         
         # Count deletion events in the deletion window
-        recent_deletes = [e for e in self.events 
-                         if e['type'] == 'deleted' 
-                         and current_time - e['time'] < self.deletion_window]
+        recent_deletes = self._deletion_counter.expire(
+            now, self._window(self.deletion_window)
+        )
         
         # If too many deletions, it's very suspicious
-        if len(recent_deletes) >= self.deletion_threshold:
+        if recent_deletes >= self.deletion_threshold:
             return 30
         
         return 0
     
-    def get_threat_level(self):
+    def get_threat_level(self, score=None):
         """
         Convert numeric score to threat level category
         
+        Args:
+            score: Score to convert (defaults to the current threat score)
+        
         Returns:
             str: Threat level ('Normal', 'Elevated', 'Suspicious', 'Critical')
         """
-        if self.threat_score >= 71:
+        if score is None:
+            score = self.threat_score
+        if score >= 71:
             return "Critical"
-        elif self.threat_score >= 51:
+        elif score >= 51:
             return "Suspicious"
-        elif self.threat_score >= 31:
+        elif score >= 31:
             return "Elevated"
         else:
             return "Normal"
     
+    @property
+    def event_count(self):
+        """Events inside the analysis window"""
+        return len(self.events)
+
     def get_threat_info(self):
         """
         Get detailed information about current threat status
@@ -252,10 +468,51 @@ class ThreatDetector:
             'score': self.threat_score,
             'level': self.get_threat_level(),
             'event_count': len(self.events),
-            'recent_events': self.events[-5:] if self.events else []
+            'recent_events': [
+                self.events[i].to_dict() for i in range(-min(5, len(self.events)), 0)
+            ]
         }
 
 
+def keywords_changed(old, new):
+    """
+    Whether new settings need a different KeywordMatcher than old ones
+
+    Args:
+        old: Previous ThreatDetectionSettings (None if there were none)
+        new: New ThreatDetectionSettings
+
+    Returns:
+        bool: True if the keyword weights or cache size differ
+    """
+    return (
+        old is None
+        or old.sensitive_keyword_weights != new.sensitive_keyword_weights
+        or old.sensitive_path_cache_size != new.sensitive_path_cache_size
+    )
+
+
+def batch_peak(start_score, events, scores):
+    """
+    Highest score of a batch, if it is worth a "Threat detected" warning
+
+    Args:
+        start_score: Detector score before the batch
+        events: The batch's (event_type, file_path, count, timestamp) tuples
+        scores: Score after each event
+
+    Returns:
+        (score, file_path) of the first event reaching the batch's highest
+        score, or None unless that score rose above start_score and is 50+
+    """
+    if not scores:
+        return None
+    peak = max(scores)
+    if peak <= start_score or peak < 50:
+        return None
+    return peak, events[scores.index(peak)][1]
+
+
 # Testing code
 if __name__ == "__main__":
     """Test the threat detector with sample scenarios"""
@@ -0,0 +1,421 @@
+import os
+import threading
+from functools import lru_cache
+
+from .clock import SYSTEM_CLOCK
+from .config_loader import PARTITION_KEYS, ThreatDetectionSettings, load_config
+from .keyword_matcher import KeywordMatcher
+from .logger import EventLogger
+from .threat_detector import ThreatDetector, batch_peak, keywords_changed
+
+try:
+    import pwd
+except ImportError:  # not available on Windows
+    pwd = None
+
+# Seconds between maintain() sweeps for shards whose windows have emptied
+SHARD_PRUNE_INTERVAL = 60
+
+# File owners remembered for the 'owner' key, so a file's deletion lands
+# in the same shard as its creation
+OWNER_CACHE_SIZE = 65536
+
+
+class ShardedThreatDetector:
+    """
+    Threat detection partitioned by watch root, top-level directory or file owner
+    Each shard is a ThreatDetector with its own windows, score and lock, so
+    a noisy tree cannot raise the score of another and shards can be
+    analyzed in parallel. The global score (highest shard score) and the
+    total event count are maintained incrementally. Shards share one
+    compiled KeywordMatcher, and maintain() drops shards with no events
+    left in their window.
+    """
+
+    def __init__(self, partition_key="root", watch_roots=(), config_path="config/config.yaml",
+                 config_data=None, journal=None, clock=None):
+        """
+        Initialize the sharded detector
+
+        Args:
+            partition_key: 'root', 'top_dir' or 'owner' (see PARTITION_KEYS)
+            watch_roots: Monitored directories, used by 'root' and 'top_dir'
+            config_path: YAML config with threat_detection settings
+            config_data: Already-parsed config dict (skips reading config_path)
+            journal: Optional EventJournal shared by every shard
+            clock: Time source shared by every shard (default: system clock)
+        """
+        if partition_key not in PARTITION_KEYS:
+            raise ValueError(
+                f"Unknown partition key {partition_key!r}; "
+                f"expected one of {', '.join(PARTITION_KEYS)}"
+            )
+
+        self.logger = EventLogger()
+        self.partition_key = partition_key
+        self.config_data = config_data if config_data is not None else load_config(config_path, self.logger)
+        self.journal = journal
+        self.clock = clock
+
+        # One keyword matcher (and its path cache) for every shard
+        self._settings = ThreatDetectionSettings.from_config(self.config_data)
+        self._keyword_matcher = KeywordMatcher(
+            self._settings.sensitive_keyword_weights, self._settings.sensitive_path_cache_size
+        )
+
+        # Longest roots first so nested roots win over their parents
+        self.watch_roots = sorted(
+            (os.path.abspath(root) for root in watch_roots), key=len, reverse=True
+        )
+        self._root_for_dir = lru_cache(maxsize=4096)(self._find_root)
+        self._owners = {}
+        self._owners_lock = threading.Lock()
+
+        self.shards = {}
+        self._shards_lock = threading.Lock()
+        self._next_prune = None
+
+        # Global aggregate
+        self._shard_scores = {}
+        self._shard_sizes = {}
+        self._aggregate_lock = threading.Lock()
+        self._top_shard = None
+        self.threat_score = 0
+        self.event_count = 0
+
+        self.logger.log_info(
+            f"ShardedThreatDetector initialized (partition key: {partition_key})"
+        )
+
+    def shard_key(self, file_path):
+        """
+        Shard an event belongs to
+
+        Args:
+            file_path: Path of the event
+
+        Returns:
+            str: Shard name
+        """
+        if self.partition_key == "global":
+            return "global"
+
+        if self.partition_key == "owner":
+            uid = self._owner_uid(os.path.abspath(file_path))
+            if uid is None:
+                return "unknown"
+            if pwd is not None:
+                try:
+                    return pwd.getpwuid(uid).pw_name
+                except KeyError:
+                    pass
+            return str(uid)
+
+        file_path = os.path.abspath(file_path)
+        root = self._root_for_dir(os.path.dirname(file_path))
+        if self.partition_key == "root" or root is None:
+            return root or "unrooted"
+
+        # top_dir: the first directory below the root
+        relative = os.path.relpath(file_path, root)
+        first, sep, _ = relative.partition(os.sep)
+        return os.path.join(root, first) if sep else root
+
+    def _owner_uid(self, file_path):
+        """
+        Owner of a file, for the 'owner' partition key
+
+        A file that no longer exists (deleted, or the old path of a move)
+        keeps the owner seen on its earlier events; failing that, the
+        owner of its directory is used.
+
+        Args:
+            file_path: Absolute path of the event
+
+        Returns:
+            int: uid, or None if neither the file nor its directory exists
+        """
+        try:
+            uid = os.stat(file_path).st_uid
+        except OSError:
+            with self._owners_lock:
+                uid = self._owners.get(file_path)
+            if uid is not None:
+                return uid
+            try:
+                return os.stat(os.path.dirname(file_path)).st_uid
+            except OSError:
+                return None
+
+        with self._owners_lock:
+            owners = self._owners
+            if owners.get(file_path) != uid:
+                if len(owners) >= OWNER_CACHE_SIZE:
+                    del owners[next(iter(owners))]
+                owners[file_path] = uid
+        return uid
+
+    def _find_root(self, directory):
+        """Watch root containing a directory (cached per directory)"""
+        for root in self.watch_roots:
+            if directory == root or directory.startswith(root + os.sep):
+                return root
+        return None
+
+    def _get_shard(self, key):
+        """Shard detector for a key, created on first use"""
+        shard = self.shards.get(key)
+        if shard is None:
+            with self._shards_lock:
+                shard = self.shards.get(key)
+                if shard is None:
+                    shard = ThreatDetector(
+                        config_data=self.config_data, journal=self.journal, clock=self.clock,
+                        keyword_matcher=self._keyword_matcher,
+                    )
+                    self.shards[key] = shard
+        return shard
+
+    def _lock_shard(self, key):
+        """
+        Shard for a key with its lock held
+
+        Retries if maintain() removed the shard between the lookup and
+        the lock, so no event lands in a shard that is no longer tracked.
+        """
+        while True:
+            shard = self._get_shard(key)
+            shard._lock.acquire()
+            if self.shards.get(key) is shard:
+                return shard
+            shard._lock.release()
+
+    def maintain(self, now=None):
+        """
+        Drop shards whose windows have emptied (called periodically by the
+        event workers; sweeps at most once per SHARD_PRUNE_INTERVAL)
+
+        Args:
+            now: Current time (defaults to the clock's time)
+
+        Returns:
+            int: Number of shards removed
+        """
+        now = (self.clock or SYSTEM_CLOCK).time() if now is None else now
+        if self._next_prune is not None and now < self._next_prune:
+            return 0
+        self._next_prune = now + SHARD_PRUNE_INTERVAL
+
+        removed = 0
+        for key, shard in list(self.shards.items()):
+            with shard._lock:
+                shard._expire_events(now)
+                if shard.events:
+                    self._update_aggregate(key, shard.threat_score, len(shard.events))
+                    continue
+                with self._shards_lock:
+                    if self.shards.get(key) is not shard:
+                        continue
+                    del self.shards[key]
+                self._forget_shard(key)
+            removed += 1
+        return removed
+
+    def apply_config(self, config):
+        """
+        Apply a reloaded AgentConfig to every shard (AgentConfig.subscribe callback)
+
+        Each shard swaps its settings under its own lock and keeps its
+        windows. The partition key cannot change while running.
+
+        Args:
+            config: Reloaded AgentConfig
+        """
+        if config.threat_detection.partition_key != self.partition_key:
+            self.logger.log_warning(
+                f"threat_detection.partition_key changed to "
+                f"{config.threat_detection.partition_key!r}; restart the agent to apply it"
+            )
+
+        # Shards created from now on read the new config
+        settings = config.threat_detection
+        with self._shards_lock:
+            if keywords_changed(self._settings, settings):
+                self._keyword_matcher = KeywordMatcher(
+                    settings.sensitive_keyword_weights, settings.sensitive_path_cache_size
+                )
+            self._settings = settings
+            self.config_data = config.data
+            shards = list(self.shards.values())
+        for shard in shards:
+            shard.apply_settings(settings, self._keyword_matcher)
+        self.logger.log_info(f"Settings reloaded in {len(shards)} shard(s)")
+
+    def add_event(self, event_type, file_path, count=1, timestamp=None):
+        """
+        Score an event in its shard and update the global aggregate
+
+        Args:
+            event_type: Type of event ('created', 'modified', 'deleted')
+            file_path: Path to the file involved
+            count: Number of raw events this one stands for (from coalescing)
+            timestamp: When the event happened (defaults to now)
+
+        Returns:
+            int: Threat score of the event's shard
+        """
+        key = self.shard_key(file_path)
+        shard = self._lock_shard(key)
+        try:
+            score = shard._add_event(event_type, file_path, count, timestamp)
+            self._update_aggregate(key, score, len(shard.events))
+        finally:
+            shard._lock.release()
+        return score
+
+    def add_events(self, events):
+        """
+        Score a batch of events, each in its shard, in one pass per shard
+
+        Events are grouped by shard (keeping their order within a shard),
+        each group is scored with one lock acquisition and one aggregate
+        update, and at most one "Threat detected" warning is logged for
+        the whole batch. Journal records are written once, in the batch's
+        order, so the journal stays in time order across shards.
+
+        Args:
+            events: (event_type, file_path, count, timestamp) tuples in
+                    time order (see ThreatDetector.add_events)
+
+        Returns:
+            list: Threat score of each event's shard after the event
+        """
+        groups = {}
+        for index, event in enumerate(events):
+            key = self.shard_key(event[1])
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = ([], [])
+            group[0].append(index)
+            group[1].append(event)
+
+        scores = [0] * len(events)
+        records = [None] * len(events) if self.journal is not None else None
+        peak = peak_shard = None
+        for key, (indexes, shard_events) in groups.items():
+            shard = self._lock_shard(key)
+            shard_records = [] if records is not None else None
+            try:
+                start_score = shard.threat_score
+                shard_scores = shard._add_events(shard_events, shard_records)
+                self._update_aggregate(key, shard_scores[-1], len(shard.events))
+            finally:
+                shard._lock.release()
+            for index, score in zip(indexes, shard_scores):
+                scores[index] = score
+            if records is not None:
+                for index, record in zip(indexes, shard_records):
+                    records[index] = record
+
+            shard_peak = batch_peak(start_score, shard_events, shard_scores)
+            if shard_peak is not None and (peak is None or shard_peak[0] > peak[0]):
+                peak, peak_shard = shard_peak, shard
+
+        if records:
+            self.journal.append_many(records)
+        if peak is not None:
+            # The shard that peaked logs for the whole batch
+            peak_shard._log_threat(*peak, batch_size=len(scores))
+        return scores
+
+    def _update_aggregate(self, key, score, size):
+        """Fold one shard's new score and window size into the global view"""
+        with self._aggregate_lock:
+            self.event_count += size - self._shard_sizes.get(key, 0)
+            self._shard_sizes[key] = size
+            self._shard_scores[key] = score
+
+            if score >= self.threat_score:
+                self.threat_score = score
+                self._top_shard = key
+            elif key == self._top_shard:
+                # The leading shard cooled down; find the new maximum
+                self._top_shard = max(self._shard_scores, key=self._shard_scores.get)
+                self.threat_score = self._shard_scores[self._top_shard]
+
+    def _forget_shard(self, key):
+        """Take a removed shard out of the global aggregate"""
+        with self._aggregate_lock:
+            self.event_count -= self._shard_sizes.pop(key, 0)
+            self._shard_scores.pop(key, None)
+            if key == self._top_shard:
+                if self._shard_scores:
+                    self._top_shard = max(self._shard_scores, key=self._shard_scores.get)
+                    self.threat_score = self._shard_scores[self._top_shard]
+                else:
+                    self._top_shard = None
+                    self.threat_score = 0
+
+    def get_threat_level(self, score=None):
+        """
+        Convert a score (default: the global score) to a threat level
+
+        Returns:
+            str: Threat level ('Normal', 'Elevated', 'Suspicious', 'Critical')
+        """
+        if score is None:
+            score = self.threat_score
+        if score >= 71:
+            return "Critical"
+        elif score >= 51:
+            return "Suspicious"
+        elif score >= 31:
+            return "Elevated"
+        else:
+            return "Normal"
+
+    def get_threat_info(self):
+        """
+        Get the global threat status plus a summary of every shard
+
+        Returns:
+            dict: Global score/level/event count, recent events of the
+                  highest-scoring shard, and per-shard score/level/event count
+        """
+        top = self.shards.get(self._top_shard)
+        return {
+            'score': self.threat_score,
+            'level': self.get_threat_level(),
+            'event_count': self.event_count,
+            'recent_events': top.get_threat_info()['recent_events'] if top else [],
+            'top_shard': self._top_shard,
+            'shards': {
+                key: {
+                    'score': shard.threat_score,
+                    'level': shard.get_threat_level(),
+                    'event_count': len(shard.events),
+                }
+                for key, shard in list(self.shards.items())
+            },
+        }
+
+
+def create_threat_detector(config_data, watch_roots=(), journal=None, clock=None):
+    """
+    Build the detector described by threat_detection.partition_key
+
+    Args:
+        config_data: Parsed config dict
+        watch_roots: Monitored directories
+        journal: Optional EventJournal
+        clock: Optional time source (default: system clock)
+
+    Returns:
+        ThreatDetector for 'global', otherwise a ShardedThreatDetector
+    """
+    partition_key = config_data.get("threat_detection", {}).get("partition_key", "global")
+    if partition_key == "global":
+        return ThreatDetector(config_data=config_data, journal=journal, clock=clock)
+    return ShardedThreatDetector(
+        partition_key, watch_roots, config_data=config_data, journal=journal, clock=clock
+    )
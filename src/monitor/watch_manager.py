@@ -0,0 +1,298 @@
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from .clock import SYSTEM_CLOCK
+from .decoy_manager import create_decoy_manager
+from .events import FileEvent
+from .file_monitor import FileMonitor, create_event_queue, create_journal
+from .inotify_source import DEFAULT_BUFFER_SIZE, InotifySource, resolve_event_source
+from .logger import EventLogger
+from .metrics import REGISTRY
+from .threat_partition import create_threat_detector
+
+
+# Queue state, read when metrics are collected
+_QUEUE_DEPTH = REGISTRY.gauge(
+    "honeypot_queue_depth", "Events waiting for an analysis worker", ("queue",)
+)
+_QUEUE_DROPPED = REGISTRY.gauge(
+    "honeypot_queue_dropped_events", "Events dropped by a full queue", ("queue",)
+)
+
+# Per-root event counts and rates (the rate is measured between scrapes)
+_ROOT_EVENTS = REGISTRY.gauge(
+    "honeypot_root_events", "File events seen under a watch root", ("root",)
+)
+_ROOT_EVENT_RATE = REGISTRY.gauge(
+    "honeypot_root_events_per_second", "Event rate of a watch root since the previous scrape", ("root",)
+)
+
+
+class EventRate:
+    """Events per second of a running count, between successive samples"""
+
+    def __init__(self):
+        self._time = time.monotonic()
+        self._events = 0
+
+    def sample(self, events):
+        """
+        Rate since the previous sample
+
+        Args:
+            events: Current value of the running count
+
+        Returns:
+            float: Events per second
+        """
+        now = time.monotonic()
+        elapsed = now - self._time
+        rate = (events - self._events) / elapsed if elapsed > 0 else 0.0
+        self._time = now
+        self._events = events
+        return rate
+
+
+class RootEventHandler(FileSystemEventHandler):
+    """
+    Watchdog handler for one watch root
+    Only wraps events into FileEvents for the root's worker queue and
+    counts them, so the observer thread never waits on analysis
+    """
+
+    def __init__(self, root, event_queue, clock=None):
+        """
+        Args:
+            root: Watched directory
+            event_queue: EventQueue of the worker that owns this root
+            clock: Time source for event timestamps (default: system clock)
+        """
+        super().__init__()
+        self.root = root
+        self.clock = clock or SYSTEM_CLOCK
+        self.event_queue = event_queue
+        self.events = 0
+        self.events_by_type = {"created": 0, "modified": 0, "deleted": 0, "moved": 0}
+
+        # Rates since the previous stats snapshot / metrics scrape
+        self._snapshot_rate = EventRate()
+        self._scrape_rate = EventRate()
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._enqueue("created", event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._enqueue("modified", event.src_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self._enqueue("deleted", event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._enqueue("moved", event.src_path, event.dest_path)
+
+    def _enqueue(self, event_type, file_path, dest_path=None):
+        # Counters are only written by this root's observer thread
+        self.events += 1
+        self.events_by_type[event_type] += 1
+        self.event_queue.put(FileEvent(event_type, file_path, self.clock.time(), dest_path=dest_path))
+
+    def enqueue_batch(self, events):
+        """
+        Count and queue FileEvents read together by a native event source
+
+        Args:
+            events: FileEvents in arrival order
+        """
+        by_type = self.events_by_type
+        for event in events:
+            by_type[event.event_type] += 1
+        self.events += len(events)
+        self.event_queue.put_many(events)
+
+    def snapshot(self):
+        """
+        Get this root's counters and its event rate since the last snapshot
+
+        Returns:
+            dict: Total events, events per type, events/sec
+        """
+        events = self.events
+        return {
+            'events': events,
+            'by_type': dict(self.events_by_type),
+            'events_per_second': self._snapshot_rate.sample(events),
+        }
+
+    def scrape_rate(self):
+        """Event rate since the previous metrics scrape (kept apart from snapshot())"""
+        return self._scrape_rate.sample(self.events)
+
+
+class WatchManager:
+    """
+    Watches many roots at once: one event source per root (an inotify
+    reader on Linux, a watchdog Observer elsewhere) feeding a shared pool
+    of analysis workers
+
+    Each root is pinned to one worker queue (by a hash of its path), so
+    a root's events stay in order while different roots are analyzed on
+    different threads against the same FileMonitor (detector + decoys).
+    """
+
+    def __init__(self, watch_roots, config_data, workers=None, started_at=None, config=None,
+                 clock=None):
+        """
+        Initialize the watch manager
+
+        Args:
+            watch_roots: Directories to monitor (missing ones are skipped)
+            config_data: Parsed config dict
+            workers: Number of analysis threads (default: monitoring.workers,
+                     capped at the number of roots)
+            started_at: time.monotonic() when the agent started (for the
+                        time-to-first-event report)
+            config: Optional AgentConfig that config_data came from; the
+                    workers check it for changes and reload the detector
+            clock: Time source for event timestamps, scoring and decoys
+                   (default: system clock)
+        """
+        self.logger = EventLogger()
+        self.clock = clock or SYSTEM_CLOCK
+
+        self.watch_roots = []
+        for root in watch_roots:
+            root = os.path.abspath(root)
+            if os.path.isdir(root):
+                self.watch_roots.append(root)
+            else:
+                self.logger.log_warning(f"Watch root {root} does not exist; skipping")
+
+        pipeline_config = config_data.get("pipeline", {})
+        monitoring_config = config_data.get("monitoring", {})
+        if workers is None:
+            workers = monitoring_config.get("workers", 4)
+        workers = max(1, min(workers, len(self.watch_roots) or 1))
+
+        # Shared analysis state
+        self.journal = create_journal(config_data)
+        self.monitor = FileMonitor(
+            batch_size=pipeline_config.get("batch_size", 256),
+            debounce_seconds=pipeline_config.get("debounce_seconds", 0.0),
+            threat_detector=create_threat_detector(
+                config_data, self.watch_roots, self.journal, clock=self.clock
+            ),
+            decoy_manager=create_decoy_manager(config_data, self.watch_roots, clock=self.clock),
+            started_at=started_at,
+            config=config,
+            clock=self.clock,
+        )
+
+        # One queue + worker thread per pool slot
+        self.queues = [create_event_queue(config_data) for _ in range(workers)]
+        for i, queue in enumerate(self.queues):
+            _QUEUE_DEPTH.labels(i).function = lambda queue=queue: queue.depth
+            _QUEUE_DROPPED.labels(i).function = lambda queue=queue: queue.dropped
+        self.workers = [
+            self.monitor.create_worker(queue, name=f"honeypot-worker-{i}")
+            for i, queue in enumerate(self.queues)
+        ]
+
+        self.handlers = {
+            root: RootEventHandler(
+                root, self.queues[zlib.crc32(root.encode()) % workers], self.clock
+            )
+            for root in self.watch_roots
+        }
+        for root, handler in self.handlers.items():
+            _ROOT_EVENTS.labels(root).function = lambda handler=handler: handler.events
+            _ROOT_EVENT_RATE.labels(root).function = handler.scrape_rate
+        self.observers = {}
+        self.event_source = resolve_event_source(
+            monitoring_config.get("event_source", "auto"), self.logger
+        )
+        self.inotify_buffer_bytes = monitoring_config.get("inotify_buffer_bytes", DEFAULT_BUFFER_SIZE)
+
+    def start(self):
+        """Start the workers, then one observer per root (set up concurrently)."""
+        self.monitor.expose_metrics()
+        for worker in self.workers:
+            worker.start()
+
+        # Recursive watch setup walks each tree; do the roots in parallel
+        with ThreadPoolExecutor(max_workers=min(8, len(self.handlers) or 1)) as pool:
+            for root, observer in zip(self.handlers, pool.map(self._start_observer, self.handlers)):
+                self.observers[root] = observer
+
+        self.logger.log_info(
+            f"Watching {len(self.observers)} root(s) with {len(self.workers)} worker(s) "
+            f"({self.event_source})"
+        )
+
+    def _start_observer(self, root):
+        name = f"honeypot-observer-{os.path.basename(root) or root}"
+        if self.event_source == "inotify":
+            source = InotifySource(
+                root, self.handlers[root], self.clock, self.inotify_buffer_bytes, name=name
+            )
+            try:
+                source.start()
+                return source
+            except OSError as exc:
+                self.logger.log_warning(f"inotify cannot watch {root} ({exc}); using watchdog")
+
+        observer = Observer()
+        observer.name = name
+        observer.schedule(self.handlers[root], root, recursive=True)
+        observer.start()
+        return observer
+
+    def stop(self, timeout=None):
+        """Stop observers, drain every worker queue and close the journal."""
+        for observer in self.observers.values():
+            observer.stop()
+        for observer in self.observers.values():
+            observer.join(timeout)
+        self.observers.clear()
+
+        for worker in self.workers:
+            worker.stop(timeout)
+        if self.monitor.coalescer is not None:
+            self.monitor._analyze(self.monitor.coalescer.flush_all())
+        self.monitor.decoy_manager.close()
+
+        if self.journal is not None:
+            self.journal.close()
+        for root in self.handlers:
+            _ROOT_EVENTS.remove(root)
+            _ROOT_EVENT_RATE.remove(root)
+        self.logger.log_info(f"Watch manager stopped: {self.get_stats()}")
+
+    def get_root_stats(self):
+        """
+        Get per-root event counters and rates
+
+        Returns:
+            dict: root -> {'events', 'by_type', 'events_per_second'}
+        """
+        return {root: handler.snapshot() for root, handler in self.handlers.items()}
+
+    def get_stats(self):
+        """
+        Get per-root stats plus the state of every worker queue
+
+        Returns:
+            dict: 'roots' and 'queues' sections
+        """
+        return {
+            'roots': self.get_root_stats(),
+            'queues': [queue.get_stats() for queue in self.queues],
+        }
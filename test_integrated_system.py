@@ -10,6 +10,7 @@ import time
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
+from monitor.clock import SimulatedClock
 from monitor.file_monitor import FileMonitor
 from monitor.threat_detector import ThreatDetector
 from monitor.decoy_manager import DecoyManager
@@ -34,7 +35,9 @@ def test_integrated_system():
     print("STEP 1: Initialize System Components")
     print("-"*70)
     
-    file_monitor = FileMonitor()
+    # Simulated time: the rapid-access steps below run without sleeping
+    clock = SimulatedClock(time.time())
+    file_monitor = FileMonitor(clock=clock)
     print("✅ FileMonitor initialized")
     print("✅ ThreatDetector initialized (inside FileMonitor)")
     print("✅ DecoyManager initialized (inside FileMonitor)")
@@ -78,7 +81,7 @@ def test_integrated_system():
     for file_path in sensitive_files:
         event = MockEvent(file_path)
         file_monitor.on_created(event)
-        time.sleep(0.1)  # Small delay
+        clock.advance(0.1)  # Small delay
     
     threat_score = file_monitor.threat_detector.threat_score
     threat_level = file_monitor.threat_detector.get_threat_level()
@@ -0,0 +1,19 @@
+import time
+
+from src.domain.application.decoy_service import DecoyService
+from src.domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+
+
+def deploy_critical(tmp_path):
+    service = DecoyService(FileDecoyGenerator())
+    decoys = service.generate_decoys_for_threat_level("Critical", str(tmp_path / "decoys"))
+    return service, decoys
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
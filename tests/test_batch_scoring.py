@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.monitor.batch_scoring import load_events, make_columns, score_events
+from src.monitor.event_journal import EventJournal
+from src.monitor.threat_detector import ThreatDetector
+
+
+def synthetic_events(count, seed):
+    rng = random.Random(seed)
+    now = 1_700_000_000.0
+    events = []
+    for _ in range(count):
+        now += rng.choice([0.0, 0.001, 0.3, 1.0, 4.0, 12.0, 400.0, 3000.0])
+        events.append((
+            now,
+            rng.choice(["created", "modified", "deleted", "moved"]),
+            rng.choice(["/srv/a.txt", "/srv/passwords.txt", "/srv/b/config.yml", "/srv/c.o"]),
+            rng.choice([1, 1, 1, 4]),
+        ))
+    return events
+
+
+@pytest.mark.parametrize("repeat_weight", [0.0, 0.5])
+def test_batch_scores_match_streaming_detector(repeat_weight):
+    events = synthetic_events(3000, seed=11)
+
+    streaming = ThreatDetector()
+    streaming.repeat_event_weight = repeat_weight
+    expected = [
+        streaming.add_event(event_type, path, count, timestamp)
+        for timestamp, event_type, path, count in events
+    ]
+
+    rules = ThreatDetector()
+    rules.repeat_event_weight = repeat_weight
+    columns = make_columns(*zip(*events))
+    result = score_events(columns, rules)
+
+    assert result.scores.tolist() == expected
+    assert result.levels[-1] == streaming.get_threat_level()
+
+
+def test_load_events_from_journal_and_jsonl(tmp_path):
+    # Distinct timestamps, so the reversed JSONL export sorts back uniquely
+    events = list({e[0]: e for e in synthetic_events(200, seed=3)}.values())
+
+    journal = EventJournal(str(tmp_path / "events.journal"))
+    for timestamp, event_type, path, count in events:
+        journal.append(event_type, path, timestamp, 0, "Normal", count)
+    journal.close()
+
+    jsonl = tmp_path / "events.jsonl"
+    jsonl.write_text("".join(
+        f'{{"time": {t!r}, "type": "{e}", "path": "{p}", "count": {c}}}\n'
+        for t, e, p, c in reversed(events)
+    ))
+
+    from_journal = load_events(str(tmp_path / "events.journal"))
+    from_jsonl = load_events(str(jsonl))
+
+    assert from_journal.timestamps.tolist() == [e[0] for e in events]
+    assert from_jsonl.timestamps.tolist() == [e[0] for e in events]
+    assert from_jsonl.paths == from_journal.paths
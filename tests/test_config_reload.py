@@ -0,0 +1,143 @@
+from datetime import datetime
+
+from src.monitor.config_loader import AgentConfig, get_config, load_config
+from src.monitor.threat_detector import ThreatDetector
+from src.monitor.threat_partition import ShardedThreatDetector
+
+NOON = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0).timestamp()
+
+
+def write_config(path, rapid_access_threshold, keyword="wallet"):
+    path.write_text(
+        "threat_detection:\n"
+        f"  rapid_access_threshold: {rapid_access_threshold}\n"
+        "  sensitive_keywords:\n"
+        f"    {keyword}: 40\n"
+    )
+
+
+def test_config_is_parsed_once_and_shared(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    write_config(config_file, 5)
+
+    first = load_config(str(config_file))
+    assert load_config(str(config_file)) is first
+    assert get_config(str(config_file)).threat_detection.rapid_access_threshold == 5
+
+    write_config(config_file, 12)
+    assert load_config(str(config_file))["threat_detection"]["rapid_access_threshold"] == 12
+
+
+def test_check_only_looks_at_the_file_once_per_interval(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    write_config(config_file, 5)
+    config = AgentConfig(str(config_file), check_interval=60)
+
+    config.check(now=100.0, force=True)
+    write_config(config_file, 30)
+
+    assert not config.check(now=110.0)
+    assert config.threat_detection.rapid_access_threshold == 5
+    assert config.check(now=161.0)
+    assert config.threat_detection.rapid_access_threshold == 30
+    assert config.version == 2
+
+
+def test_reload_changes_thresholds_and_keeps_windows(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    write_config(config_file, 5)
+    config = AgentConfig(str(config_file))
+    detector = ThreatDetector(config_data=config.data)
+    config.subscribe(detector.apply_config)
+
+    for i in range(4):
+        detector.add_event("created", f"/data/file{i}.txt", timestamp=NOON + i)
+    assert detector.check_rapid_access(NOON + 3) == 0
+
+    write_config(config_file, 3, keyword="ledger")
+    assert config.check(force=True)
+
+    # The four events already in the window now cross the lower threshold
+    assert len(detector._rapid_counter) == 4
+    assert detector.check_rapid_access(NOON + 3) == 20
+    assert detector.check_sensitive_files("/data/ledger.xls") == 40
+    assert detector.check_sensitive_files("/data/wallet.dat") == 0
+
+
+def test_reload_reaches_every_shard(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    write_config(config_file, 5)
+    config = AgentConfig(str(config_file))
+    roots = [str(tmp_path / "a"), str(tmp_path / "b")]
+    detector = ShardedThreatDetector("root", roots, config_data=config.data)
+    config.subscribe(detector.apply_config)
+
+    detector.add_event("created", f"{roots[0]}/x.txt", timestamp=NOON)
+    write_config(config_file, 2)
+    config.check(force=True)
+    detector.add_event("created", f"{roots[1]}/y.txt", timestamp=NOON + 1)
+
+    assert all(shard.rapid_access_threshold == 2 for shard in detector.shards.values())
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.errors = []
+
+    def log_error(self, message):
+        self.errors.append(message)
+
+    def log_info(self, message):
+        pass
+
+    def log_warning(self, message):
+        pass
+
+
+def test_broken_or_missing_file_keeps_the_last_good_config(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    write_config(config_file, 5)
+    logger = RecordingLogger()
+    config = AgentConfig(str(config_file), logger=logger)
+    applied = []
+    config.subscribe(applied.append)
+
+    config_file.write_text("threat_detection:\n  rapid_access_threshold: [12\n")
+    assert not config.check(force=True)
+    assert not config.check(force=True)
+    assert config.threat_detection.rapid_access_threshold == 5
+    assert config.data["threat_detection"]["sensitive_keywords"] == {"wallet": 40}
+    assert len(logger.errors) == 1
+    assert applied == []
+
+    config_file.unlink()
+    assert not config.check(force=True)
+    assert config.threat_detection.rapid_access_threshold == 5
+
+    write_config(config_file, 8)
+    assert config.check(force=True)
+    assert config.threat_detection.rapid_access_threshold == 8
+    assert applied == [config]
+
+
+def test_reload_with_invalid_values_keeps_the_last_good_config(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    write_config(config_file, 5)
+    logger = RecordingLogger()
+    config = AgentConfig(str(config_file), logger=logger)
+    detector = ThreatDetector(config_data=config.data)
+    config.subscribe(detector.apply_config)
+
+    for bad in ("rapid_access_threshold: five", "time_window_seconds: -1",
+                "sensitive_path_cache_size: 1.5", "partition_key: by_moon_phase"):
+        config_file.write_text(f"threat_detection:\n  {bad}\n")
+        assert not config.check(force=True), bad
+    assert len(logger.errors) == 4
+    assert config.threat_detection.rapid_access_threshold == 5
+
+    # Detection keeps working with the old settings
+    assert detector.add_event("created", "/data/wallet.dat", timestamp=NOON) == 40
+
+    config_file.write_text("threat_detection:\n  rapid_access_threshold: '7'\n")
+    assert config.check(force=True)
+    assert config.threat_detection.rapid_access_threshold == 7.0
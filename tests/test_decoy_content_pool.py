@@ -0,0 +1,79 @@
+import time
+
+from src.domain.application.decoy_service import DecoyService
+from src.domain.infrastructure.decoy_content_pool import DecoyContentPool
+from src.domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+from src.domain.infrastructure.parallel_decoy_writer import ParallelDecoyWriter
+
+
+def test_pool_counts_hits_and_misses():
+    counter = iter(range(100))
+    pool = DecoyContentPool({"credential": lambda: f"payload {next(counter)}"}, size=2)
+    pool.fill()
+
+    assert pool.take("credential") == "payload 0"
+    assert pool.take("credential") == "payload 1"
+    assert pool.take("credential") is None
+
+    stats = pool.get_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_background_refill_tops_pool_up():
+    pool = DecoyContentPool({"document": lambda: "doc"}, size=3, refill_pause=0)
+    pool.start()
+    try:
+        deadline = time.monotonic() + 5
+        while pool.get_stats()["ready"]["document"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.get_stats()["ready"]["document"] == 3
+
+        pool.take("document")
+        deadline = time.monotonic() + 5
+        while pool.get_stats()["ready"]["document"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.get_stats()["ready"]["document"] == 3
+    finally:
+        pool.stop(timeout=5)
+
+
+def test_service_draws_decoys_from_generator_pool(tmp_path):
+    generator = FileDecoyGenerator(pool_size=2, refill_pause=0)
+    generator.content_pool.stop()
+    generator.content_pool.fill()
+
+    decoys = DecoyService(generator).generate_decoys_for_threat_level(
+        "Critical", str(tmp_path)
+    )
+
+    assert len(decoys) == 4
+    assert generator.content_pool.get_stats()["hits"] == 4
+    assert all(open(d.file_path).read() == d.content for d in decoys)
+
+
+def test_parallel_deploy_takes_pooled_payloads_before_rendering(tmp_path):
+    generator = FileDecoyGenerator(pool_size=3, refill_pause=0)
+    generator.content_pool.stop()
+    generator.content_pool.fill()
+    pooled = list(generator.content_pool._payloads["credential"])
+    writer = ParallelDecoyWriter(max_workers=4)
+    specs = [("credential", str(tmp_path / f"creds{i}.txt")) for i in range(5)]
+
+    try:
+        report = DecoyService(generator, writer).deploy_decoys(specs)
+    finally:
+        writer.close()
+
+    assert len(report.deployed) == 5
+    assert [d.content for d in report.deployed[:3]] == pooled
+    assert generator.content_pool.get_stats()["hits"] == 3
+    assert all(open(d.file_path).read() == d.content for d in report.deployed)
+
+
+def test_reseed_makes_content_reproducible():
+    generator = FileDecoyGenerator()
+    generator.reseed(1234)
+    first = generator.templates.render("credential")
+    generator.reseed(1234)
+    assert generator.templates.render("credential") == first
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+
+import pytest
+
+from conftest import deploy_critical
+from src.domain.application.decoy_fingerprint import fingerprint_content
+from src.domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+from src.monitor.decoy_scanner import DecoyContentScanner
+
+
+def test_every_deployed_decoy_gets_a_fingerprint(tmp_path):
+    _, decoys = deploy_critical(tmp_path)
+
+    for decoy in decoys:
+        assert decoy.fingerprint is not None
+        assert decoy.fingerprint.tokens
+        assert decoy.fingerprint == fingerprint_content(decoy.content)
+
+
+def test_decoys_of_the_same_type_share_no_token():
+    templates = FileDecoyGenerator().templates
+    for decoy_type in templates.types():
+        seen = set()
+        for content in templates.render_many(decoy_type, 50):
+            tokens = set(fingerprint_content(content).tokens)
+            assert tokens, decoy_type
+            assert not tokens & seen, decoy_type
+            seen |= tokens
+
+    # Template text and vocabulary words never become tokens
+    assert fingerprint_content("AWS_DEFAULT_REGION=us-east-1\n" + "0123456789abcdef" * 2).tokens == ()
+
+
+def test_copied_excerpt_is_found(tmp_path):
+    service, decoys = deploy_critical(tmp_path)
+    api_keys = next(d for d in decoys if d.file_path.endswith("api_keys.txt"))
+    excerpt = "\n".join(api_keys.content.splitlines()[-2:])
+
+    assert service.find_decoy_content(f"loot:\n{excerpt}\n".encode()) is api_keys
+    assert service.find_decoy_content(b"nothing to see here 0123456789abcdef0123") is None
+
+
+def test_scanner_samples_large_files(tmp_path):
+    service, decoys = deploy_critical(tmp_path)
+    scanner = DecoyContentScanner(
+        service.find_decoy_content, max_bytes=64 * 1024, window_bytes=16 * 1024, windows=3
+    )
+    stolen = decoys[0].content.encode()
+
+    # Decoy content at the tail of a 1 MiB file is found by reading 48 KiB
+    big = tmp_path / "archive.bin"
+    big.write_bytes(b"\0" * (1024 * 1024) + stolen)
+    assert scanner.scan_file(str(big)) is decoys[0]
+    assert scanner.get_stats()["bytes_read"] == 48 * 1024
+
+    small = tmp_path / "notes.txt"
+    small.write_text("nothing here")
+    assert scanner.scan_file(str(small)) is None
+    assert scanner.scan_file(str(tmp_path / "missing.txt")) is None
+    scanner.close()
+
+
+def test_scanner_reports_matches_in_background(tmp_path):
+    service, decoys = deploy_critical(tmp_path)
+    found = []
+    scanner = DecoyContentScanner(service.find_decoy_content, on_match=lambda p, d: found.append((p, d)))
+    copy = tmp_path / "elsewhere.txt"
+    copy.write_text(decoys[1].content)
+
+    assert scanner.submit(str(copy)) is True
+    deadline = time.monotonic() + 5
+    while scanner.get_stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scanner.close()
+
+    assert found == [(str(copy), decoys[1])]
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="FIFOs are POSIX-only")
+def test_scanner_skips_fifos_and_still_closes(tmp_path):
+    service, decoys = deploy_critical(tmp_path)
+    scanner = DecoyContentScanner(service.find_decoy_content)
+    fifo = tmp_path / "pipe"
+    os.mkfifo(fifo)
+
+    assert scanner.scan_file(str(fifo)) is None
+    assert scanner.submit(str(fifo)) is True
+    closer = threading.Thread(target=scanner.close)
+    closer.start()
+    closer.join(5)
+
+    assert not closer.is_alive()
+    assert scanner.get_stats()["pending"] == 0
+    assert scanner.get_stats()["scanned"] == 0
@@ -0,0 +1,83 @@
+import os
+
+from conftest import deploy_critical
+
+
+def test_lookup_normalizes_relative_and_redundant_paths(tmp_path, monkeypatch):
+    service, decoys = deploy_critical(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    assert service.is_decoy_file("decoys/./api_keys.txt") is True
+    assert service.is_decoy_file(str(tmp_path / "decoys" / ".." / "decoys" / "api_keys.txt"))
+    assert service.is_decoy_file(str(tmp_path / "notes.txt")) is False
+
+
+def test_symlink_and_hardlink_to_decoy_are_recognised(tmp_path):
+    service, decoys = deploy_critical(tmp_path)
+    target = decoys[0].file_path
+
+    symlink = tmp_path / "innocent_link.txt"
+    os.symlink(target, symlink)
+    hardlink = tmp_path / "copy_by_link.txt"
+    os.link(target, hardlink)
+
+    assert service.find_decoy(str(symlink)) is decoys[0]
+    assert service.find_decoy(str(hardlink)) is decoys[0]
+
+
+def test_renamed_decoy_is_tracked_at_new_path(tmp_path):
+    service, decoys = deploy_critical(tmp_path)
+    old_path = decoys[1].file_path
+    new_path = str(tmp_path / "elsewhere.txt")
+    os.rename(old_path, new_path)
+
+    # Found through its inode even before the move event is processed
+    assert service.find_decoy(new_path) is decoys[1]
+
+    service.record_decoy_moved(old_path, new_path)
+    assert decoys[1].file_path == new_path
+    assert service.is_decoy_file(old_path) is False
+    assert service.is_decoy_file(new_path) is True
+
+
+def test_inode_fallback_only_for_decoy_directories(tmp_path, monkeypatch):
+    service, decoys = deploy_critical(tmp_path)
+    in_decoy_dir = tmp_path / "decoys" / "backup_of_keys.txt"
+    os.link(decoys[0].file_path, in_decoy_dir)
+    elsewhere = tmp_path / "elsewhere.txt"
+    os.link(decoys[0].file_path, elsewhere)
+
+    stats = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda path, *a, **kw: stats.append(path) or real_stat(path, *a, **kw))
+
+    assert service.is_decoy_file(str(tmp_path / "notes.txt")) is False
+    assert service.is_decoy_file(str(elsewhere)) is False
+    assert stats == []
+
+    assert service.is_decoy_file(str(in_decoy_dir)) is True
+    assert service.is_decoy_file(str(elsewhere), check_inode=True) is True
+    assert len(stats) == 2
+
+
+def test_redeploy_and_rename_keep_the_indexes_consistent(tmp_path):
+    service, decoys = deploy_critical(tmp_path)
+    registry = service.registry
+    old = decoys[0]
+
+    # Redeploying at the same path replaces the decoy in both indexes
+    [new] = service.deploy_decoys([(old.decoy_type, old.file_path)]).deployed
+    assert len(registry) == 4
+    assert registry.lookup(old.file_path, check_inode=True) is new
+    assert old not in registry._by_inode.values()
+    assert id(old) not in registry._paths_of
+
+    moved = str(tmp_path / "decoys" / "moved.txt")
+    os.rename(new.file_path, moved)
+    assert service.record_decoy_moved(new.file_path, moved) is new
+    assert os.path.normcase(moved) in registry._paths_of[id(new)]
+    assert registry.lookup(moved) is new
+
+    service.record_decoy_deleted(moved)
+    assert id(new) not in registry._inode_of
+    assert len(registry._by_inode) == 3
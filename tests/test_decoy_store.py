@@ -0,0 +1,71 @@
+import os
+
+from src.domain.application.decoy_service import DecoyService
+from src.domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+from src.domain.infrastructure.parallel_decoy_writer import ParallelDecoyWriter
+from src.domain.infrastructure.sqlite_decoy_store import SqliteDecoyStore
+
+
+def new_service(db_path):
+    return DecoyService(FileDecoyGenerator(), ParallelDecoyWriter(max_workers=2), SqliteDecoyStore(db_path))
+
+
+def test_decoys_survive_a_restart(tmp_path):
+    db_path = str(tmp_path / "state" / "decoys.db")
+    first = new_service(db_path)
+    decoys = first.generate_decoys_for_threat_level("Critical", str(tmp_path / "decoys"))
+    first.store.close()
+
+    second = new_service(db_path)
+    result = second.restore()
+
+    assert result["restored"] == 4
+    assert result["directories_checked"] == 0
+    assert all(second.is_decoy_file(d.file_path) for d in decoys)
+    restored = second.find_decoy(decoys[0].file_path)
+    assert restored.fingerprint == decoys[0].fingerprint
+    # Copies are still recognised from the stored canary tokens
+    assert second.find_decoy_content(decoys[0].content.encode()) is restored
+
+
+def test_reconcile_only_touches_changed_directories(tmp_path):
+    db_path = str(tmp_path / "decoys.db")
+    first = new_service(db_path)
+    first.generate_decoys_for_threat_level("Critical", str(tmp_path / "a"))
+    first.generate_decoys_for_threat_level("Suspicious", str(tmp_path / "b"))
+    first.store.close()
+
+    # While the agent was down: one decoy deleted, one replaced
+    os.remove(tmp_path / "a" / "api_keys.txt")
+    os.remove(tmp_path / "a" / "financial_data.txt")
+    (tmp_path / "a" / "financial_data.txt").write_text("replaced")
+
+    second = new_service(db_path)
+    result = second.restore()
+
+    assert result["directories_checked"] == 1
+    assert result["directories_skipped"] == 1
+    assert [os.path.basename(p) for p, _ in result["missing"]] == ["api_keys.txt"]
+    assert [os.path.basename(p) for p, _ in result["changed"]] == ["financial_data.txt"]
+    # A deleted decoy's path stays a trap
+    assert second.is_decoy_file(str(tmp_path / "a" / "api_keys.txt"))
+    second.store.close()
+
+    # Nothing changed since the last reconcile
+    assert new_service(db_path).restore()["directories_checked"] == 0
+
+
+def test_moves_are_persisted(tmp_path):
+    db_path = str(tmp_path / "decoys.db")
+    first = new_service(db_path)
+    decoys = first.generate_decoys_for_threat_level("Suspicious", str(tmp_path / "decoys"))
+    moved = str(tmp_path / "elsewhere.txt")
+    os.rename(decoys[0].file_path, moved)
+    first.record_decoy_moved(decoys[0].file_path, moved)
+    first.store.close()
+
+    second = new_service(db_path)
+    second.restore()
+
+    assert second.is_decoy_file(moved)
+    assert second.store.count() == 2
@@ -0,0 +1,85 @@
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from domain.application.deployment_scheduler import DeploymentScheduler
+from monitor.decoy_manager import DecoyManager
+
+NOW = 1_800_000_000.0
+
+
+def names(specs):
+    return sorted(os.path.basename(path) for _, path in specs)
+
+
+def test_escalation_tops_up_and_repeats_are_ignored():
+    scheduler = DeploymentScheduler()
+
+    assert names(scheduler.plan("Suspicious", "/r", "/r", NOW)) == ["confidential_report.txt", "passwords.txt"]
+    assert scheduler.plan("Suspicious", "/r", "/r", NOW + 1) == []
+    assert len(scheduler.plan("Critical", "/r", "/r", NOW + 2)) == 4
+    assert scheduler.plan("Critical", "/r", "/r", NOW + 3) == []
+    # Other roots are served independently
+    assert len(scheduler.plan("Critical", "/other", "/other", NOW + 4)) == 6
+
+
+def test_new_epoch_redeploys():
+    scheduler = DeploymentScheduler(epoch_seconds=3600)
+    scheduler.plan("Suspicious", "/r", "/r", NOW)
+
+    assert scheduler.plan("Suspicious", "/r", "/r", NOW + 1800) == []
+    assert len(scheduler.plan("Suspicious", "/r", "/r", NOW + 3600)) == 2
+    assert scheduler.snapshot()["/r"]["epoch"] == 2
+
+
+def test_rate_limit_defers_the_remainder():
+    scheduler = DeploymentScheduler(max_decoys_per_minute=3)
+
+    assert len(scheduler.plan("Critical", "/r", "/r", NOW)) == 3
+    assert scheduler.plan("Critical", "/r", "/r", NOW + 1) == []
+    assert len(scheduler.plan("Critical", "/r", "/r", NOW + 60)) == 3
+    assert scheduler.plan("Critical", "/r", "/r", NOW + 120) == []
+
+
+def test_no_rotation_while_under_attack():
+    scheduler = DeploymentScheduler(epoch_seconds=3600, rotate_after_seconds=600)
+    scheduler.plan("Critical", "/r", "/r", NOW)
+
+    assert not scheduler.rotation_due(NOW, "/r", NOW + 1200)
+    assert scheduler.rotation_due(NOW, "/r", NOW + 3600)
+    assert scheduler.rotation_due(NOW, "/quiet", NOW + 1200)
+
+
+def test_manager_deploys_into_the_attacked_root(tmp_path):
+    roots = [tmp_path / "a", tmp_path / "b"]
+    for root in roots:
+        root.mkdir()
+    manager = DecoyManager(
+        decoy_base_path=str(tmp_path / "decoys"), placement="watch_root",
+        watch_roots=[str(r) for r in roots], root_subdir=".cache",
+        redeploy={"rotate_after_seconds": 600, "rotation_check_seconds": 0},
+    )
+    try:
+        first = manager.deploy_for_threat(60, "Suspicious", str(roots[0] / "notes.txt"), now=NOW)
+        topped_up = manager.deploy_for_threat(80, "Critical", str(roots[0] / "notes.txt"), now=NOW + 1)
+        repeat = manager.deploy_for_threat(80, "Critical", str(roots[0] / "x.txt"), now=NOW + 2)
+
+        assert len(first) == 2 and len(topped_up) == 4 and repeat is None
+        assert all(d.created_at == datetime.fromtimestamp(NOW) for d in first)
+        assert all(d.file_path.startswith(str(roots[0] / ".cache")) for d in first + topped_up)
+        assert manager.is_own_write(first[0].file_path, now=NOW + 1)
+        assert not manager.is_own_write(first[0].file_path, now=NOW + 60)
+        assert not manager.is_own_write(str(roots[1] / "notes.txt"), now=NOW + 1)
+
+        # Root b was attacked long ago and is quiet now; root a is under attack
+        quiet = manager.deploy_for_threat(60, "Suspicious", str(roots[1] / "notes.txt"), now=NOW - 4000)
+        assert all(d.created_at == datetime.fromtimestamp(NOW - 4000) for d in quiet)
+        rotated = manager.maintain(now=NOW + 1200)
+
+        assert sorted(d.file_path for d in rotated) == sorted(d.file_path for d in quiet)
+        assert rotated[0].content != quiet[0].content
+        assert len(manager.decoy_service.get_deployed_decoys()) == 8
+    finally:
+        manager.close()
@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from monitor.events import FileEvent
+from monitor.file_monitor import EventCoalescer
+from src.monitor import threat_detector as threat_detector_module
+from src.monitor.threat_detector import ThreatDetector
+
+
+def test_coalescer_merges_repeats_inside_debounce_window():
+    coalescer = EventCoalescer(debounce_seconds=1.0)
+    for i in range(10):
+        coalescer.add(FileEvent("modified", "/data/big.bin", 100.0 + i * 0.05))
+    coalescer.add(FileEvent("deleted", "/data/big.bin", 100.6))
+
+    assert coalescer.flush_due(100.5) == []
+
+    ready = coalescer.flush_due(101.0)
+    assert [(e.event_type, e.count) for e in ready] == [("modified", 10)]
+    assert [e.event_type for e in coalescer.flush_all()] == ["deleted"]
+    assert len(coalescer) == 0
+
+
+def test_detector_weights_coalesced_count(monkeypatch):
+    monkeypatch.setattr(threat_detector_module.time, "time", lambda: 1000.0)
+
+    storm_as_one = ThreatDetector()
+    storm_as_one.add_event("modified", "/data/big.bin", count=50)
+    assert storm_as_one.check_rapid_access(1000.0) == 0
+
+    weighted = ThreatDetector()
+    weighted.repeat_event_weight = 0.1
+    weighted.add_event("modified", "/data/big.bin", count=50)
+    assert weighted.check_rapid_access(1000.0) == 20
@@ -0,0 +1,102 @@
+from src.monitor.event_journal import EventJournal, read_journal, replay_journal
+from src.monitor.threat_partition import ShardedThreatDetector
+from src.monitor.threat_detector import ThreatDetector
+
+
+def record_session(journal_path):
+    journal = EventJournal(str(journal_path))
+    detector = ThreatDetector(journal=journal)
+    start = 1_700_000_000.0
+    scores = []
+    for i in range(40):
+        event_type = "deleted" if i % 3 == 0 else "modified"
+        scores.append(detector.add_event(event_type, f"/srv/share/file_{i % 7}.txt", timestamp=start + i))
+    scores.append(detector.add_event("created", "/srv/share/passwords.txt", timestamp=start + 41))
+    journal.close()
+    return scores
+
+
+def test_journal_round_trips_records(tmp_path):
+    journal_path = tmp_path / "events.journal"
+    scores = record_session(journal_path)
+
+    records = list(read_journal(str(journal_path)))
+    assert len(records) == 41
+    assert [r.score for r in records] == scores
+    assert records[0].event_type == "deleted"
+    assert records[-1].file_path == "/srv/share/passwords.txt"
+    assert records[-1].timestamp == 1_700_000_041.0
+
+
+def test_replay_reproduces_recorded_scores(tmp_path):
+    journal_path = tmp_path / "events.journal"
+    scores = record_session(journal_path)
+
+    summary = replay_journal(str(journal_path), ThreatDetector())
+
+    assert summary["events"] == 41
+    assert summary["peak_score"] == max(scores)
+    assert summary["changed_scores"] == 0
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    journal_path = tmp_path / "events.journal"
+    record_session(journal_path)
+    data = journal_path.read_bytes()
+    journal_path.write_bytes(data[:-5])
+
+    assert len(list(read_journal(str(journal_path)))) == 40
+
+
+def test_sharded_batches_journal_in_time_order_and_replay_cleanly(tmp_path):
+    journal_path = tmp_path / "events.journal"
+    roots = [str(tmp_path / "archive"), str(tmp_path / "projects")]
+    journal = EventJournal(str(journal_path))
+    detector = ShardedThreatDetector("top_dir", roots, config_data={}, journal=journal)
+    start = 1_700_000_000.0
+    events = [
+        ("deleted", f"{roots[i % 2]}/dir{i % 3}/secret_{i}.txt", 1, start + i * 0.1)
+        for i in range(40)
+    ]
+    scores = []
+    for i in range(0, len(events), 10):
+        scores.extend(detector.add_events(events[i:i + 10]))
+    journal.close()
+
+    records = list(read_journal(str(journal_path)))
+    assert [r.timestamp for r in records] == [event[3] for event in events]
+    assert [r.score for r in records] == scores
+
+    summary = replay_journal(str(journal_path), ShardedThreatDetector("top_dir", roots, config_data={}))
+    assert summary["events"] == 40
+    assert summary["changed_scores"] == 0
+
+
+def test_journal_rotates_at_max_bytes_and_keeps_backups(tmp_path):
+    journal_path = tmp_path / "events.journal"
+    journal = EventJournal(str(journal_path), max_bytes=400, backup_count=2)
+    for i in range(60):
+        journal.append("modified", f"/srv/share/file_{i:02d}.txt", 1_700_000_000.0 + i, 10, "Normal")
+    journal.close()
+
+    assert journal.rotations >= 3
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["events.journal", "events.journal.1", "events.journal.2"]
+    assert all(p.stat().st_size <= 400 for p in tmp_path.iterdir())
+
+    # Every file is a complete journal, and together they end with the newest records
+    records = [r for name in reversed(files) for r in read_journal(str(tmp_path / name))]
+    assert [r.file_path for r in records] == [f"/srv/share/file_{i:02d}.txt" for i in range(60 - len(records), 60)]
+
+
+def test_maybe_flush_waits_for_the_flush_interval(tmp_path):
+    journal_path = tmp_path / "events.journal"
+    journal = EventJournal(str(journal_path), flush_interval=5.0)
+    journal.append("created", "/srv/share/a.txt", 1_700_000_000.0, 0, "Normal")
+    start = journal._last_flush
+
+    assert not journal.maybe_flush(now=start + 1)
+    assert list(read_journal(str(journal_path))) == []
+    assert journal.maybe_flush(now=start + 5)
+    assert [r.file_path for r in read_journal(str(journal_path))] == ["/srv/share/a.txt"]
+    journal.close()
@@ -0,0 +1,83 @@
+import threading
+
+from src.monitor.event_pipeline import EventQueue, EventWorker
+from src.monitor.events import FileEvent
+
+
+def make_event(path, event_type="modified", timestamp=0.0):
+    return FileEvent(event_type, path, timestamp)
+
+
+def test_drop_oldest_policy_keeps_newest_events():
+    queue = EventQueue(maxsize=3, policy="drop_oldest")
+    for i in range(5):
+        queue.put(make_event(f"f{i}"))
+
+    batch = queue.get_batch(10, timeout=0)
+    assert [e.file_path for e in batch] == ["f2", "f3", "f4"]
+    assert queue.get_stats()["dropped"] == 2
+
+
+def test_coalesce_policy_merges_into_pending_duplicate():
+    queue = EventQueue(maxsize=2, policy="coalesce")
+    queue.put(make_event("a"))
+    queue.put(make_event("b"))
+
+    assert queue.put(make_event("a")) is False
+    assert queue.put(make_event("c")) is True
+
+    stats = queue.get_stats()
+    assert stats["coalesced"] == 1
+    assert stats["dropped"] == 1
+    assert [e.file_path for e in queue.get_batch(10, timeout=0)] == ["b", "c"]
+
+
+def test_coalesced_repeats_are_counted_on_the_pending_event():
+    queue = EventQueue(maxsize=2, policy="coalesce")
+    queue.put(make_event("a"))
+    queue.put(make_event("b"))
+
+    assert queue.put(make_event("a")) is False
+    assert queue.put_many([make_event("a"), FileEvent("modified", "a", 0.0, count=3)]) == 0
+
+    batch = queue.get_batch(10, timeout=0)
+    assert [(e.file_path, e.count) for e in batch] == [("a", 6), ("b", 1)]
+    assert queue.get_stats()["coalesced"] == 3
+
+
+def test_block_policy_drops_after_timeout():
+    queue = EventQueue(maxsize=1, policy="block", block_timeout=0.01)
+    queue.put(make_event("a"))
+
+    assert queue.put(make_event("b")) is False
+    assert queue.get_stats()["dropped"] == 1
+
+
+def test_worker_drains_queue_on_stop():
+    queue = EventQueue(maxsize=100)
+    seen = []
+    lock = threading.Lock()
+
+    def handle(batch):
+        with lock:
+            seen.extend(e.file_path for e in batch)
+
+    worker = EventWorker(queue, handle, batch_size=8, poll_interval=0.01)
+    worker.start()
+    for i in range(50):
+        queue.put(make_event(f"f{i}"))
+    worker.stop(timeout=5)
+
+    assert seen == [f"f{i}" for i in range(50)]
+    assert queue.get_stats()["max_depth"] >= 1
+
+
+def test_put_many_queues_a_batch_with_backpressure():
+    queue = EventQueue(maxsize=3, policy="drop_oldest")
+    assert queue.put_many([make_event(f"f{i}") for i in range(5)]) == 5
+
+    assert [e.file_path for e in queue.get_batch(10, timeout=0)] == ["f2", "f3", "f4"]
+    stats = queue.get_stats()
+    assert stats["enqueued"] == 5
+    assert stats["dropped"] == 2
+    assert stats["max_depth"] == 3
@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from conftest import wait_for
+from monitor import inotify_source
+from monitor.inotify_source import InotifySource, inotify_available, resolve_event_source
+
+
+class CollectingSink:
+    def __init__(self):
+        self.batches = []
+
+    def enqueue_batch(self, events):
+        self.batches.append(list(events))
+
+    def events(self):
+        return [(e.event_type, e.file_path, e.dest_path) for batch in self.batches for e in batch]
+
+
+@pytest.mark.skipif(not inotify_available(), reason="inotify is Linux-only")
+def test_inotify_source_reports_file_events_across_the_tree(tmp_path):
+    existing = tmp_path / "a" / "b"
+    existing.mkdir(parents=True)
+    (existing / "old.txt").write_text("already here")
+
+    sink = CollectingSink()
+    source = InotifySource(str(tmp_path), sink, poll_interval=0.05)
+    source.start()
+    try:
+        assert wait_for(lambda: source.watch_count == 3)
+
+        (existing / "secret.txt").write_text("x")
+        new_dir = tmp_path / "new"
+        new_dir.mkdir()
+        (new_dir / "report.docx").write_text("y")
+        os.rename(existing / "secret.txt", existing / "secret.txt.locked")
+        (existing / "old.txt").unlink()
+
+        expected = {
+            ("created", str(existing / "secret.txt"), None),
+            ("modified", str(existing / "secret.txt"), None),
+            ("created", str(new_dir / "report.docx"), None),
+            ("moved", str(existing / "secret.txt"), str(existing / "secret.txt.locked")),
+            ("deleted", str(existing / "old.txt"), None),
+        }
+        assert wait_for(lambda: expected <= set(sink.events()))
+        assert source.watch_count == 4
+    finally:
+        source.stop()
+        source.join(5)
+
+    # Files that existed before the watch are not reported
+    assert not any(path == str(existing / "old.txt") and kind == "created"
+                   for kind, path, _ in sink.events())
+
+
+def test_event_source_falls_back_to_watchdog(monkeypatch):
+    monkeypatch.setattr(inotify_source, "inotify_available", lambda: False)
+    assert resolve_event_source("auto") == "watchdog"
+    assert resolve_event_source("inotify") == "watchdog"
+    assert resolve_event_source("watchdog") == "watchdog"
+    with pytest.raises(ValueError):
+        resolve_event_source("kqueue")
@@ -0,0 +1,38 @@
+from src.monitor.keyword_matcher import KeywordMatcher
+from src.monitor.threat_detector import ThreatDetector
+
+
+def test_matcher_uses_highest_matching_weight():
+    matcher = KeywordMatcher({"key": 10, "api_key": 40, "backup": 25})
+
+    assert matcher.match_weight("/srv/API_KEY.txt") == 40
+    assert matcher.match_weight("/srv/keyboard.txt") == 10
+    assert matcher.match_weight("/srv/backup.tar") == 25
+    assert matcher.match_weight("/srv/notes.txt") == 0
+
+
+def test_matcher_caches_verdict_per_path():
+    matcher = KeywordMatcher({"secret": 25})
+
+    matcher.match_weight("/tmp/secret.txt")
+    matcher.match_weight("/tmp/secret.txt")
+
+    info = matcher.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+def test_detector_loads_weighted_keywords_from_config(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "threat_detection:\n"
+        "  sensitive_keywords:\n"
+        "    wallet: 40\n"
+        "    notes: 0\n"
+    )
+
+    detector = ThreatDetector(config_path=str(config_file))
+
+    assert detector.check_sensitive_files("/home/u/wallet.dat") == 40
+    assert detector.check_sensitive_files("/home/u/notes.txt") == 0
+    assert detector.check_sensitive_files("/home/u/passwords.txt") == 0
@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from monitor.decoy_manager import DecoyManager
+
+
+def test_generator_and_store_are_created_on_first_deployment(tmp_path):
+    db_path = tmp_path / "state" / "decoys.db"
+    manager = DecoyManager(
+        decoy_base_path=str(tmp_path / "decoys"), content_pool_size=2, store_path=str(db_path)
+    )
+    try:
+        assert not manager.generator.loaded
+        assert not db_path.exists()
+        assert manager.get_deployment_status()["content_pool"] is None
+
+        deployed = manager.deploy_for_threat(60, "Suspicious", str(tmp_path / "notes.txt"))
+
+        assert len(deployed) == 2
+        assert manager.generator.loaded
+        assert db_path.exists()
+    finally:
+        manager.close()
+
+
+def test_warm_up_builds_generator_in_background(tmp_path):
+    manager = DecoyManager(decoy_base_path=str(tmp_path / "decoys"))
+    try:
+        manager.warm_up().join(timeout=10)
+        assert manager.generator.loaded
+    finally:
+        manager.close()
@@ -0,0 +1,46 @@
+import os
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from monitor.decoy_manager import DecoyManager
+from monitor.file_monitor import FileMonitor
+from monitor.metrics import MetricsExporter, MetricsRegistry, REGISTRY
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("test_seconds", "Test latency", bounds=(0.1, 1.0)).labels()
+    hits = registry.counter("test_hits_total", "Hits", ("type",))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value)
+    hits.labels("created").inc(2)
+
+    text = registry.render()
+
+    assert 'test_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_seconds_bucket{le="1.0"} 3' in text
+    assert 'test_seconds_bucket{le="+Inf"} 4' in text
+    assert "test_seconds_count 4" in text
+    assert 'test_hits_total{type="created"} 2' in text
+
+
+def test_endpoint_and_snapshot_expose_event_path_metrics(tmp_path):
+    monitor = FileMonitor(decoy_manager=DecoyManager(decoy_base_path=str(tmp_path / "decoys")))
+    monitor.expose_metrics()
+    FileMonitor(decoy_manager=monitor.decoy_manager)  # another monitor does not take over the gauges
+    monitor._handle_file_event("created", str(tmp_path / "notes.txt"), "File Created")
+    snapshot = tmp_path / "metrics.prom"
+    exporter = MetricsExporter(REGISTRY, http_port=0, snapshot_path=str(snapshot), snapshot_interval=60)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+            text = response.read().decode()
+    finally:
+        exporter.close()
+        monitor.decoy_manager.close()
+
+    assert 'honeypot_events_total{type="created"}' in text
+    assert "honeypot_scoring_seconds_count" in text
+    assert "honeypot_window_events 1" in text
+    assert "honeypot_event_handling_seconds_bucket" in snapshot.read_text()
@@ -0,0 +1,69 @@
+import os
+import stat
+
+from src.domain.application.decoy_service import DecoyService
+from src.domain.entities.deployment_report import DeploymentReport
+from src.domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+from src.domain.infrastructure.parallel_decoy_writer import ParallelDecoyWriter, write_file_atomic
+
+
+def test_atomic_write_replaces_file_and_leaves_no_temp(tmp_path):
+    target = tmp_path / "passwords.txt"
+    target.write_text("old")
+
+    write_file_atomic(str(target), "new content")
+
+    assert target.read_text() == "new content"
+    assert os.listdir(tmp_path) == ["passwords.txt"]
+    # Same permissions a plain open() would give, not mkstemp's 0600
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(target.stat().st_mode) == 0o666 & ~umask
+
+
+def test_large_fan_out_is_written_in_parallel(tmp_path):
+    writer = ParallelDecoyWriter(max_workers=8)
+    service = DecoyService(FileDecoyGenerator(), writer)
+    specs = [
+        (("credential", "document", "config")[i % 3], str(tmp_path / f"dir{i % 10}" / f"decoy{i}.txt"))
+        for i in range(300)
+    ]
+
+    try:
+        report = service.deploy_decoys(specs)
+    finally:
+        writer.close()
+
+    assert len(report.deployed) == 300
+    assert not report.failed
+    assert [d.file_path for d in report.deployed] == [path for _, path in specs]
+    assert len(report.latencies) == 300
+    assert all(open(d.file_path).read() == d.content for d in report.deployed)
+    assert service.is_decoy_file(specs[-1][1])
+
+
+def test_failed_writes_are_reported_not_tracked(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    writer = ParallelDecoyWriter(max_workers=2)
+    service = DecoyService(FileDecoyGenerator(), writer)
+
+    try:
+        report = service.deploy_decoys([
+            ("credential", str(tmp_path / "ok.txt")),
+            ("credential", str(blocker / "bad.txt")),
+        ])
+    finally:
+        writer.close()
+
+    assert [d.file_path for d in report.deployed] == [str(tmp_path / "ok.txt")]
+    assert str(blocker / "bad.txt") in report.failed
+    assert not service.is_decoy_file(str(blocker / "bad.txt"))
+
+
+def test_report_percentiles():
+    report = DeploymentReport(latencies={"a": 0.001, "b": 0.002, "c": 0.010})
+    assert report.latency_percentile(0) == 0.001
+    assert report.latency_percentile(50) == 0.002
+    assert report.latency_percentile(100) == 0.010
+    assert DeploymentReport().latency_percentile(99) == 0.0
@@ -0,0 +1,50 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from agent.profiler import ProfilerControl, SamplingProfiler
+
+
+def busy_scoring(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(200))
+
+
+def test_samples_named_threads_into_collapsed_stacks(tmp_path):
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_scoring, args=(stop,), name="honeypot-worker-3")
+    idle = threading.Thread(target=stop.wait, name="unrelated")
+    worker.start()
+    idle.start()
+
+    control = ProfilerControl(SamplingProfiler(interval=0.002), output_dir=str(tmp_path))
+    control.start()
+    time.sleep(0.3)
+    folded, report = control.stop()
+    stop.set()
+    worker.join()
+    idle.join()
+
+    stacks = open(folded).read().splitlines()
+    assert stacks and all(line.startswith("honeypot-worker;") for line in stacks)
+    assert any("test_profiler.py:busy_scoring" in line for line in stacks)
+    assert "Top functions by self time:" in open(report).read()
+    assert control.stop() is None
+
+
+def test_decoy_rendering_threads_are_sampled(tmp_path):
+    from domain.infrastructure.file_decoy_generator import FileDecoyGenerator
+
+    generator = FileDecoyGenerator(pool_size=100_000, refill_pause=0)
+    profiler = SamplingProfiler(interval=0.002)
+    profiler.start()
+    time.sleep(0.3)
+    profiler.stop()
+    generator.content_pool.stop(timeout=5)
+
+    assert any(stack.startswith("decoy-content-refill;") for stack in profiler.stacks)
+    section = profiler.report().split("decoy_template_engine.py (including callees):\n", 1)[1]
+    assert not section.startswith("  (no samples)")
@@ -0,0 +1,50 @@
+import logging
+
+from src.monitor.logger import EventLogger
+
+
+def test_queue_mode_drains_on_shutdown(tmp_path):
+    log_file = tmp_path / "events.log"
+    logger = EventLogger(str(log_file), queue_mode=True, flush_interval=60)
+    try:
+        for i in range(500):
+            logger.log_info(f"event {i}")
+        logger.log_error("last one")
+    finally:
+        EventLogger.shutdown()
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 501
+    assert lines[0].endswith("INFO - event 0")
+    assert lines[-1].endswith("ERROR - last one")
+    assert logging.getLogger("src.monitor.logger").propagate is True
+
+
+def test_queue_mode_rotates_by_size(tmp_path):
+    log_file = tmp_path / "events.log"
+    logger = EventLogger(
+        str(log_file), queue_mode=True, max_bytes=2_000, backup_count=3
+    )
+    try:
+        for i in range(200):
+            logger.log_info(f"rotating event number {i}")
+    finally:
+        EventLogger.shutdown()
+
+    assert (tmp_path / "events.log.1").exists()
+    assert log_file.stat().st_size < 2_000
+
+
+def test_size_limit_counts_bytes_not_characters(tmp_path):
+    log_file = tmp_path / "events.log"
+    logger = EventLogger(
+        str(log_file), queue_mode=True, max_bytes=2_000, backup_count=5
+    )
+    try:
+        for i in range(100):
+            logger.log_info(f"файл изменён: /srv/общий/отчёт_{i}.docx")
+    finally:
+        EventLogger.shutdown()
+
+    for path in tmp_path.iterdir():
+        assert path.stat().st_size < 2_000
@@ -0,0 +1,37 @@
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from monitor.clock import SimulatedClock
+from monitor.simulation import generate_workload, simulate
+from monitor.threat_detector import ThreatDetector
+
+
+def test_detector_reads_time_and_hour_from_its_clock():
+    clock = SimulatedClock(datetime(2024, 3, 12, 3, 0).timestamp())
+    detector = ThreatDetector(config_data={}, clock=clock)
+
+    detector.add_event("created", "/data/a.txt")
+    assert detector.events[0]["time"] == clock.time()
+    assert detector.check_unusual_time() == 15
+
+    clock.advance(9 * 3600)
+    assert detector.check_unusual_time() == 0
+
+
+def test_same_seed_replays_identically():
+    first = simulate("ransomware_burst", seed=4)
+    second = simulate("ransomware_burst", seed=4)
+
+    for key in ("events", "simulated_seconds", "peak_score", "final_score", "first_reached"):
+        assert first[key] == second[key]
+    assert generate_workload("benign_build", seed=1)[5].file_path != \
+        generate_workload("benign_build", seed=2)[5].file_path
+
+
+def test_workloads_separate_attacks_from_builds():
+    assert simulate("ransomware_burst", seed=0)["peak_level"] == "Critical"
+    assert simulate("slow_exfiltration", seed=0)["peak_level"] == "Critical"
+    assert simulate("benign_build", seed=0)["peak_score"] < 51
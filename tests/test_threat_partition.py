@@ -0,0 +1,110 @@
+import os
+import time
+
+from src.monitor.threat_partition import ShardedThreatDetector, create_threat_detector
+from src.monitor.threat_detector import ThreatDetector
+
+
+# Local noon, so the unusual-hour rule stays out of the scores
+NOON = time.mktime((2026, 1, 5, 12, 0, 0, 0, 0, -1))
+
+
+def make_sharded(tmp_path, partition_key):
+    roots = [str(tmp_path / "archive"), str(tmp_path / "projects")]
+    return ShardedThreatDetector(partition_key, roots, config_data={}), roots
+
+
+def test_noisy_root_does_not_raise_other_roots(tmp_path):
+    detector, (archive, projects) = make_sharded(tmp_path, "root")
+
+    for i in range(20):
+        detector.add_event("deleted", f"{archive}/nightly/secret_{i}.tar", timestamp=NOON + i * 0.1)
+    quiet_score = detector.add_event("created", f"{projects}/app/main.py", timestamp=NOON + 3)
+
+    assert quiet_score == 0
+    assert detector.shards[archive].threat_score == 100
+    assert detector.threat_score == 100
+    assert detector.get_threat_info()["top_shard"] == archive
+
+
+def test_top_dir_partitions_below_each_root(tmp_path):
+    detector, (archive, projects) = make_sharded(tmp_path, "top_dir")
+
+    assert detector.shard_key(f"{projects}/app/src/main.py") == f"{projects}/app"
+    assert detector.shard_key(f"{projects}/README.md") == projects
+    assert detector.shard_key(str(tmp_path / "elsewhere.txt")) == "unrooted"
+
+
+def test_global_aggregate_tracks_event_count_and_cooling(tmp_path):
+    detector, (archive, projects) = make_sharded(tmp_path, "root")
+
+    detector.add_event("created", f"{archive}/passwords.txt", timestamp=NOON)
+    detector.add_event("created", f"{projects}/notes.txt", timestamp=NOON + 1)
+    assert detector.threat_score == 25
+    assert detector.event_count == 2
+
+    # Far outside the window: the archive shard cools down and expires
+    detector.add_event("created", f"{archive}/plain.txt", timestamp=NOON + 1_000)
+    assert detector.threat_score == 0
+    assert detector.event_count == 2
+
+
+def test_factory_keeps_single_detector_for_global():
+    assert isinstance(create_threat_detector({}), ThreatDetector)
+    config = {"threat_detection": {"partition_key": "owner"}}
+    assert isinstance(create_threat_detector(config), ShardedThreatDetector)
+
+
+def test_sharded_add_events_scores_each_event_in_its_shard(tmp_path):
+    one_by_one, roots = make_sharded(tmp_path, "top_dir")
+    batched, _ = make_sharded(tmp_path, "top_dir")
+    events = [
+        ("deleted" if i % 2 else "created", f"{roots[i % 2]}/dir{i % 3}/secret_{i}.txt", 1, NOON + i * 0.1)
+        for i in range(60)
+    ]
+
+    expected = [one_by_one.add_event(*event) for event in events]
+    assert batched.add_events(events) == expected
+    assert batched.threat_score == one_by_one.threat_score
+    assert batched.get_threat_info()["shards"] == one_by_one.get_threat_info()["shards"]
+
+
+def test_shards_share_one_matcher_and_idle_shards_are_pruned(tmp_path):
+    detector, (archive, projects) = make_sharded(tmp_path, "top_dir")
+    detector.add_event("created", f"{archive}/old/passwords.txt", timestamp=NOON)
+    detector.add_event("created", f"{projects}/app/main.py", timestamp=NOON + 200)
+
+    matchers = {id(shard.keyword_matcher) for shard in detector.shards.values()}
+    assert len(matchers) == 1
+
+    # The archive shard's window (300 s) has emptied; the projects shard's has not
+    assert detector.maintain(now=NOON + 400) == 1
+    assert list(detector.shards) == [f"{projects}/app"]
+    assert detector.event_count == 1
+    assert detector.threat_score == 0
+    assert detector.maintain(now=NOON + 410) == 0  # swept at most once per interval
+
+    # A pruned shard is recreated on its next event
+    detector.add_event("created", f"{archive}/old/passwords.txt", timestamp=NOON + 420)
+    assert detector.shards[f"{archive}/old"].threat_score == 25
+    assert detector.event_count == 2
+
+
+def test_owner_key_follows_a_file_after_deletion(tmp_path, monkeypatch):
+    detector, (archive, _) = make_sharded(tmp_path, "owner")
+    os.makedirs(archive)
+    victim = os.path.join(archive, "ledger.xls")
+    with open(victim, "w") as f:
+        f.write("q3")
+    created_in = detector.shard_key(victim)
+
+    # The directory belongs to someone else: a deleted file keeps its own owner
+    real_stat = os.stat
+    other_owner = os.stat_result((0o40755, 0, 0, 1, 4242, 4242, 0, 0, 0, 0))
+    monkeypatch.setattr(os, "stat", lambda path: other_owner if path == archive else real_stat(path))
+    os.unlink(victim)
+    assert detector.shard_key(victim) == created_in
+
+    # A file never seen before falls back to its directory's owner
+    assert detector.shard_key(os.path.join(archive, "never_seen.txt")) != created_in
+    assert detector.shard_key(str(tmp_path / "gone" / "never_seen.txt")) == "unknown"
@@ -0,0 +1,102 @@
+import random
+from datetime import datetime
+
+from src.monitor import threat_detector as threat_detector_module
+from src.monitor.threat_detector import ThreatDetector
+
+
+def reference_score(events, now, detector):
+    """Original list-rescanning rules, used as the scoring oracle."""
+    events = [e for e in events if now - e["time"] < detector.time_window]
+    score = 0
+    rapid = [e for e in events if now - e["time"] < detector.rapid_access_window]
+    if len(rapid) >= detector.rapid_access_threshold:
+        score += 20
+    score += detector.check_unusual_time()
+    deletes = [
+        e for e in events
+        if e["type"] == "deleted" and now - e["time"] < detector.deletion_window
+    ]
+    if len(deletes) >= detector.deletion_threshold:
+        score += 30
+    for event in events:
+        score += detector.check_sensitive_files(event["path"])
+    return events, min(score, 100)
+
+
+def test_incremental_scores_match_original_rules(monkeypatch):
+    detector = ThreatDetector()
+    rng = random.Random(7)
+    clock = [1_000_000.0]
+    monkeypatch.setattr(threat_detector_module.time, "time", lambda: clock[0])
+
+    history = []
+    paths = ["notes.txt", "passwords.txt", "build/out.o", "id_rsa", "report.doc"]
+    for _ in range(2000):
+        clock[0] += rng.choice([0.001, 0.5, 2.0, 7.5, 45.0])
+        event_type = rng.choice(["created", "modified", "deleted"])
+        path = rng.choice(paths)
+        detector.add_event(event_type, path)
+
+        history.append({"type": event_type, "path": path, "time": clock[0]})
+        history, expected = reference_score(history, clock[0], detector)
+
+        assert detector.threat_score == expected
+        assert len(detector.events) == len(history)
+
+
+def test_threat_info_reports_latest_events(monkeypatch):
+    detector = ThreatDetector()
+    clock = [50.0]
+    monkeypatch.setattr(threat_detector_module.time, "time", lambda: clock[0])
+
+    for i in range(8):
+        clock[0] += 1
+        detector.add_event("created", f"file{i}.txt")
+
+    info = detector.get_threat_info()
+    assert info["event_count"] == 8
+    assert [e["path"] for e in info["recent_events"]] == [
+        f"file{i}.txt" for i in range(3, 8)
+    ]
+
+
+def test_window_keeps_compact_records_that_read_like_dicts():
+    detector = ThreatDetector(config_data={})
+    for i in range(3):
+        detector.add_event("modified", "".join(["/data/", "report.doc"]), timestamp=100.0 + i)
+
+    first, second = detector.events[0], detector.events[1]
+    assert not hasattr(first, "__dict__")
+    assert first.path is second.path  # interned
+    assert first["type"] == "modified" and first["time"] == 100.0
+    assert dict(first) == {"type": "modified", "path": "/data/report.doc", "time": 100.0, "count": 1}
+
+
+def test_add_events_matches_add_event_and_logs_once():
+    rng = random.Random(3)
+    start = datetime(2026, 1, 5, 4, 50).timestamp()  # runs past 05:00, the end of the unusual hours
+    events = []
+    for i in range(3000):
+        start += rng.expovariate(2)
+        events.append((
+            rng.choice(["created", "modified", "deleted"]),
+            f"/data/{rng.choice(['notes', 'secret', 'report', 'backup'])}_{i % 40}.txt",
+            rng.choice([1, 1, 1, 4]),
+            start,
+        ))
+
+    one_by_one = ThreatDetector(config_data={"threat_detection": {"repeat_event_weight": 0.5}})
+    expected = [one_by_one.add_event(t, p, c, ts) for t, p, c, ts in events]
+
+    batched = ThreatDetector(config_data={"threat_detection": {"repeat_event_weight": 0.5}})
+    warnings = []
+    batched.logger.log_warning = warnings.append
+    scores = []
+    for i in range(0, len(events), 256):
+        scores.extend(batched.add_events(events[i:i + 256]))
+
+    assert scores == expected
+    assert batched.threat_score == one_by_one.threat_score
+    assert batched.get_threat_info() == one_by_one.get_threat_info()
+    assert len(warnings) <= -(-len(events) // 256)
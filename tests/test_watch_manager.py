@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from conftest import wait_for
+from monitor.metrics import REGISTRY
+from monitor.watch_manager import WatchManager
+
+
+def test_watch_manager_feeds_all_roots_into_shared_detector(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    roots = [tmp_path / f"root{i}" for i in range(3)]
+    for root in roots:
+        root.mkdir()
+
+    config = {
+        "threat_detection": {"partition_key": "root"},
+        "journal": {"enabled": False},
+        "monitoring": {"workers": 2},
+    }
+    manager = WatchManager([str(r) for r in roots] + [str(tmp_path / "missing")], config)
+    assert len(manager.watch_roots) == 3
+    assert len(manager.workers) == 2
+
+    manager.start()
+    try:
+        for root in roots:
+            (root / "notes.txt").write_text("hello")
+        assert wait_for(lambda: all(
+            stats["events"] > 0 for stats in manager.get_root_stats().values()
+        ))
+
+        # Per-root counts and rates are exported, independent of the logged snapshots
+        text = REGISTRY.render()
+        for root in roots:
+            assert f'honeypot_root_events{{root="{root}"}}' in text
+            assert f'honeypot_root_events_per_second{{root="{root}"}}' in text
+        assert "honeypot_window_events" in text
+    finally:
+        manager.stop(timeout=5)
+
+    shards = manager.monitor.threat_detector.get_threat_info()["shards"]
+    assert set(shards) == {str(root) for root in roots}
+    assert all(q["depth"] == 0 for q in manager.get_stats()["queues"])
+
+    assert f'root="{roots[0]}"' not in REGISTRY.render()